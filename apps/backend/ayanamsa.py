@@ -0,0 +1,97 @@
+"""Ayanamsa provider.
+
+Swiss Ephemeris computes the True Citra ayanamsa from the position of Spica,
+which costs tens of microseconds per call. The provider samples the actual
+per-date ayanamsa once into a compact table covering 1900-2100 and serves
+lookups by linear interpolation (max error well below 0.2 arcsec).
+"""
+import os
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+# Table bounds and sampling step (Julian days)
+TABLE_START_JD = 2415020.5  # 1900-01-01 00:00 UT
+TABLE_END_JD = 2488434.5  # 2101-01-01 00:00 UT
+TABLE_STEP_DAYS = 5.0
+
+# SIDEREAL_AYANAMSHA values accepted besides the plain swisseph SIDM_* suffixes
+SIDEREAL_MODE_ALIASES = {
+    "TRUE_CHITRA_PAKSHA_LAHIRI": swe.SIDM_TRUE_CITRA,
+    "TRUE_CHITRA": swe.SIDM_TRUE_CITRA,
+    "CHITRA_PAKSHA": swe.SIDM_LAHIRI,
+}
+
+DEFAULT_SIDEREAL_AYANAMSHA = "TRUE_CHITRA_PAKSHA_LAHIRI"
+
+
+def resolve_sidereal_mode(name: Optional[str] = None) -> int:
+    """Map a SIDEREAL_AYANAMSHA name to a swisseph SIDM_* constant"""
+    name = (name or os.getenv("SIDEREAL_AYANAMSHA") or DEFAULT_SIDEREAL_AYANAMSHA).upper()
+    if name in SIDEREAL_MODE_ALIASES:
+        return SIDEREAL_MODE_ALIASES[name]
+    mode = getattr(swe, f"SIDM_{name}", None)
+    if mode is None:
+        raise ValueError(f"Unknown sidereal ayanamsha: {name}")
+    return mode
+
+
+class AyanamsaProvider:
+    """Interpolated ayanamsa lookups backed by a lazily built table"""
+
+    def __init__(self, sid_mode: int, start_jd: float = TABLE_START_JD,
+                 end_jd: float = TABLE_END_JD, step_days: float = TABLE_STEP_DAYS):
+        self.sid_mode = sid_mode
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        self.step_days = step_days
+        # (grid, table), published together so readers never see one without the other
+        self._state: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._lock = threading.Lock()
+
+    def _ensure_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        state = self._state
+        if state is None:
+            with self._lock:
+                state = self._state
+                if state is None:
+                    swe.set_sid_mode(self.sid_mode)
+                    grid = np.arange(self.start_jd, self.end_jd + self.step_days, self.step_days)
+                    table = np.array([swe.get_ayanamsa_ut(jd) for jd in grid.tolist()])
+                    state = self._state = (grid, table)
+        return state
+
+    def at(self, jd: float) -> float:
+        """Ayanamsa in degrees at a Julian day (UT)"""
+        if not self.start_jd <= jd < self.end_jd:
+            swe.set_sid_mode(self.sid_mode)
+            return swe.get_ayanamsa_ut(jd)
+        _, table = self._ensure_table()
+        position = (jd - self.start_jd) / self.step_days
+        i = int(position)
+        frac = position - i
+        return table[i] + (table[i + 1] - table[i]) * frac
+
+    def at_many(self, jds: np.ndarray) -> np.ndarray:
+        """Vectorized ``at`` for an array of Julian days"""
+        jds = np.asarray(jds, dtype=np.float64)
+        grid, table = self._ensure_table()
+        result = np.interp(jds, grid, table)
+        outside = (jds < self.start_jd) | (jds >= self.end_jd)
+        if outside.any():
+            swe.set_sid_mode(self.sid_mode)
+            result[outside] = [swe.get_ayanamsa_ut(jd) for jd in jds[outside].tolist()]
+        return result
+
+
+_provider: Optional[AyanamsaProvider] = None
+
+
+def get_ayanamsa_provider() -> AyanamsaProvider:
+    """Process-wide provider for the configured SIDEREAL_AYANAMSHA"""
+    global _provider
+    if _provider is None:
+        _provider = AyanamsaProvider(resolve_sidereal_mode())
+    return _provider
@@ -0,0 +1,51 @@
+"""Batch panchanga generation across many (location, month) requests.
+
+The content pipeline needs hundreds of ``/panchanga/month`` results a night.
+Rather than calling the endpoint serially, ``iter_panchanga_batch`` shards the
+requests across a ``ProcessPoolExecutor`` (one swisseph instance per process,
+set up by ``init_worker``) and runs the same ``compute_panchanga_month`` the
+endpoint uses. Results come back in submission order.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from executor import init_worker
+
+
+def _generate(request_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker job: one month for one location"""
+    # Deferred so that importing this module does not load the app
+    from main import PanchangaMonthRequest, compute_panchanga_month
+
+    try:
+        request = PanchangaMonthRequest.model_validate(request_data)
+        response = compute_panchanga_month(request)
+        return {"request": request_data, "response": response.model_dump(mode="json"), "error": None}
+    except Exception as e:
+        return {"request": request_data, "response": None, "error": str(e)}
+
+
+def _as_dict(request: Union[Dict[str, Any], Any]) -> Dict[str, Any]:
+    return request if isinstance(request, dict) else request.model_dump()
+
+
+def iter_panchanga_batch(requests: Iterable[Union[Dict[str, Any], Any]],
+                         workers: Optional[int] = None,
+                         chunksize: int = 1) -> Iterator[Dict[str, Any]]:
+    """Generate panchanga months in parallel, yielding results in submission order.
+
+    ``requests`` are ``PanchangaMonthRequest`` instances or equivalent dicts
+    (year, month, timezone, latitude, longitude). Each result is
+    ``{"request", "response", "error"}``; a failing request sets ``error``
+    instead of aborting the batch.
+    """
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        yield from pool.map(_generate, (_as_dict(request) for request in requests),
+                            chunksize=chunksize)
+
+
+def run_panchanga_batch(requests: Iterable[Union[Dict[str, Any], Any]],
+                        workers: Optional[int] = None,
+                        chunksize: int = 1) -> List[Dict[str, Any]]:
+    """``iter_panchanga_batch`` collected into a list"""
+    return list(iter_panchanga_batch(requests, workers=workers, chunksize=chunksize))
@@ -0,0 +1,232 @@
+"""Benchmarks of the calculation hot paths with regression baselines.
+
+``run_benchmarks`` times the per-day helpers (``get_nakshatra``,
+``get_tithi``, ``get_yoga``, ``get_karana``, ``evaluate_yoga_rule``), the
+navatara mapping and full ``/positions/month`` and ``/panchanga/month``
+requests through an in-process ASGI client. Each benchmark is calibrated to
+run at least ``min_time`` seconds per round and reports the median and best
+seconds per operation over ``rounds`` rounds.
+
+Month requests are timed cold: the response, ETag, sunrise and timezone
+caches are cleared before every request, the remote API and the persistent
+result store are switched off, so every request calculates the month.
+``panchanga_month_cached`` times the response cache hit path on its own.
+
+``compare`` checks a run against a saved baseline (``benchmarks/baseline.json``,
+written by ``scripts/benchmark.py run --save``); a benchmark regresses when
+its median is slower than the baseline median by more than ``threshold``.
+Baselines are only comparable on the machine that recorded them.
+"""
+import asyncio
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence
+
+import httpx
+import swisseph as swe
+
+import main
+from http_cache import etag_index
+from sunrise import sun_times_cache
+from timezones import offset_tables_cache
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmarks" / "baseline.json"
+DEFAULT_THRESHOLD = 0.25
+
+# Inputs shared by the helper benchmarks: one longitude per degree
+LONGITUDES = [float(degree) + 0.5 for degree in range(360)]
+LONGITUDE_PAIRS = [(sun, (sun * 13.37) % 360) for sun in LONGITUDES]
+JD = swe.julday(2025, 1, 15, 12.0)
+YOGA_CONTEXTS = [
+    {"vara": vara, "tithiGroup": group, "nakshatraIndex": index}
+    for vara in ("Sunday", "Thursday", "Friday")
+    for group in ("Nanda", "Rikta")
+    for index in range(1, 28)
+]
+
+POSITIONS_MONTH = {"year": 2025, "month": 1, "timezone": "Europe/Paris", "latitude": 48.8566, "longitude": 2.3522}
+PANCHANGA_MONTH = {"year": 2025, "month": 1, "timezone": "Asia/Kolkata", "latitude": 19.076, "longitude": 72.8777}
+
+
+class Benchmark(NamedTuple):
+    name: str
+    description: str
+    # One operation; coroutine functions run on the benchmark event loop
+    operation: Callable[[], Any]
+    # Called before every operation, outside the timing
+    setup: Optional[Callable[[], None]] = None
+
+
+def reset_month_caches() -> None:
+    """Forget every cached month response and the per-day caches behind it"""
+    main.month_response_cache.clear()
+    etag_index.clear()
+    sun_times_cache.clear()
+    offset_tables_cache.clear()
+
+
+def _nakshatras() -> None:
+    for longitude in LONGITUDES:
+        main.get_nakshatra(longitude, JD)
+
+
+def _tithis() -> None:
+    for sun, moon in LONGITUDE_PAIRS:
+        main.get_tithi(sun, moon)
+
+
+def _yogas() -> None:
+    for sun, moon in LONGITUDE_PAIRS:
+        main.get_yoga(sun, moon)
+
+
+def _karanas() -> None:
+    for tithi_num in range(1, 31):
+        main.get_karana(tithi_num)
+
+
+def _yoga_rules() -> None:
+    rules = [rule["rule"] for rule in main.load_yoga_rules()]
+    for context in YOGA_CONTEXTS:
+        for rule in rules:
+            main.evaluate_yoga_rule(rule, context)
+
+
+def _navatara_mappings() -> None:
+    for scheme in (27, 28):
+        for index in range(1, 28):
+            main.compute_navatara(main.NavataraRequest(startNakshatraIndex=index), "moon", scheme)
+
+
+def _navatara_moon() -> None:
+    request = main.NavataraRequest(
+        datetime="2025-01-15T12:00:00+05:30", timezone="Asia/Kolkata", latitude=19.076, longitude=72.8777
+    )
+    main.compute_navatara(request, "moon", 27)
+
+
+def month_request(client: httpx.AsyncClient, path: str, body: dict) -> Callable[[], Any]:
+    async def operation() -> None:
+        response = await client.post(path, json=body)
+        response.raise_for_status()
+    return operation
+
+
+def benchmark_suite(client: httpx.AsyncClient) -> List[Benchmark]:
+    """Every benchmark, month requests going through client"""
+    return [
+        Benchmark("get_nakshatra", f"{len(LONGITUDES)} longitudes", _nakshatras),
+        Benchmark("get_tithi", f"{len(LONGITUDE_PAIRS)} Sun/Moon pairs", _tithis),
+        Benchmark("get_yoga", f"{len(LONGITUDE_PAIRS)} Sun/Moon pairs", _yogas),
+        Benchmark("get_karana", "30 tithis", _karanas),
+        Benchmark("evaluate_yoga_rule", f"every dataset rule x {len(YOGA_CONTEXTS)} contexts", _yoga_rules),
+        Benchmark("navatara_mapping", "27 start nakshatras x schemes 27 and 28", _navatara_mappings),
+        Benchmark("navatara_mapping_moon", "start nakshatra from the Moon at a datetime", _navatara_moon),
+        Benchmark("positions_month", "POST /positions/month, cold",
+                  month_request(client, "/positions/month", POSITIONS_MONTH), reset_month_caches),
+        Benchmark("panchanga_month", "POST /panchanga/month, cold",
+                  month_request(client, "/panchanga/month", PANCHANGA_MONTH), reset_month_caches),
+        Benchmark("panchanga_month_cached", "POST /panchanga/month, response cache hit",
+                  month_request(client, "/panchanga/month", PANCHANGA_MONTH)),
+    ]
+
+
+def _timed(loop: asyncio.AbstractEventLoop, benchmark: Benchmark, number: int) -> float:
+    """Seconds spent in number operations, setup excluded"""
+    is_async = asyncio.iscoroutinefunction(benchmark.operation)
+    elapsed = 0.0
+    for _ in range(number):
+        if benchmark.setup is not None:
+            benchmark.setup()
+        start = time.perf_counter()
+        if is_async:
+            loop.run_until_complete(benchmark.operation())
+        else:
+            benchmark.operation()
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def measure(loop: asyncio.AbstractEventLoop, benchmark: Benchmark, rounds: int, min_time: float) -> dict:
+    """Median and best seconds per operation over rounds calibrated rounds"""
+    # Warm-up (first-use loading is not timed), then calibrate number
+    _timed(loop, benchmark, 1)
+    number = 1
+    elapsed = _timed(loop, benchmark, number)
+    while elapsed < min_time:
+        number = max(number * 2, int(number * min_time / elapsed) + 1) if elapsed > 0 else number * 10
+        elapsed = _timed(loop, benchmark, number)
+    per_op = [_timed(loop, benchmark, number) / number for _ in range(rounds)]
+    return {
+        "description": benchmark.description,
+        "median": statistics.median(per_op),
+        "min": min(per_op),
+        "rounds": rounds,
+        "number": number,
+    }
+
+
+def run_benchmarks(names: Optional[Sequence[str]] = None, rounds: int = 5, min_time: float = 0.2) -> dict:
+    """Run the suite (or the named benchmarks) and return the results document"""
+    loop = asyncio.new_event_loop()
+    saved = main.REMOTE_API_BASE_URL, main.result_store
+    main.REMOTE_API_BASE_URL, main.result_store = None, None
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark")
+    try:
+        suite = benchmark_suite(client)
+        if names:
+            unknown = set(names) - {benchmark.name for benchmark in suite}
+            if unknown:
+                raise ValueError(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+            suite = [benchmark for benchmark in suite if benchmark.name in names]
+        results = {benchmark.name: measure(loop, benchmark, rounds, min_time) for benchmark in suite}
+    finally:
+        loop.run_until_complete(client.aclose())
+        loop.close()
+        main.REMOTE_API_BASE_URL, main.result_store = saved
+        reset_month_caches()
+    return {
+        "createdAt": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "unit": "seconds per operation",
+        "benchmarks": results,
+    }
+
+
+def load_results(path: Path) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: dict, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+    # Relative change of the median, positive when slower
+    change: Optional[float]
+    regressed: bool
+
+
+def compare(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    """Per-benchmark comparison of medians; only benchmarks run in current are checked"""
+    rows = []
+    for name, result in current["benchmarks"].items():
+        reference = baseline["benchmarks"].get(name)
+        if reference is None:
+            rows.append(Comparison(name, None, result["median"], None, False))
+            continue
+        change = result["median"] / reference["median"] - 1
+        rows.append(Comparison(name, reference["median"], result["median"], change, change > threshold))
+    return rows
@@ -0,0 +1,123 @@
+"""Circuit breaker for the remote API.
+
+The breaker watches the outcome and duration of the last ``window`` remote
+calls. Once at least ``min_calls`` were seen and the share of failed calls
+reaches ``failure_rate`` (or the share slower than ``slow_call_seconds``
+reaches ``slow_call_rate``) the circuit opens: calls are refused at once
+and callers fall back to the local calculation. After ``open_seconds`` the
+circuit is half-open and lets ``half_open_probes`` calls through; if they
+all succeed it closes again, otherwise it reopens for another period.
+"""
+import os
+import time
+from collections import deque
+from typing import Callable, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Failure-rate and latency circuit breaker with half-open probing"""
+
+    def __init__(self, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 5.0, slow_call_rate: float = 0.8,
+                 open_seconds: float = 30.0, half_open_probes: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.clock = clock
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_reason: Optional[str] = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._calls: deque = deque(maxlen=window)  # (failed, slow) per call
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @classmethod
+    def from_env(cls) -> "CircuitBreaker":
+        return cls(
+            window=int(os.getenv("REMOTE_BREAKER_WINDOW", "20")),
+            min_calls=int(os.getenv("REMOTE_BREAKER_MIN_CALLS", "5")),
+            failure_rate=float(os.getenv("REMOTE_BREAKER_FAILURE_RATE", "0.5")),
+            slow_call_seconds=float(os.getenv("REMOTE_BREAKER_SLOW_CALL_SECONDS", "5")),
+            slow_call_rate=float(os.getenv("REMOTE_BREAKER_SLOW_CALL_RATE", "0.8")),
+            open_seconds=float(os.getenv("REMOTE_BREAKER_OPEN_SECONDS", "30")),
+        )
+
+    def allow(self) -> bool:
+        """Whether a call may go to the remote API now; every allowed call must be recorded"""
+        if self.state == OPEN:
+            if self.clock() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        if self.state == HALF_OPEN:
+            if self._probes_in_flight + self._probe_successes >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def record(self, ok: Optional[bool], duration: float) -> None:
+        """Outcome of an allowed call (None: abandoned before it had one)"""
+        if self.state == HALF_OPEN:
+            self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+            if ok is None:
+                return
+            if not ok:
+                self._open("half-open probe failed")
+            elif duration >= self.slow_call_seconds:
+                self._open(f"half-open probe took {duration:.1f}s")
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self.state = CLOSED
+                    self.opened_at = None
+                    self._calls.clear()
+            return
+        if ok is None or self.state == OPEN:
+            return
+        self._calls.append((not ok, duration >= self.slow_call_seconds))
+        if len(self._calls) < self.min_calls:
+            return
+        failed = sum(call[0] for call in self._calls) / len(self._calls)
+        slow = sum(call[1] for call in self._calls) / len(self._calls)
+        if failed >= self.failure_rate:
+            self._open(f"failure rate {failed:.0%} over the last {len(self._calls)} calls")
+        elif slow >= self.slow_call_rate:
+            self._open(f"{slow:.0%} of the last {len(self._calls)} calls slower than {self.slow_call_seconds:g}s")
+
+    def _open(self, reason: str) -> None:
+        self.state = OPEN
+        self.opened_at = self.clock()
+        self.last_reason = reason
+        self.times_opened += 1
+        self._calls.clear()
+        print(f"Remote API circuit opened: {reason}")
+
+    def snapshot(self) -> dict:
+        calls = len(self._calls)
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(self.open_seconds - (self.clock() - self.opened_at), 0.0), 2)
+        return {
+            "state": self.state,
+            "calls": calls,
+            "failureRate": round(sum(call[0] for call in self._calls) / calls, 3) if calls else 0.0,
+            "slowCallRate": round(sum(call[1] for call in self._calls) / calls, 3) if calls else 0.0,
+            "timesOpened": self.times_opened,
+            "rejected": self.rejected,
+            "retryInSeconds": retry_in,
+            "lastReason": self.last_reason,
+        }
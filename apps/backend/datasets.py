@@ -0,0 +1,91 @@
+"""Static JSON datasets held in memory with their encoded responses.
+
+Each dataset is parsed once and kept together with its JSON response body,
+a gzipped copy of that body and an ETag, so ``/data/*`` requests only copy
+bytes. The file's mtime is re-checked at most every ``check_interval``
+seconds and the dataset reloaded only when it changed.
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from http_cache import compute_etag, encode_json
+
+GZIP_LEVEL = 6
+
+
+class DatasetSnapshot(NamedTuple):
+    data: Any
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    gzip_etag: str
+    mtime_ns: Optional[int]
+
+
+class StaticDataset:
+    """A JSON file loaded once and reloaded when its mtime changes"""
+
+    def __init__(self, path: str, default: Any, check_interval: float = 1.0):
+        self.path = path
+        self.default = default
+        self.check_interval = check_interval
+        self.loads = 0
+        self._snapshot: Optional[DatasetSnapshot] = None
+        self._derived: Dict[Callable, Tuple[DatasetSnapshot, Any]] = {}
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _mtime_ns(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _load(self, mtime_ns: Optional[int]) -> DatasetSnapshot:
+        if mtime_ns is None:
+            data = self.default
+        else:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        body = encode_json(data)
+        etag = compute_etag(body)
+        self.loads += 1
+        return DatasetSnapshot(
+            data=data,
+            body=body,
+            gzip_body=gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0),
+            etag=etag,
+            gzip_etag=etag[:-1] + '-gzip"',
+            mtime_ns=mtime_ns,
+        )
+
+    def snapshot(self) -> DatasetSnapshot:
+        """Current contents, reloaded first if the file changed"""
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked < self.check_interval:
+            return snapshot
+        with self._lock:
+            self._checked = now
+            mtime_ns = self._mtime_ns()
+            if self._snapshot is None or self._snapshot.mtime_ns != mtime_ns:
+                self._snapshot = self._load(mtime_ns)
+            return self._snapshot
+
+    def derived(self, build: Callable[[Any], Any]) -> Any:
+        """``build(data)``, rebuilt only when the dataset reloads"""
+        snapshot = self.snapshot()
+        cached = self._derived.get(build)
+        if cached is None or cached[0] is not snapshot:
+            cached = (snapshot, build(snapshot.data))
+            self._derived[build] = cached
+        return cached[1]
+
+    @property
+    def data(self) -> Any:
+        """Parsed contents (shared; do not mutate)"""
+        return self.snapshot().data
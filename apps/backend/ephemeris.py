@@ -0,0 +1,122 @@
+"""Batch ephemeris engine.
+
+Computes planetary positions for a whole vector of Julian days and a set of
+planets in one pass. Results are NumPy arrays shaped ``(planets, days)`` so
+callers can derive nakshatra, pada and sign with array operations and only
+build response models once, at the edge.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Sequence
+
+import numpy as np
+import swisseph as swe
+
+from ayanamsa import get_ayanamsa_provider
+from metrics import CALC_UT_CALLS
+
+NAKSHATRA_SPAN = 360.0 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+SIGN_SPAN = 30.0
+
+# Bodies that are derived as the point opposite to their Swiss Ephemeris id
+OPPOSITE_BODIES = {"Ketu"}
+
+# Default epoch for the scalar helpers in main.py (2000-01-01 12:00 UT)
+J2000_JD = 2451545.0
+
+# Julian day of the Unix epoch (1970-01-01 00:00 UT)
+UNIX_EPOCH_JD = 2440587.5
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def jd_to_datetime(jd: float) -> datetime:
+    """Aware UTC datetime for a Julian day (UT), rounded to the second"""
+    seconds = round((jd - UNIX_EPOCH_JD) * 86400.0)
+    return _UNIX_EPOCH + timedelta(seconds=seconds)
+
+
+def jd_to_iso(jd: float) -> str:
+    """ISO 8601 UTC timestamp (``YYYY-MM-DDTHH:MM:SSZ``) for a Julian day"""
+    return jd_to_datetime(jd).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def julian_days(dates: Sequence[str], hour: float = 12.0) -> np.ndarray:
+    """Julian days for ISO ``YYYY-MM-DD`` dates at the given UT hour"""
+    jds = np.empty(len(dates), dtype=np.float64)
+    for i, date_str in enumerate(dates):
+        d = date.fromisoformat(date_str)
+        jds[i] = swe.julday(d.year, d.month, d.day, hour)
+    return jds
+
+
+def sidereal_longitudes(tropical: np.ndarray, ayanamsa) -> np.ndarray:
+    """Apply an ayanamsa (scalar or per-sample array) to tropical longitudes"""
+    return np.mod(tropical - ayanamsa, 360.0)
+
+
+def nakshatra_indices(sidereal: np.ndarray) -> Dict[str, np.ndarray]:
+    """Vectorized equivalent of ``get_nakshatra``/``get_sidereal_sign``.
+
+    Returns 1-based nakshatra index, pada (1-4) and 0-based sign index.
+    """
+    position = sidereal / NAKSHATRA_SPAN
+    nakshatra = np.minimum(np.floor(position), 26).astype(np.int64)
+    pada = np.minimum(np.floor((position - nakshatra) * 4), 3).astype(np.int64) + 1
+    sign = np.minimum(np.floor(sidereal / SIGN_SPAN), 11).astype(np.int64)
+    return {
+        "nakshatra_index": nakshatra + 1,
+        "pada": pada,
+        "sign_index": sign,
+    }
+
+
+def compute_positions_batch(jds: np.ndarray, planets: Dict[str, int]) -> Dict[str, np.ndarray]:
+    """Compute positions for every planet at every Julian day.
+
+    Sidereal values use the per-date ayanamsa from ``ayanamsa.py``.
+    ``planets`` maps display names to Swiss Ephemeris ids (``PLANETS`` in
+    main.py). Each distinct id is computed once; bodies in
+    ``OPPOSITE_BODIES`` reuse the result of their id shifted by 180 degrees.
+
+    Returns a dict of arrays shaped ``(len(planets), len(jds))``:
+    ``longitude``, ``latitude``, ``speed`` (tropical), ``sidereal``,
+    ``nakshatra_index``, ``pada`` and ``sign_index``.
+    """
+    jds = np.asarray(jds, dtype=np.float64)
+    names: List[str] = list(planets.keys())
+    raw: Dict[int, np.ndarray] = {}
+
+    for planet_id in dict.fromkeys(planets.values()):
+        values = np.empty((len(jds), 3), dtype=np.float64)
+        for i, jd in enumerate(jds.tolist()):
+            xx = swe.calc_ut(jd, planet_id)[0]
+            values[i, 0] = xx[0]
+            values[i, 1] = xx[1]
+            values[i, 2] = xx[3]
+        raw[planet_id] = values
+    CALC_UT_CALLS.inc(len(jds) * len(raw))
+
+    longitude = np.empty((len(names), len(jds)), dtype=np.float64)
+    latitude = np.empty_like(longitude)
+    speed = np.empty_like(longitude)
+    for row, name in enumerate(names):
+        values = raw[planets[name]]
+        if name in OPPOSITE_BODIES:
+            longitude[row] = np.mod(values[:, 0] + 180.0, 360.0)
+            latitude[row] = -values[:, 1]
+        else:
+            longitude[row] = values[:, 0]
+            latitude[row] = values[:, 1]
+        speed[row] = values[:, 2]
+
+    ayanamsa = get_ayanamsa_provider().at_many(jds)
+    sidereal = sidereal_longitudes(longitude, ayanamsa[np.newaxis, :])
+
+    result = {
+        "longitude": longitude,
+        "latitude": latitude,
+        "speed": speed,
+        "sidereal": sidereal,
+    }
+    result.update(nakshatra_indices(sidereal))
+    return result
@@ -0,0 +1,103 @@
+"""Compute executor for CPU-bound calculation work.
+
+Route handlers are ``async def``; running swisseph loops, rule evaluation and
+model construction inline blocks the event loop for every other request
+(including ``/healthz``). Handlers dispatch that work here instead.
+
+Modes (``COMPUTE_EXECUTOR``):
+
+- ``thread`` (default): a thread pool. swisseph holds the GIL, so this keeps
+  the loop responsive rather than adding parallelism.
+- ``process``: a process pool with one swisseph instance per worker, for
+  real parallelism across cores. Callables and arguments must be picklable
+  (module-level functions, pydantic models, plain data).
+
+``COMPUTE_WORKERS`` sets the pool size (default: CPU count). Every worker runs
+``init_worker`` once, so swisseph global state (ephemeris path, sidereal
+mode) is set up before it handles any job.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+import swisseph as swe
+
+from ayanamsa import resolve_sidereal_mode
+from profiling import active_profile, profiled_call
+
+EXECUTOR_MODES = ("thread", "process")
+
+
+def init_worker() -> None:
+    """Initialize swisseph global state in a worker"""
+    swe.set_ephe_path(os.getenv("EPHE_PATH", "/app/ephe"))
+    swe.set_sid_mode(resolve_sidereal_mode())
+
+
+class ComputeExecutor:
+    """Lazily started thread or process pool for calculation work"""
+
+    def __init__(self, mode: str = "thread", workers: Optional[int] = None):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown executor mode: {mode}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        # Jobs submitted and not yet finished (updated on the event loop only)
+        self.in_flight = 0
+
+    @classmethod
+    def from_env(cls) -> "ComputeExecutor":
+        workers = os.getenv("COMPUTE_WORKERS")
+        return cls(
+            mode=os.getenv("COMPUTE_EXECUTOR", "thread").lower(),
+            workers=int(workers) if workers else None,
+        )
+
+    @property
+    def pool(self) -> Executor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    if self.mode == "process":
+                        self._pool = ProcessPoolExecutor(
+                            max_workers=self.workers, initializer=init_worker
+                        )
+                    else:
+                        self._pool = ThreadPoolExecutor(
+                            max_workers=self.workers,
+                            initializer=init_worker,
+                            thread_name_prefix="compute",
+                        )
+        return self._pool
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` in the pool and await its result"""
+        loop = asyncio.get_running_loop()
+        call = partial(fn, *args, **kwargs)
+        request_profile = active_profile()
+        self.in_flight += 1
+        try:
+            if request_profile is None:
+                return await loop.run_in_executor(self.pool, call)
+            # Profiled requests also profile their calculation, inside the worker
+            result, stats = await loop.run_in_executor(self.pool, partial(profiled_call, call))
+            request_profile.add(stats)
+            return result
+        finally:
+            self.in_flight -= 1
+
+    @property
+    def queued(self) -> int:
+        """Jobs waiting for a free worker"""
+        return max(self.in_flight - self.workers, 0)
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
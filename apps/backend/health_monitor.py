@@ -0,0 +1,106 @@
+"""Background health probing of the remote API.
+
+``HealthMonitor`` probes every endpoint concurrently once per ``interval``
+seconds in a background task and keeps the last ``window`` results per
+endpoint, from which it derives rolling p50/p95 latency and error rate.
+Readers (``/diagnostics/ping``) only take the latest snapshot, so they never
+wait on the network.
+"""
+import asyncio
+import math
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+
+class ProbeResult(NamedTuple):
+    ok: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+    latency_ms: Optional[float] = None
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of values, None if empty"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class HealthMonitor:
+    """Periodic concurrent probes with rolling latency and error statistics"""
+
+    def __init__(self, check: Callable[[str], Awaitable[ProbeResult]], endpoints: Sequence[str],
+                 interval: float = 30.0, window: int = 60):
+        self.check = check
+        self.endpoints = list(endpoints)
+        self.interval = interval
+        self.window = window
+        self.rounds = 0
+        self.checked_at: Optional[str] = None
+        self._history: Dict[str, deque] = {endpoint: deque(maxlen=window) for endpoint in self.endpoints}
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls, check: Callable[[str], Awaitable[ProbeResult]], endpoints: Sequence[str]) -> "HealthMonitor":
+        return cls(
+            check,
+            endpoints,
+            interval=float(os.getenv("REMOTE_HEALTH_INTERVAL", "30")),
+            window=int(os.getenv("REMOTE_HEALTH_WINDOW", "60")),
+        )
+
+    async def _probe(self, endpoint: str) -> ProbeResult:
+        try:
+            return await self.check(endpoint)
+        except Exception as e:
+            return ProbeResult(ok=False, error=str(e))
+
+    async def probe_once(self) -> None:
+        """Probe every endpoint concurrently and record the results"""
+        results = await asyncio.gather(*(self._probe(endpoint) for endpoint in self.endpoints))
+        for endpoint, result in zip(self.endpoints, results):
+            self._history[endpoint].append(result)
+        self.rounds += 1
+        self.checked_at = datetime.now(timezone.utc).isoformat()
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_once()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        """Latest result and rolling statistics per endpoint"""
+        endpoints = {}
+        for endpoint, history in self._history.items():
+            if not history:
+                continue
+            latest = history[-1]
+            latencies: List[float] = [r.latency_ms for r in history if r.latency_ms is not None]
+            endpoints[endpoint] = {
+                "ok": latest.ok,
+                "status": latest.status,
+                "error": latest.error,
+                "latencyMs": latest.latency_ms,
+                "p50Ms": percentile(latencies, 50),
+                "p95Ms": percentile(latencies, 95),
+                "errorRate": round(sum(not r.ok for r in history) / len(history), 3),
+                "samples": len(history),
+            }
+        return {"checkedAt": self.checked_at, "rounds": self.rounds, "endpoints": endpoints}
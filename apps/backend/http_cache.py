@@ -0,0 +1,91 @@
+"""HTTP validators for deterministic responses.
+
+Month, navatara and dataset responses are pure functions of the request (and
+of the engine configuration the process runs with), so they carry a strong
+content-hash ``ETag``. The hash of every response we have produced is kept in
+``etag_index`` under the same normalized key as the response itself; a
+request whose ``If-None-Match`` matches the indexed tag is answered with 304
+before any calculation runs.
+"""
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, NamedTuple, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from cache import LRUCache
+
+# Ranges that ended before yesterday (UTC) are final everywhere on Earth
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+DEFAULT_CACHE_CONTROL = f"public, max-age={int(os.getenv('HTTP_CACHE_MAX_AGE', '3600'))}"
+
+# Normalized request key -> ETag of the response it produced. Tags are small,
+# so the index outlives the (much larger) cached bodies.
+etag_index = LRUCache(int(os.getenv("ETAG_INDEX_SIZE", "100000")))
+
+
+class EncodedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+def encode_json(content: Any) -> bytes:
+    """Serialize like FastAPI's JSONResponse"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+        indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def compute_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def encode_response(content: Any) -> EncodedResponse:
+    """JSON body and ETag of a response model or plain data"""
+    if isinstance(content, BaseModel):
+        content = content.model_dump(mode="json", by_alias=True)
+    body = encode_json(content)
+    return EncodedResponse(body, compute_etag(body))
+
+
+def etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Whether an If-None-Match header value matches an ETag (weak comparison)"""
+    if not if_none_match or etag is None:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header value allows gzip"""
+    for coding in (accept_encoding or "").lower().split(","):
+        name, _, params = coding.strip().partition(";")
+        if name in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def cache_control_until(last_date: date) -> str:
+    """Cache-Control for data covering days up to last_date"""
+    yesterday = datetime.now(timezone.utc).date() - timedelta(days=1)
+    return IMMUTABLE_CACHE_CONTROL if last_date < yesterday else DEFAULT_CACHE_CONTROL
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(encoded: EncodedResponse, cache_control: str) -> Response:
+    return Response(
+        content=encoded.body,
+        media_type="application/json",
+        headers={"ETag": encoded.etag, "Cache-Control": cache_control}
+    )
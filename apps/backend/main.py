@@ -1,94 +1,128 @@
+from __future__ import annotations
+
 import os
 import json
+import asyncio
+import calendar
+from contextlib import asynccontextmanager
+from functools import lru_cache
 import math
-import requests
 import time
-import httpx
 from datetime import datetime, date, timedelta
 from typing import List, Optional, Dict, Any, Union
+import numpy as np
 import swisseph as swe
 import pytz
 from dateutil import parser
-from fastapi import FastAPI, HTTPException, Query, Body
+from fastapi import FastAPI, HTTPException, Query, Body, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel, Field, validator
 
+from ayanamsa import get_ayanamsa_provider, resolve_sidereal_mode
+from cache import LRUCache
+from datasets import StaticDataset
+from ephemeris import J2000_JD, compute_positions_batch, jd_to_iso, julian_days
+from executor import ComputeExecutor
+from health_monitor import HealthMonitor, ProbeResult
+from http_cache import (
+    DEFAULT_CACHE_CONTROL,
+    EncodedResponse,
+    accepts_gzip,
+    cache_control_until,
+    encode_json,
+    encode_response,
+    etag_index,
+    etag_matches,
+    json_response,
+    not_modified,
+)
+from metrics import CALC_UT_CALLS, REMOTE_FALLBACKS, MetricsMiddleware, loop_lag_monitor, registry
+from muhurta import DayTimeline, search_timelines, timeline_cache
+from panchanga_engine import ELEMENTS, KARANA_SPAN, SunMoonGrid
+from profiling import PROFILING_ENABLED, ProfilingMiddleware, profiles
+from remote_cache import StaleWhileRevalidateCache
+from remote_client import CircuitOpenError, RemoteAPIError, RemoteClient
+from result_store import ResultStore
+from singleflight import SingleFlight
+from sunrise import get_sun_times_for_dates, sun_times_cache
+from timezones import jd_to_local_iso, local_midnight_jd, offset_tables_cache
+from transitions import INGRESS_KINDS, find_ingresses
+from warmup import load_cities, month_window, warmup_jobs
+from yoga_rules import CompiledRuleSet, RuleSyntaxError, compile_expression, with_defaults
+
 # Remote API configuration
 REMOTE_API_BASE_URL = os.getenv("REMOTE_API_BASE_URL")
 REMOTE_API_KEY = os.getenv("REMOTE_API_KEY")
 
-# Retry configuration
-RETRY_DELAYS = [0.25, 0.5, 1.0]  # seconds
-TIMEOUT = 20  # seconds
 
 # Initialize Swiss Ephemeris
 swe.set_ephe_path(os.getenv("EPHE_PATH", "/app/ephe"))
+swe.set_sid_mode(resolve_sidereal_mode())
+
+# Remote API client (shared connection pool, disabled unless REMOTE_API_BASE_URL is set)
+remote_client = RemoteClient.from_env()
+
+# Identical requests arriving together share one remote call / one calculation
+remote_flights = SingleFlight()
+compute_flights = SingleFlight()
 
-# Remote API client with retry logic
-def call_remote_api(endpoint: str, method: str = "GET", data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict:
-    """Call remote API with exponential backoff retry"""
-    if not REMOTE_API_BASE_URL:
+# Deterministic remote GETs, served from memory and refreshed in the background
+CACHEABLE_REMOTE_ENDPOINTS = {
+    "v1/panchanga/precise/daily",
+    "v1/ephemeris/planets",
+    "v1/panchanga/yogas/detect",
+}
+remote_response_cache = StaleWhileRevalidateCache.from_env()
+
+# Remote daily panchanga requests one month may have in flight at once
+REMOTE_FANOUT_CONCURRENCY = int(os.getenv("REMOTE_FANOUT_CONCURRENCY", "10"))
+
+async def call_remote_api(endpoint: str, method: str = "GET", data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict:
+    """Call remote API with jittered retries and a per-call deadline"""
+    if remote_client is None:
         raise HTTPException(status_code=500, detail="Remote API not configured")
     
-    url = f"{REMOTE_API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    
-    if REMOTE_API_KEY:
-        headers["X-API-Key"] = REMOTE_API_KEY
+    key = (method.upper(), endpoint.strip("/"), json.dumps([params, data], sort_keys=True, default=str))
     
-    for attempt, delay in enumerate(RETRY_DELAYS):
-        try:
-            if method.upper() == "GET":
-                response = requests.get(url, headers=headers, params=params, timeout=TIMEOUT)
-            else:
-                response = requests.post(url, headers=headers, json=data, timeout=TIMEOUT)
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            if attempt == len(RETRY_DELAYS) - 1:  # Last attempt
-                raise HTTPException(status_code=502, detail=f"Remote API error: {str(e)}")
-            
-            print(f"Remote API attempt {attempt + 1} failed, retrying in {delay}s...")
-            time.sleep(delay)
-    
-    raise HTTPException(status_code=502, detail="Remote API unavailable")
-
-async def check_remote_endpoint(client: httpx.AsyncClient, endpoint: str, timeout: float = 20.0) -> EndpointStatus:
-    """Check a specific remote endpoint"""
-    url = f"{REMOTE_API_BASE_URL.rstrip('/')}/{endpoint.lstrip('/')}"
-    headers = {
-        "Content-Type": "application/json",
-        "Accept": "application/json"
-    }
-    
-    if REMOTE_API_KEY:
-        headers["X-API-Key"] = REMOTE_API_KEY
+    def fetch():
+        return remote_flights.do(
+            key, lambda: remote_client.request(method, endpoint, params=params, json=data)
+        )
     
     try:
-        start_time = time.time()
-        response = await client.get(url, headers=headers, timeout=timeout)
-        latency = (time.time() - start_time) * 1000
-        
-        return EndpointStatus(
-            ok=response.status_code < 400,
-            status=response.status_code,
-            latencyMs=round(latency, 2)
-        )
+        if key[0] == "GET" and key[1] in CACHEABLE_REMOTE_ENDPOINTS:
+            return await remote_response_cache.get(key, fetch)
+        return await fetch()
+    except CircuitOpenError as e:
+        # Fail fast so callers go straight to the local calculation
+        raise HTTPException(status_code=503, detail=f"Remote API unavailable: {e.detail}")
+    except RemoteAPIError as e:
+        raise HTTPException(status_code=502, detail=f"Remote API error: {e.detail}")
+
+# Remote endpoints probed in the background for /diagnostics/ping
+REMOTE_HEALTH_ENDPOINTS = [
+    "/health/healthz",
+    "/v1/panchanga/precise/daily",
+    "/v1/ephemeris/planets"
+]
+REMOTE_HEALTH_TIMEOUT = float(os.getenv("REMOTE_HEALTH_TIMEOUT", "10"))
+
+async def check_remote_endpoint(endpoint: str) -> ProbeResult:
+    """Check a specific remote endpoint (over the pooled client's connections)"""
+    try:
+        start_time = time.perf_counter()
+        response = await remote_client.client.get(endpoint.lstrip('/'), timeout=REMOTE_HEALTH_TIMEOUT)
+        latency = (time.perf_counter() - start_time) * 1000
+        return ProbeResult(ok=response.status_code < 400, status=response.status_code, latency_ms=round(latency, 2))
     except Exception as e:
-        return EndpointStatus(
-            ok=False,
-            error=str(e),
-            latencyMs=None
-        )
+        return ProbeResult(ok=False, error=str(e) or type(e).__name__)
 
-async def diagnose_remote_api() -> RemoteDiagnostic:
-    """Diagnose remote API connectivity"""
-    if not REMOTE_API_BASE_URL:
+health_monitor = HealthMonitor.from_env(check_remote_endpoint, REMOTE_HEALTH_ENDPOINTS)
+
+def diagnose_remote_api() -> RemoteDiagnostic:
+    """Remote API connectivity, from the latest background probes"""
+    if remote_client is None:
         return RemoteDiagnostic(
             baseUrl="",
             ok=False,
@@ -96,39 +130,17 @@ async def diagnose_remote_api() -> RemoteDiagnostic:
             endpoints={}
         )
     
-            # Test endpoints to check
-        endpoints_to_test = [
-            "/health/healthz",
-            "/v1/panchanga/precise/daily",
-            "/v1/ephemeris/planets"
-        ]
-    
-    async with httpx.AsyncClient() as client:
-        # Test base connectivity first
-        base_start = time.time()
-        try:
-            base_response = await client.get(
-                f"{REMOTE_API_BASE_URL.rstrip('/')}/health/healthz",
-                timeout=20.0
-            )
-            base_latency = (time.time() - base_start) * 1000
-            base_ok = base_response.status_code < 400
-        except Exception as e:
-            base_latency = None
-            base_ok = False
-        
-        # Test individual endpoints
-        endpoint_results = {}
-        for endpoint in endpoints_to_test:
-            result = await check_remote_endpoint(client, endpoint)
-            endpoint_results[endpoint] = result
-        
-        return RemoteDiagnostic(
-            baseUrl=REMOTE_API_BASE_URL,
-            ok=base_ok,
-            latencyMs=round(base_latency, 2) if base_latency else None,
-            endpoints=endpoint_results
-        )
+    snapshot = health_monitor.snapshot()
+    base = snapshot["endpoints"].get("/health/healthz")
+    return RemoteDiagnostic(
+        baseUrl=REMOTE_API_BASE_URL,
+        ok=bool(base and base["ok"]),
+        latencyMs=base["latencyMs"] if base else None,
+        error=None if snapshot["checkedAt"] else "No health probe has completed yet",
+        endpoints={endpoint: EndpointStatus(**status) for endpoint, status in snapshot["endpoints"].items()},
+        checkedAt=snapshot["checkedAt"],
+        circuit=remote_client.breaker.snapshot() if remote_client.breaker else None
+    )
 
 def transform_remote_positions(remote_data: Dict) -> PositionsMonthResponse:
     """Transform remote API response to our contract"""
@@ -172,42 +184,83 @@ def transform_remote_positions(remote_data: Dict) -> PositionsMonthResponse:
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error transforming remote data: {str(e)}")
 
-def transform_remote_panchanga(remote_data: Dict) -> PanchangaMonthResponse:
-    """Transform remote API response to our contract"""
-    try:
-        # Transform the remote API response to match our expected format
-        days = []
-        
-        if "panchanga" in remote_data:
-            panchanga_data = remote_data["panchanga"]
-            day_info = {
-                "date": remote_data.get("date", "2025-01-01"),
-                "tithi": {
-                    "code": panchanga_data.get("tithi", {}).get("display", "K1"),
-                    "group": "Nanda"  # Default value
-                },
-                "vara": panchanga_data.get("vara", {}).get("name", "Monday"),
-                "nakshatra": {
-                    "name": panchanga_data.get("nakshatra", {}).get("name", "Ashwini"),
-                    "pada": 1  # Default value
-                },
-                "yoga": panchanga_data.get("yoga", {}).get("name", "Vishkumbha"),
-                "karana": panchanga_data.get("karana", {}).get("name", "Bava"),
-                "sunrise": remote_data.get("sunrise_time", "06:00:00"),
-                "sunset": remote_data.get("sunset_time", "18:00:00"),
-                "specialYogas": [],
-                "recommendations": []
-            }
-            days.append(day_info)
-        
-        return PanchangaMonthResponse(days=days)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error transforming remote data: {str(e)}")
+def remote_time_to_iso(value: str, day: str, tz: str) -> str:
+    """Remote sunrise/sunset (ISO datetime or local HH:MM[:SS]) as a local ISO timestamp"""
+    zone = pytz.timezone(tz)
+    if "T" in value:
+        moment = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        moment = zone.localize(moment) if moment.tzinfo is None else moment.astimezone(zone)
+    else:
+        moment = zone.localize(datetime.fromisoformat(f"{day}T{value}"))
+    return moment.replace(microsecond=0).isoformat()
+
+def transform_remote_panchanga_day(remote_data: Dict, day: str, tz: str, yoga_rules: CompiledRuleSet) -> PanchangaDay:
+    """Transform one remote daily panchanga to our contract
+    
+    Raises KeyError/ValueError when the remote payload lacks a field we need,
+    so the caller can fill that day locally instead.
+    """
+    panchanga = remote_data["panchanga"]
+    tithi_name = TITHI_NAMES[int(panchanga["tithi"]["number"]) - 1]
+    tithi = {"code": tithi_name, "group": TITHI_GROUPS[tithi_name]}
+    nakshatra_index = int(panchanga["nakshatra"]["number"])
+    vara = panchanga["vara"]["name"]
+    context = {"vara": vara, "tithiGroup": tithi["group"], "nakshatraIndex": nakshatra_index}
+    sunrise = remote_data.get("sunrise") or remote_data["sunrise_time"]
+    sunset = remote_data.get("sunset") or remote_data["sunset_time"]
+    
+    return PanchangaDay(
+        date=day,
+        sunriseISO=remote_time_to_iso(sunrise, day, tz),
+        sunsetISO=remote_time_to_iso(sunset, day, tz),
+        tithi=tithi,
+        vara=vara,
+        nakshatra={
+            "index": nakshatra_index,
+            "nameIAST": NAKSHATRAS_IAST[nakshatra_index - 1],
+            "pada": int(panchanga["nakshatra"]["pada"])
+        },
+        yoga=panchanga["yoga"]["name"],
+        karana=panchanga["karana"]["name"],
+        specialYogas=detect_special_yogas(yoga_rules, context)
+    )
+
+# Calculation work runs here, off the event loop
+compute_executor = ComputeExecutor.from_env()
+
+# Month responses persisted across restarts (disabled unless RESULT_STORE_PATH is set)
+result_store = ResultStore.from_env()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optionally precompute popular months before serving any request
+    if os.getenv("WARMUP_ON_STARTUP", "").lower() in ("1", "true", "yes"):
+        try:
+            jobs = warmup_jobs(load_cities(), month_window(int(os.getenv("WARMUP_MONTHS", "2"))))
+            await warm_up_month_cache(jobs)
+            print(f"Warm-up complete: {len(jobs)} month responses cached")
+        except Exception as e:
+            print(f"Warm-up failed, continuing without it: {e}")
+    if remote_client is not None:
+        health_monitor.start()
+    loop_lag_monitor.start()
+    if result_store is not None:
+        result_store.start()
+    yield
+    await loop_lag_monitor.stop()
+    await health_monitor.stop()
+    compute_executor.shutdown()
+    if remote_client is not None:
+        await remote_client.aclose()
+    if result_store is not None:
+        await result_store.stop()
+        await asyncio.to_thread(result_store.close)
 
 app = FastAPI(
     title="Jyotish API",
     description="API for Vedic astrology calculations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -237,8 +290,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Profile-Id"],  # lets browser clients send If-None-Match on POST
 )
 
+# Opt-in profiling; not installed at all unless PROFILING_ENABLED is set
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Outermost, so request latency includes every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Pydantic models for new endpoints
 class PositionsMonthRequest(BaseModel):
     year: int = Field(..., ge=1900, le=2100)
@@ -268,6 +329,7 @@ class Transition(BaseModel):
     date: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
     from_nak: int = Field(..., ge=1, le=27, alias="from")
     to_nak: int = Field(..., ge=1, le=27, alias="to")
+    atISO: Optional[str] = Field(None, description="Exact UTC ingress instant")
     
     model_config = {"populate_by_name": True}
 
@@ -276,6 +338,26 @@ class PositionsMonthResponse(BaseModel):
     planets: List[PlanetMonth]
     transitions: List[Transition]
 
+class IngressRequest(BaseModel):
+    startDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
+    endDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$', description="Inclusive end date")
+    planets: Optional[List[str]] = None
+    kinds: Optional[List[str]] = Field(None, description="Any of nakshatra, pada, sign")
+
+class IngressEvent(BaseModel):
+    planet: str
+    kind: str = Field(..., pattern='^(nakshatra|pada|sign)$')
+    atISO: str
+    from_index: int = Field(..., alias="from")
+    to_index: int = Field(..., alias="to")
+    nakshatra: Optional[int] = Field(None, ge=1, le=27)
+    
+    model_config = {"populate_by_name": True}
+
+class IngressResponse(BaseModel):
+    range: Dict[str, str]
+    events: List[IngressEvent]
+
 class PanchangaMonthRequest(BaseModel):
     year: int = Field(..., ge=1900, le=2100)
     month: int = Field(..., ge=1, le=12)
@@ -294,26 +376,81 @@ class SpecialYoga(BaseModel):
     reason: str
     fulfilled_variables: Optional[Dict[str, Any]] = None
 
+class ElementInterval(BaseModel):
+    index: int = Field(..., ge=1, le=60)
+    name: str
+    startISO: str
+    endISO: str
+
+class PanchangaIntervals(BaseModel):
+    tithi: List[ElementInterval]
+    karana: List[ElementInterval]
+    yoga: List[ElementInterval]
+    nakshatra: List[ElementInterval]
+
 class PanchangaDay(BaseModel):
     date: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
-    sunriseISO: str
-    sunsetISO: str
+    sunriseISO: Optional[str] = Field(..., description="None when the Sun does not rise (polar day/night)")
+    sunsetISO: Optional[str] = Field(..., description="None when the Sun does not set (polar day/night)")
     tithi: TithiInfo
     vara: str
     nakshatra: NakshatraInfo
     yoga: str
     karana: str
     specialYogas: List[SpecialYoga]
+    intervals: Optional[PanchangaIntervals] = Field(None, description="Elements overlapping the day with exact start/end")
 
 class PanchangaMonthResponse(BaseModel):
     days: List[PanchangaDay]
 
+class PanchangaLocation(BaseModel):
+    id: Optional[str] = Field(None, description="Caller's label, echoed back")
+    timezone: str = Field(..., description="Timezone string like 'Asia/Kolkata'")
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+class PanchangaBatchRequest(BaseModel):
+    startDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
+    endDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$', description="Inclusive end date")
+    locations: List[PanchangaLocation] = Field(..., min_length=1)
+
+class PanchangaBatchResult(BaseModel):
+    location: PanchangaLocation
+    days: List[PanchangaDay]
+
+class PanchangaBatchResponse(BaseModel):
+    results: List[PanchangaBatchResult]
+
+class MuhurtaSearchRequest(BaseModel):
+    startDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$')
+    endDate: str = Field(..., pattern=r'^\d{4}-\d{2}-\d{2}$', description="Inclusive end date")
+    timezone: str = Field(..., description="Timezone string like 'Asia/Kolkata'")
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+    # Each constraint matches any of its values; all given constraints must hold
+    vara: Optional[List[str]] = None
+    tithi: Optional[List[Union[int, str]]] = Field(None, description="Tithi numbers (1-30) or names")
+    tithiGroup: Optional[List[str]] = None
+    nakshatra: Optional[List[Union[int, str]]] = Field(None, description="Nakshatra indexes (1-27) or IAST names")
+    yoga: Optional[List[str]] = None
+    karana: Optional[List[str]] = None
+    rules: Optional[List[str]] = Field(None, description="Special yoga names from yogas.rules.json")
+    limit: Optional[int] = Field(None, ge=1)
+
+class MuhurtaSearchResponse(BaseModel):
+    count: int
+    dates: List[str]
+
 # Diagnostic models
 class EndpointStatus(BaseModel):
     ok: bool
     status: Optional[int] = None
     error: Optional[str] = None
     latencyMs: Optional[float] = None
+    p50Ms: Optional[float] = None
+    p95Ms: Optional[float] = None
+    errorRate: Optional[float] = None
+    samples: Optional[int] = None
 
 class RemoteDiagnostic(BaseModel):
     baseUrl: str
@@ -321,6 +458,8 @@ class RemoteDiagnostic(BaseModel):
     latencyMs: Optional[float] = None
     error: Optional[str] = None
     endpoints: Dict[str, EndpointStatus]
+    checkedAt: Optional[str] = None
+    circuit: Optional[Dict[str, Any]] = None
 
 class BackendDiagnostic(BaseModel):
     ok: bool
@@ -427,6 +566,61 @@ SIGNS_SIDEREAL = [
     "Tulā", "Vṛścika", "Dhanu", "Makara", "Kumbha", "Mīna"
 ]
 
+VARAS = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+# Tithi names in order (Shukla then Krishna paksha)
+TITHI_NAMES = [
+    "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi",
+    "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi",
+    "Trayodashi", "Chaturdashi", "Purnima", "Pratipada", "Dwitiya", "Tritiya",
+    "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami",
+    "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"
+]
+
+YOGAS = [
+    "Viśkumbha", "Priti", "Āyuṣmān", "Saubhāgya", "Śobhana", "Atigaṇḍa",
+    "Sukarman", "Dhṛti", "Śūla", "Gaṇḍa", "Vṛddhi", "Dhruva",
+    "Vyāghāta", "Harṣaṇa", "Vajra", "Siddhi", "Vyatīpāta", "Variyan",
+    "Parigha", "Śiva", "Siddha", "Sādhya", "Śubha", "Śukla",
+    "Brahma", "Indra", "Vaidhṛti"
+]
+
+KARANAS = [
+    "Bava", "Bālava", "Kaulava", "Taitila", "Garija", "Vaṇija", "Viṣṭi",
+    "Śakuni", "Catuṣpāda", "Nāga"
+]
+
+# The 60 half-tithi karanas of a lunar month: Kiṃstughna, the seven movable
+# karanas repeated eight times, then the three fixed ones
+KARANA_SEQUENCE = ["Kiṃstughna"] + KARANAS[:7] * 8 + KARANAS[7:]
+
+# Display names per panchanga element index (0-based), see panchanga_engine.py
+ELEMENT_NAMES = {
+    "tithi": TITHI_NAMES,
+    "karana": KARANA_SEQUENCE,
+    "yoga": YOGAS,
+    "nakshatra": NAKSHATRAS_IAST,
+}
+
+# Longest range accepted by /positions/ingresses (days)
+MAX_INGRESS_RANGE_DAYS = 3660
+
+# Longest range accepted by /muhurta/search (days)
+MAX_MUHURTA_RANGE_DAYS = 366 * 20
+
+# Limits for /panchanga/batch
+MAX_BATCH_RANGE_DAYS = 366
+MAX_BATCH_LOCATIONS = int(os.getenv("PANCHANGA_BATCH_MAX_LOCATIONS", "500"))
+
+# Month responses are pure functions of the normalized request. Coordinates
+# are rounded for the key and the calculation alike, so a cached response is
+# exactly what the rounded request computes.
+RESPONSE_CACHE_COORD_PRECISION = int(os.getenv("RESPONSE_CACHE_COORD_PRECISION", "3"))
+month_response_cache = LRUCache(
+    int(os.getenv("RESPONSE_CACHE_SIZE", "2048")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "0")) or None
+)
+
 TITHI_GROUPS = {
     "Pratipada": "Nanda", "Dwitiya": "Nanda", "Tritiya": "Nanda",
     "Chaturthi": "Bhadra", "Panchami": "Bhadra", "Shashthi": "Bhadra",
@@ -436,38 +630,38 @@ TITHI_GROUPS = {
     "Amavasya": "Purna"
 }
 
+# Static datasets, parsed once and reloaded when the file changes
+yoga_rules_dataset = StaticDataset("data/yogas.rules.json", [])
+panchanga_recommendations_dataset = StaticDataset("data/panchanga.recommendations.es.json", {})
+navatara_dataset = StaticDataset("data/navatara.es.json", {})
+
 # Load yoga rules
 def load_yoga_rules():
-    try:
-        with open("data/yogas.rules.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
+    return yoga_rules_dataset.data
 
 # Load panchanga recommendations
 def load_panchanga_recommendations():
-    try:
-        with open("data/panchanga.recommendations.es.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+    return panchanga_recommendations_dataset.data
 
 # Load navatara data
 def load_navatara_data():
-    try:
-        with open("data/navatara.es.json", "r") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
+    return navatara_dataset.data
 
 def julian_day(date_str: str, time_str: str = "12:00") -> float:
     """Convert date and time to Julian Day Number"""
-    dt = parser.parse(f"{date_str} {time_str}")
-    return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0)
+    try:
+        # Fast path for the common "YYYY-MM-DD" + "HH:MM" case
+        d = date.fromisoformat(date_str)
+        hour, minute = time_str.split(":")
+        return swe.julday(d.year, d.month, d.day, int(hour) + int(minute) / 60.0)
+    except ValueError:
+        dt = parser.parse(f"{date_str} {time_str}")
+        return swe.julday(dt.year, dt.month, dt.day, dt.hour + dt.minute / 60.0)
 
 def get_planet_position(planet_id: int, jd: float) -> dict:
     """Get planetary position"""
     result = swe.calc_ut(jd, planet_id)
+    CALC_UT_CALLS.inc()
     longitude = result[0][0]
     latitude = result[0][1]
     speed = result[0][3]
@@ -484,10 +678,13 @@ def get_planet_position(planet_id: int, jd: float) -> dict:
         "house": house
     }
 
-def get_nakshatra(longitude: float) -> dict:
-    """Get nakshatra from longitude using True Citra Paksha (Lahiri) ayanamsa"""
+def get_nakshatra(longitude: float, jd: Optional[float] = None) -> dict:
+    """Get nakshatra from longitude using True Citra Paksha (Lahiri) ayanamsa
+    
+    The ayanamsa is taken at `jd` (defaults to the J2000 epoch).
+    """
     # Apply Lahiri ayanamsa correction
-    ayanamsa = swe.get_ayanamsa_ut(julian_day("2000-01-01"))
+    ayanamsa = get_ayanamsa_provider().at(J2000_JD if jd is None else jd)
     corrected_longitude = (longitude - ayanamsa) % 360
     
     nakshatra_num = int(corrected_longitude * 27 / 360)
@@ -503,9 +700,9 @@ def get_nakshatra(longitude: float) -> dict:
         "pada": pada
     }
 
-def get_sidereal_sign(longitude: float) -> str:
-    """Get sidereal sign from longitude"""
-    ayanamsa = swe.get_ayanamsa_ut(julian_day("2000-01-01"))
+def get_sidereal_sign(longitude: float, jd: Optional[float] = None) -> str:
+    """Get sidereal sign from longitude (ayanamsa taken at `jd`, default J2000)"""
+    ayanamsa = get_ayanamsa_provider().at(J2000_JD if jd is None else jd)
     corrected_longitude = (longitude - ayanamsa) % 360
     sign_num = int(corrected_longitude / 30)
     return SIGNS_SIDEREAL[sign_num]
@@ -520,16 +717,7 @@ def get_tithi(sun_long: float, moon_long: float) -> dict:
     # Ensure tithi_num is within valid range (0-29)
     tithi_num = tithi_num % 30
     
-    # Get tithi names in order
-    tithi_names = [
-        "Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi",
-        "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi",
-        "Trayodashi", "Chaturdashi", "Purnima", "Pratipada", "Dwitiya", "Tritiya",
-        "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami",
-        "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Amavasya"
-    ]
-    
-    tithi_name = tithi_names[tithi_num]
+    tithi_name = TITHI_NAMES[tithi_num]
     
     return {
         "code": tithi_name,
@@ -540,52 +728,41 @@ def get_yoga(sun_long: float, moon_long: float) -> str:
     """Get yoga from Sun and Moon longitudes"""
     total = (sun_long + moon_long) % 360
     yoga_num = int(total * 27 / 360)
-    yogas = [
-        "Viśkumbha", "Priti", "Āyuṣmān", "Saubhāgya", "Śobhana", "Atigaṇḍa",
-        "Sukarman", "Dhṛti", "Śūla", "Gaṇḍa", "Vṛddhi", "Dhruva",
-        "Vyāghāta", "Harṣaṇa", "Vajra", "Siddhi", "Vyatīpāta", "Variyan",
-        "Parigha", "Śiva", "Siddha", "Sādhya", "Śubha", "Śukla",
-        "Brahma", "Indra", "Vaidhṛti"
-    ]
-    return yogas[yoga_num]
+    return YOGAS[yoga_num]
 
 def get_karana(tithi_num: int) -> str:
     """Get karana from tithi number"""
-    karanas = [
-        "Bava", "Bālava", "Kaulava", "Taitila", "Garija", "Vaṇija", "Viṣṭi",
-        "Śakuni", "Catuṣpāda", "Nāga"
-    ]
-    
     if tithi_num <= 7:
-        return karanas[tithi_num - 1]
+        return KARANAS[tithi_num - 1]
     elif tithi_num <= 14:
-        return karanas[tithi_num - 8]
+        return KARANAS[tithi_num - 8]
     elif tithi_num <= 22:
-        return karanas[tithi_num - 15]
+        return KARANAS[tithi_num - 15]
     else:
-        return karanas[tithi_num - 23]
+        return KARANAS[tithi_num - 23]
+
+@lru_cache(maxsize=1024)
+def compile_yoga_rule(rule: str):
+    """Compiled predicate of a yoga rule, or None if it does not parse"""
+    try:
+        return compile_expression(rule)[0]
+    except RuleSyntaxError:
+        return None
 
 def evaluate_yoga_rule(rule: str, context: dict) -> bool:
-    """Safely evaluate yoga rule DSL"""
-    # Simple rule parser - replace with proper DSL interpreter
+    """Evaluate yoga rule DSL (compiled once per rule text)"""
+    predicate = compile_yoga_rule(rule)
+    if predicate is None:
+        return False
     try:
-        # Create a safe environment for evaluation
-        safe_dict = {
-            "vara": context.get("vara", ""),
-            "tithiGroup": context.get("tithiGroup", ""),
-            "nakshatraIndex": context.get("nakshatraIndex", 0)
-        }
-        
-        # Normalize quotes and operators in the rule
-        rule = rule.replace("'", '"')
-        rule = rule.replace("&&", "and")
-        rule = rule.replace("||", "or")
-        
-        # Safe evaluation with limited operations
-        return eval(rule, {"__builtins__": {}}, safe_dict)
-    except:
+        return bool(predicate(with_defaults(context)))
+    except TypeError:
         return False
 
+def get_compiled_yoga_rules() -> CompiledRuleSet:
+    """Compiled yoga rules, rebuilt only when the dataset reloads"""
+    return yoga_rules_dataset.derived(CompiledRuleSet)
+
 def get_month_dates(year: int, month: int) -> List[str]:
     """Get all dates in a month"""
     start_date = date(year, month, 1)
@@ -602,72 +779,581 @@ def get_month_dates(year: int, month: int) -> List[str]:
     
     return dates
 
-def call_remote_api(endpoint: str, params: dict) -> dict:
-    """Call remote API if configured"""
-    remote_url = os.getenv("REMOTE_API_BASE_URL")
-    if not remote_url:
-        return None
+def normalize_month_request(request: BaseModel) -> BaseModel:
+    """Copy of a month request with rounded coordinates and a trimmed timezone"""
+    return request.model_copy(update={
+        "timezone": request.timezone.strip(),
+        "latitude": round(request.latitude, RESPONSE_CACHE_COORD_PRECISION),
+        "longitude": round(request.longitude, RESPONSE_CACHE_COORD_PRECISION)
+    })
+
+def month_cache_key(endpoint: str, request: BaseModel) -> tuple:
+    """Response cache key for a normalized month request
     
-    try:
-        response = requests.get(f"{remote_url}{endpoint}", params=params)
-        if response.status_code == 200:
-            return response.json()
-    except:
-        pass
-    return None
-
-def transform_remote_positions(data: dict) -> PositionsMonthResponse:
-    """Transform remote positions response to our contract"""
-    planets_data = {}
+    Local positions do not depend on the location, so only the month is keyed.
+    Panchanga keys carry the yoga rules' content hash, so editing the rules
+    file misses every cached, indexed and stored month computed before.
+    """
+    if endpoint == "positions":
+        return (endpoint, request.year, request.month)
+    return (endpoint, request.year, request.month, request.timezone, request.latitude, request.longitude,
+            yoga_rules_dataset.snapshot().etag)
+
+def get_month_last_date(year: int, month: int) -> date:
+    """Last civil date of a month"""
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+def get_date_range(start_date: str, end_date: str) -> List[str]:
+    """All dates from start_date to end_date inclusive"""
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+def build_positions_month_response(dates: List[str], batch: Dict[str, np.ndarray], ingresses: List[dict]) -> PositionsMonthResponse:
+    """Build the month response from batch engine arrays in a single validation pass"""
+    nakshatra_index = batch["nakshatra_index"]
+    pada = batch["pada"].tolist()
+    sign_index = batch["sign_index"].tolist()
+    speed = batch["speed"].tolist()
+    
+    planets = []
     transitions = []
+    for row, planet_name in enumerate(PLANETS.keys()):
+        naks = nakshatra_index[row].tolist()
+        days = [
+            {
+                "date": date_str,
+                "nakshatra": {
+                    "index": naks[col],
+                    "nameIAST": NAKSHATRAS_IAST[naks[col] - 1],
+                    "pada": pada[row][col]
+                },
+                "signSidereal": SIGNS_SIDEREAL[sign_index[row][col]],
+                "retrograde": speed[row][col] < 0,
+                "speed": abs(speed[row][col])
+            }
+            for col, date_str in enumerate(dates)
+        ]
+        planets.append({"name": planet_name, "days": days})
+    
+    for event in ingresses:
+        at_iso = jd_to_iso(event["jd"])
+        transitions.append({
+            "planet": event["planet"],
+            "date": at_iso[:10],
+            "from": event["from"],
+            "to": event["to"],
+            "atISO": at_iso
+        })
+    
+    return PositionsMonthResponse.model_validate({
+        "range": {"startISO": f"{dates[0]}T00:00:00Z", "endISO": f"{dates[-1]}T23:59:59Z"},
+        "planets": planets,
+        "transitions": transitions
+    })
+
+def get_vara(date_str: str) -> str:
+    """Weekday name of a civil date"""
+    return VARAS[date.fromisoformat(date_str).isoweekday() % 7]
+
+def get_civil_day_starts(dates: List[str], tz_name: str) -> List[float]:
+    """Julian days (UT) of local midnight for each date plus the day after the last"""
+    following = (date.fromisoformat(dates[-1]) + timedelta(days=1)).isoformat()
+    return [local_midnight_jd(tz_name, date_str) for date_str in dates + [following]]
+
+def detect_special_yogas(yoga_rules: CompiledRuleSet, context: dict) -> List[dict]:
+    """Special yogas whose rule holds for a day context (a table lookup)"""
+    return yoga_rules.detect(context)
+
+def evaluate_panchanga_days(dates: List[str], day_starts: List[float], latitude: float,
+                            longitude: float, grid: SunMoonGrid) -> List[dict]:
+    """Panchanga elements of each civil day at local sunrise (local noon without one)
+    
+    Returns per day the evaluation instant, sunrise/sunset Julian days, tithi
+    (plus its 1-30 number), nakshatra, yoga, karana and vara.
+    """
+    sun_times = get_sun_times_for_dates(dates, latitude, longitude)
+    eval_jds = np.array([
+        sunrise_jd if sunrise_jd is not None else day_starts[day] + 0.5
+        for day, (sunrise_jd, _) in enumerate(sun_times)
+    ])
+    sun_longs, moon_longs = grid.longitudes_at(eval_jds)
+    ayanamsas = get_ayanamsa_provider().at_many(eval_jds)
+    
+    days = []
+    for day, date_str in enumerate(dates):
+        jd = float(eval_jds[day])
+        sun_long = float(sun_longs[day])
+        moon_long = float(moon_longs[day])
+        ayanamsa = float(ayanamsas[day])
+        elongation = (moon_long - sun_long) % 360
+        
+        # Calculate Panchanga elements
+        days.append({
+            "jd": jd,
+            "sunTimes": sun_times[day],
+            "tithi": get_tithi(sun_long, moon_long),
+            "tithiNumber": int(elongation * 30 / 360) % 30 + 1,
+            "nakshatra": get_nakshatra(moon_long, jd),
+            "yoga": get_yoga(sun_long - ayanamsa, moon_long - ayanamsa),
+            "karana": KARANA_SEQUENCE[int(elongation // KARANA_SPAN)],
+            "vara": get_vara(date_str)
+        })
+    return days
+
+def build_panchanga_days(dates: List[str], day_starts: List[float], tz_name: str,
+                         latitude: float, longitude: float, grid: SunMoonGrid,
+                         yoga_rules: CompiledRuleSet, memo: Optional[dict] = None) -> List[dict]:
+    """Panchanga for each civil day, evaluated at local sunrise
+    
+    `day_starts` are the local midnights from get_civil_day_starts and `grid`
+    must cover them. Days without a sunrise (polar day/night) are evaluated
+    at local noon. Times are reported in the requested timezone.
+    
+    Intervals depend only on the timezone and date; pass the same `memo`
+    dict across calls sharing a grid to reuse them between locations.
+    """
+    memo = {} if memo is None else memo
+    elements = evaluate_panchanga_days(dates, day_starts, latitude, longitude, grid)
+    
+    days = []
+    for day, date_str in enumerate(dates):
+        tithi = elements[day]["tithi"]
+        nakshatra = elements[day]["nakshatra"]
+        vara = elements[day]["vara"]
+        sunrise_jd, sunset_jd = elements[day]["sunTimes"]
+        context = {
+            "vara": vara,
+            "tithiGroup": tithi["group"],
+            "nakshatraIndex": nakshatra["index"]
+        }
+        intervals_key = ("intervals", tz_name, date_str)
+        if intervals_key not in memo:
+            memo[intervals_key] = build_panchanga_intervals(grid, day_starts[day], day_starts[day + 1], tz_name)
+        
+        days.append({
+            "date": date_str,
+            "sunriseISO": jd_to_local_iso(sunrise_jd, tz_name) if sunrise_jd is not None else None,
+            "sunsetISO": jd_to_local_iso(sunset_jd, tz_name) if sunset_jd is not None else None,
+            "tithi": tithi,
+            "vara": vara,
+            "nakshatra": nakshatra,
+            "yoga": elements[day]["yoga"],
+            "karana": elements[day]["karana"],
+            "specialYogas": detect_special_yogas(yoga_rules, context),
+            "intervals": memo[intervals_key]
+        })
+    
+    return days
+
+def build_panchanga_intervals(grid: SunMoonGrid, start_jd: float, end_jd: float, tz_name: str) -> dict:
+    """Tithi, karana, yoga and Moon nakshatra spans overlapping [start_jd, end_jd)"""
+    return {
+        element: [
+            {
+                "index": span["index"] + 1,
+                "name": ELEMENT_NAMES[element][span["index"]],
+                "startISO": jd_to_local_iso(span["start"], tz_name),
+                "endISO": jd_to_local_iso(span["end"], tz_name)
+            }
+            for span in grid.spans_between(element, start_jd, end_jd)
+        ]
+        for element in ELEMENTS
+    }
+
+# Calculation entry points. These run in the compute executor, so they are
+# module-level (picklable for the process pool) and take plain arguments.
+
+def compute_positions_month(request: PositionsMonthRequest) -> PositionsMonthResponse:
+    """Local planetary positions for a month"""
+    dates = get_month_dates(request.year, request.month)
+    batch = compute_positions_batch(julian_days(dates), PLANETS)
+    ingresses = find_ingresses(
+        julian_day(dates[0], "00:00"),
+        julian_day(dates[0], "00:00") + len(dates),
+        PLANETS,
+        kinds=["nakshatra"]
+    )
+    return build_positions_month_response(dates, batch, ingresses)
+
+def compute_positions_ingresses(request: IngressRequest) -> IngressResponse:
+    """Exact ingress events for a date range"""
+    start_jd = julian_day(request.startDate, "00:00")
+    end_jd = julian_day(request.endDate, "00:00") + 1
+    if end_jd <= start_jd:
+        raise ValueError("endDate must not be before startDate")
+    if end_jd - start_jd > MAX_INGRESS_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_INGRESS_RANGE_DAYS} days")
+
+    planet_names = request.planets or list(PLANETS.keys())
+    unknown = [name for name in planet_names if name not in PLANETS]
+    if unknown:
+        raise ValueError(f"Unknown planets: {', '.join(unknown)}")
+
+    events = find_ingresses(
+        start_jd, end_jd,
+        {name: PLANETS[name] for name in planet_names},
+        kinds=request.kinds or INGRESS_KINDS
+    )
+
+    return IngressResponse.model_validate({
+        "range": {"startISO": jd_to_iso(start_jd), "endISO": jd_to_iso(end_jd)},
+        "events": [
+            {
+                "planet": event["planet"],
+                "kind": event["kind"],
+                "atISO": jd_to_iso(event["jd"]),
+                "from": event["from"],
+                "to": event["to"],
+                "nakshatra": event.get("nakshatra")
+            }
+            for event in events
+        ]
+    })
+
+def compute_panchanga_month(request: PanchangaMonthRequest) -> PanchangaMonthResponse:
+    """Local Panchanga for a month"""
+    dates = get_month_dates(request.year, request.month)
+    day_starts = get_civil_day_starts(dates, request.timezone)
+    
+    # One shared Sun/Moon grid serves the whole month
+    grid = SunMoonGrid(day_starts[0], day_starts[-1])
+    days = build_panchanga_days(
+        dates, day_starts, request.timezone, request.latitude, request.longitude,
+        grid, get_compiled_yoga_rules()
+    )
+    return PanchangaMonthResponse.model_validate({"days": days})
+
+def compute_panchanga_batch(request: PanchangaBatchRequest) -> PanchangaBatchResponse:
+    """Panchanga for many locations over one date range
+    
+    Tithi, karana, yoga and nakshatra depend only on the instant, so a single
+    Sun/Moon grid spanning every location's civil days serves all of them;
+    only sunrise and the local day boundaries are computed per location.
+    """
+    dates = get_date_range(request.startDate, request.endDate)
+    if not dates:
+        raise ValueError("endDate must not be before startDate")
+    if len(dates) > MAX_BATCH_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_BATCH_RANGE_DAYS} days")
+    if len(request.locations) > MAX_BATCH_LOCATIONS:
+        raise ValueError(f"Batch is limited to {MAX_BATCH_LOCATIONS} locations")
+    
+    # Local midnights depend only on the timezone
+    day_starts = {}
+    for location in request.locations:
+        if location.timezone not in day_starts:
+            day_starts[location.timezone] = get_civil_day_starts(dates, location.timezone)
+    
+    grid = SunMoonGrid(
+        min(starts[0] for starts in day_starts.values()),
+        max(starts[-1] for starts in day_starts.values())
+    )
+    yoga_rules = get_compiled_yoga_rules()
+    memo = {}
+    results = [
+        {
+            "location": location.model_dump(),
+            "days": build_panchanga_days(
+                dates, day_starts[location.timezone], location.timezone,
+                location.latitude, location.longitude, grid, yoga_rules, memo
+            )
+        }
+        for location in request.locations
+    ]
+    return PanchangaBatchResponse.model_validate({"results": results})
+
+def build_day_timeline(year: int, tz_name: str, latitude: float, longitude: float) -> DayTimeline:
+    """Per-day panchanga attributes of a calendar year, indexed for search"""
+    dates = get_date_range(f"{year}-01-01", f"{year}-12-31")
+    day_starts = get_civil_day_starts(dates, tz_name)
+    grid = SunMoonGrid(day_starts[0], day_starts[-1])
+    days = evaluate_panchanga_days(dates, day_starts, latitude, longitude, grid)
+    yoga_rules = get_compiled_yoga_rules()
+    return DayTimeline(dates, {
+        "vara": [day["vara"] for day in days],
+        "tithi": [day["tithiNumber"] for day in days],
+        "tithiGroup": [day["tithi"]["group"] for day in days],
+        "nakshatra": [day["nakshatra"]["index"] for day in days],
+        "yoga": [day["yoga"] for day in days],
+        "karana": [day["karana"] for day in days],
+        "rules": [
+            tuple(match["name"] for match in yoga_rules.detect({
+                "vara": day["vara"],
+                "tithiGroup": day["tithi"]["group"],
+                "nakshatraIndex": day["nakshatra"]["index"]
+            }))
+            for day in days
+        ]
+    })
+
+def get_day_timeline(year: int, tz_name: str, latitude: float, longitude: float) -> DayTimeline:
+    """Cached ``build_day_timeline`` (coordinates rounded like month requests)
     
-    for planet_name, planet_data in data.items():
+    Keyed by the yoga rules' content hash too, since the "rules" lists are
+    fixed when the timeline is built.
+    """
+    latitude = round(latitude, RESPONSE_CACHE_COORD_PRECISION)
+    longitude = round(longitude, RESPONSE_CACHE_COORD_PRECISION)
+    key = (year, tz_name, latitude, longitude, yoga_rules_dataset.snapshot().etag)
+    timeline = timeline_cache.get(key)
+    if timeline is None:
+        timeline = build_day_timeline(year, tz_name, latitude, longitude)
+        timeline_cache.set(key, timeline)
+    return timeline
+
+def muhurta_constraints(request: MuhurtaSearchRequest) -> Dict[str, set]:
+    """Search constraints with names resolved to the indexed values"""
+    def check(values, allowed, label):
+        unknown = [value for value in values if value not in allowed]
+        if unknown:
+            raise ValueError(f"Unknown {label}: {', '.join(map(str, unknown))}")
+        return set(values)
+    
+    def numbered(values, names, label):
+        numbers = set()
+        for value in values:
+            if isinstance(value, int):
+                if not 1 <= value <= len(names):
+                    raise ValueError(f"{label} must be between 1 and {len(names)}")
+                numbers.add(value)
+            elif value in names:
+                numbers.update(i + 1 for i, name in enumerate(names) if name == value)
+            else:
+                raise ValueError(f"Unknown {label}: {value}")
+        return numbers
+    
+    constraints = {}
+    if request.vara is not None:
+        constraints["vara"] = check(request.vara, VARAS, "vara")
+    if request.tithi is not None:
+        constraints["tithi"] = numbered(request.tithi, TITHI_NAMES, "tithi")
+    if request.tithiGroup is not None:
+        constraints["tithiGroup"] = check(request.tithiGroup, set(TITHI_GROUPS.values()), "tithiGroup")
+    if request.nakshatra is not None:
+        constraints["nakshatra"] = numbered(request.nakshatra, NAKSHATRAS_IAST, "nakshatra")
+    if request.yoga is not None:
+        constraints["yoga"] = check(request.yoga, YOGAS, "yoga")
+    if request.karana is not None:
+        constraints["karana"] = check(request.karana, KARANA_SEQUENCE, "karana")
+    if request.rules is not None:
+        constraints["rules"] = check(request.rules, {rule.name for rule in get_compiled_yoga_rules().rules}, "rules")
+    return constraints
+
+def compute_muhurta_search(request: MuhurtaSearchRequest) -> MuhurtaSearchResponse:
+    """Dates in a range whose sunrise panchanga satisfies the constraints"""
+    start, end = date.fromisoformat(request.startDate), date.fromisoformat(request.endDate)
+    if end < start:
+        raise ValueError("endDate must not be before startDate")
+    if (end - start).days + 1 > MAX_MUHURTA_RANGE_DAYS:
+        raise ValueError(f"Range is limited to {MAX_MUHURTA_RANGE_DAYS} days")
+    constraints = muhurta_constraints(request)
+    
+    # Years are built (or fetched from the cache) only as the search reaches them
+    timelines = (
+        get_day_timeline(year, request.timezone, request.latitude, request.longitude)
+        for year in range(start.year, end.year + 1)
+    )
+    dates = search_timelines(timelines, constraints, request.startDate, request.endDate, request.limit)
+    return MuhurtaSearchResponse(count=len(dates), dates=dates)
+
+def compute_navatara(request: NavataraRequest, frame: str, scheme: int) -> NavataraResponse:
+    """Local Navatara mapping"""
+    # Calculate start nakshatra
+    if request.startNakshatraIndex:
+        start_index = request.startNakshatraIndex
+        start_name = NAKSHATRAS_IAST[start_index - 1]
+    elif request.startNakshatraName:
+        start_name = request.startNakshatraName
+        start_index = NAKSHATRAS_IAST.index(start_name) + 1
+    else:
+        # Default to current moon nakshatra
+        if request.datetime and request.latitude and request.longitude:
+            jd = julian_day(request.datetime)
+            moon_pos = get_planet_position(swe.MOON, jd)
+            nakshatra = get_nakshatra(moon_pos["longitude"], jd)
+            start_index = nakshatra["index"]
+            start_name = nakshatra["nameIAST"]
+        else:
+            start_index = 1
+            start_name = NAKSHATRAS_IAST[0]
+
+    # Generate mapping
+    lokas = ["Bhu", "Bhuva", "Swarga"]
+    groups9 = ["Deva", "Manushya", "Rakshasa"]
+    mapping = []
+
+    for i in range(27):
+        rel_position = i + 1
+        cycle = ((i + start_index - 1) // 9) % 3 + 1
+        loka = lokas[i % 3]
+        group9 = groups9[i % 3]
+        group_deity = "Vishnu" if group9 == "Deva" else "Brahma" if group9 == "Manushya" else "Shiva"
+
+        absolute_index = ((start_index - 1 + i) % 27) + 1
+        absolute_name = NAKSHATRAS_IAST[absolute_index - 1]
+
+        special_taras = []
+        if absolute_index == 8:  # Pushya
+            special_taras.append("Abhijit")
+
+        role_label = f"Tara {rel_position}"
+        role_summary = f"Position {rel_position} in {loka} loka"
+
+        mapping.append(NavataraMapping(
+            relPosition=rel_position,
+            cycle=cycle,
+            loka=loka,
+            group9=group9,
+            groupDeity=group_deity,
+            absolute=NakshatraInfo(
+                index=absolute_index,
+                nameIAST=absolute_name,
+                pada=1
+            ),
+            specialTaras=special_taras,
+            roleLabel=role_label,
+            roleSummary=role_summary
+        ))
+
+    response_data = {
+        "frame": frame,
+        "scheme": scheme,
+        "start": {
+            "index": start_index,
+            "nameIAST": start_name,
+            "planetLord": "Moon"
+        },
+        "lokas": lokas,
+        "groups9": groups9,
+        "mapping": mapping
+    }
+
+    if request.includeMetadata:
+        response_data["metadata"] = {
+            "nakshatras": NAKSHATRAS_IAST,
+            "roleLabels": [f"Tara {i+1}" for i in range(27)],
+            "groupDeities": {
+                "Deva": "Vishnu",
+                "Manushya": "Brahma", 
+                "Rakshasa": "Shiva"
+            },
+            "specialTarasLegend": {
+                "Abhijit": "Special Tara for auspicious activities"
+            }
+        }
+
+    return NavataraResponse(**response_data)
+
+def compute_positions(date: str) -> List[PositionResponse]:
+    """Legacy planetary positions for a date"""
+    jd = julian_day(date)
+    positions = []
+
+    for planet_name, planet_id in PLANETS.items():
         if planet_name == "Ketu":
             # Ketu is opposite to Rahu
-            rahu_pos = get_planet_position(PLANETS[planet_name], julian_day("2000-01-01")) # Use a fixed date for Rahu
+            rahu_pos = get_planet_position(planet_id, jd)
             ketu_long = (rahu_pos["longitude"] + 180) % 360
-            nakshatra = get_nakshatra(ketu_long)
-            sign = get_sidereal_sign(ketu_long)
-            
-            planet_day = PlanetDay(
-                date="2000-01-01", # Placeholder date, will be replaced by actual date
-                nakshatra=NakshatraInfo(**nakshatra),
-                signSidereal=sign,
-                retrograde=rahu_pos["speed"] < 0,
-                speed=abs(rahu_pos["speed"])
-            )
+            positions.append(PositionResponse(
+                planet=planet_name,
+                longitude=ketu_long,
+                latitude=-rahu_pos["latitude"],
+                speed=rahu_pos["speed"],
+                house=int(ketu_long / 30) + 1
+            ))
         else:
-            pos = get_planet_position(PLANETS[planet_name], julian_day("2000-01-01")) # Use a fixed date for other planets
-            nakshatra = get_nakshatra(pos["longitude"])
-            sign = get_sidereal_sign(pos["longitude"])
-            
-            planet_day = PlanetDay(
-                date="2000-01-01", # Placeholder date, will be replaced by actual date
-                nakshatra=NakshatraInfo(**nakshatra),
-                signSidereal=sign,
-                retrograde=pos["speed"] < 0,
-                speed=abs(pos["speed"])
-            )
-        
-        planets_data[planet_name] = {"name": planet_name, "days": [planet_day]}
-    
-    # Detect transitions (simplified)
-    for planet_name, planet_data in planets_data.items():
-        for i in range(1, len(planet_data["days"])):
-            prev_nak = planet_data["days"][i-1].nakshatra.index
-            curr_nak = planet_data["days"][i].nakshatra.index
-            if prev_nak != curr_nak:
-                transitions.append(Transition(
-                    planet=planet_name,
-                    date="2000-01-01", # Placeholder date, will be replaced by actual date
-                    from_nak=prev_nak,
-                    to_nak=curr_nak
-                ))
-    
-    return PositionsMonthResponse(
-        range={"startISO": "2000-01-01T00:00:00Z", "endISO": "2000-01-31T23:59:59Z"}, # Placeholder range
-        planets=list(planets_data.values()),
-        transitions=transitions
+            pos = get_planet_position(planet_id, jd)
+            positions.append(PositionResponse(
+                planet=planet_name,
+                longitude=pos["longitude"],
+                latitude=pos["latitude"],
+                speed=pos["speed"],
+                house=pos["house"]
+            ))
+
+    return positions
+
+def compute_panchanga(date: str) -> PanchangaResponse:
+    """Legacy Panchanga for a date"""
+    jd = julian_day(date)
+
+    # Get Sun and Moon positions
+    sun_pos = get_planet_position(swe.SUN, jd)
+    moon_pos = get_planet_position(swe.MOON, jd)
+
+    # Calculate Panchanga elements
+    tithi = get_tithi(sun_pos["longitude"], moon_pos["longitude"])
+    nakshatra = get_nakshatra(moon_pos["longitude"], jd)
+    # Sidereal longitudes, as in evaluate_panchanga_days
+    ayanamsa = get_ayanamsa_provider().at(jd)
+    yoga = get_yoga(sun_pos["longitude"] - ayanamsa, moon_pos["longitude"] - ayanamsa)
+    karana = get_karana(list(TITHI_GROUPS.keys()).index(tithi["code"]) + 1)
+
+    # Get vara (day of week)
+    vara = get_vara(parser.parse(date).date().isoformat())
+
+    # Convert to legacy format
+    tithi_legacy = {
+        "name": tithi["code"],
+        "number": list(TITHI_GROUPS.keys()).index(tithi["code"]) + 1,
+        "paksha": "Shukla" if tithi["code"] in ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima"] else "Krishna"
+    }
+
+    nakshatra_legacy = {
+        "name": nakshatra["nameIAST"],
+        "number": nakshatra["index"]
+    }
+
+    return PanchangaResponse(
+        date=date,
+        tithi=TithiInfoLegacy(**tithi_legacy),
+        vara=vara,
+        nakshatra=NakshatraInfoLegacy(**nakshatra_legacy),
+        yoga=yoga,
+        karana=karana
+    )
+
+def compute_navatara_legacy(date: str, birth_nakshatra: str) -> NavataraResponseLegacy:
+    """Legacy Navatara for a date and birth nakshatra"""
+    jd = julian_day(date)
+    moon_pos = get_planet_position(swe.MOON, jd)
+    current_nakshatra = get_nakshatra(moon_pos["longitude"], jd)
+
+    # Calculate navatara number
+    birth_idx = NAKSHATRAS_IAST.index(birth_nakshatra)
+    current_idx = current_nakshatra["index"] - 1
+    diff = current_idx - birth_idx
+    if diff < 0:
+        diff += 27
+    navatara_num = (diff % 9) + 1
+
+    # Determine if auspicious
+    auspicious_navataras = [1, 3, 5, 7, 9]
+    is_auspicious = navatara_num in auspicious_navataras
+
+    # Generate recommendations
+    recommendations = []
+    if is_auspicious:
+        recommendations.extend([
+            "Good time for starting new ventures",
+            "Auspicious for ceremonies and rituals",
+            "Favorable for important decisions"
+        ])
+    else:
+        recommendations.extend([
+            "Consider postponing important activities",
+            "Focus on spiritual practices",
+            "Avoid starting new projects"
+        ])
+
+    return NavataraResponseLegacy(
+        date=date,
+        birth_nakshatra=birth_nakshatra,
+        current_nakshatra=current_nakshatra["nameIAST"],
+        navatara_period=f"Navatara {navatara_num}",
+        navatara_number=navatara_num,
+        is_auspicious=is_auspicious,
+        recommendations=recommendations
     )
 
 @app.get("/healthz", response_model=HealthResponse)
@@ -686,33 +1372,203 @@ async def ping_diagnostics():
         ephemeris=os.path.exists(os.getenv("EPHE_PATH", "/app/ephe"))
     )
     
-    # Check remote API status
-    remote_status = await diagnose_remote_api()
+    # Remote API status comes from the background probes; nothing waits on the network here
+    remote_status = diagnose_remote_api()
     
     return DiagnosticResponse(
         backend=backend_status,
         remote=remote_status
     )
 
+@app.get("/diagnostics/cache")
+async def cache_diagnostics():
+    """Size, hit/miss and eviction counters of the in-process caches"""
+    return {
+        "monthResponses": month_response_cache.stats(),
+        "sunTimes": sun_times_cache.stats(),
+        "timezoneOffsets": offset_tables_cache.stats(),
+        "etagIndex": etag_index.stats(),
+        "muhurtaTimelines": timeline_cache.stats(),
+        "coalescedComputations": compute_flights.stats(),
+        "coalescedRemoteCalls": remote_flights.stats(),
+        "remoteResponses": remote_response_cache.stats(),
+        "resultStore": await asyncio.to_thread(result_store.stats) if result_store is not None else None
+    }
+
+def cache_lookups() -> List[tuple]:
+    """(cache, hits, misses) of every cache, read when /metrics is scraped"""
+    lookups = [
+        (name, cache.hits, cache.misses)
+        for name, cache in (
+            ("monthResponses", month_response_cache),
+            ("sunTimes", sun_times_cache),
+            ("timezoneOffsets", offset_tables_cache),
+            ("etagIndex", etag_index),
+            ("muhurtaTimelines", timeline_cache),
+        )
+    ]
+    lookups.append(("remoteResponses", remote_response_cache.fresh_hits + remote_response_cache.stale_hits,
+                    remote_response_cache.misses))
+    if result_store is not None:
+        lookups.append(("resultStore", result_store.hits, result_store.misses))
+    return lookups
+
+registry.callback("jyotish_cache_hits_total", "Cache lookups answered from the cache", "counter",
+                  lambda: [((name,), hits) for name, hits, _ in cache_lookups()], ("cache",))
+registry.callback("jyotish_cache_misses_total", "Cache lookups that missed", "counter",
+                  lambda: [((name,), misses) for name, _, misses in cache_lookups()], ("cache",))
+registry.callback("jyotish_cache_hit_ratio", "Share of cache lookups that hit", "gauge",
+                  lambda: [((name,), round(hits / (hits + misses), 4) if hits + misses else None)
+                           for name, hits, misses in cache_lookups()], ("cache",))
+registry.callback("jyotish_executor_workers", "Compute executor pool size", "gauge",
+                  lambda: [((), compute_executor.workers)])
+registry.callback("jyotish_executor_in_flight", "Compute jobs submitted and not finished", "gauge",
+                  lambda: [((), compute_executor.in_flight)])
+registry.callback("jyotish_executor_queue_depth", "Compute jobs waiting for a free worker", "gauge",
+                  lambda: [((), compute_executor.queued)])
+
+@app.get("/diagnostics/profiles/{profile_id}")
+async def profile_summary(profile_id: str):
+    """Top functions of a profiled request (see X-Profile-Id)"""
+    summary = profiles.get(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+@app.get("/metrics")
+async def metrics():
+    """Process metrics in the Prometheus text exposition format"""
+    return Response(content=registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+def dataset_response(dataset: StaticDataset, if_none_match: Optional[str],
+                     accept_encoding: Optional[str]) -> Response:
+    """Pre-encoded dataset bytes, gzipped when the client accepts it"""
+    snapshot = dataset.snapshot()
+    gzipped = accepts_gzip(accept_encoding)
+    etag = snapshot.gzip_etag if gzipped else snapshot.etag
+    if etag_matches(if_none_match, snapshot.etag) or etag_matches(if_none_match, snapshot.gzip_etag):
+        return not_modified(etag, DEFAULT_CACHE_CONTROL)
+    headers = {"ETag": etag, "Cache-Control": DEFAULT_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
 @app.get("/data/yogas")
-async def get_yoga_rules():
+async def get_yoga_rules(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get yoga rules dataset"""
-    return load_yoga_rules()
+    return dataset_response(yoga_rules_dataset, if_none_match, accept_encoding)
 
 @app.get("/data/navatara.es")
-async def get_navatara_data():
+async def get_navatara_data(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get navatara dataset in Spanish"""
-    return load_navatara_data()
+    return dataset_response(navatara_dataset, if_none_match, accept_encoding)
 
 @app.get("/data/panchanga/recommendations")
-async def get_panchanga_recommendations():
+async def get_panchanga_recommendations(if_none_match: Optional[str] = Header(None), accept_encoding: Optional[str] = Header(None)):
     """Get panchanga recommendations dataset"""
-    return load_panchanga_recommendations()
+    return dataset_response(panchanga_recommendations_dataset, if_none_match, accept_encoding)
+
+def remote_response(cache_key: tuple, response: BaseModel, if_none_match: Optional[str]) -> Response:
+    """Response for a body from the remote API, its ETag indexed like local ones"""
+    encoded = encode_response(response)
+    etag_index.set(cache_key, encoded.etag)
+    if etag_matches(if_none_match, encoded.etag):
+        return not_modified(encoded.etag, DEFAULT_CACHE_CONTROL)
+    return json_response(encoded, DEFAULT_CACHE_CONTROL)
+
+async def local_month_response(endpoint: str, compute, request: BaseModel, cache_control: str,
+                               if_none_match: Optional[str] = None) -> Response:
+    """Locally calculated month response
+    
+    Looked up in the in-process cache, then the persistent result store,
+    and only calculated when neither has it.
+    """
+    cache_key = month_cache_key(endpoint, request)
+    
+    async def load() -> EncodedResponse:
+        # SQLite reads and commits run in a worker thread, off the event loop
+        encoded = await asyncio.to_thread(result_store.get, cache_key) if result_store is not None else None
+        if encoded is None:
+            encoded = encode_response(await compute_executor.run(compute, request))
+            if result_store is not None:
+                await asyncio.to_thread(result_store.put, cache_key, encoded)
+        month_response_cache.set(cache_key, encoded)
+        etag_index.set(cache_key, encoded.etag)
+        return encoded
+    
+    encoded = month_response_cache.get(cache_key)
+    if encoded is None:
+        # Concurrent misses for the same month wait for a single calculation
+        encoded = await compute_flights.do(cache_key, load)
+    # The ETag index may not have known this key yet (e.g. after a restart)
+    if etag_matches(if_none_match, encoded.etag):
+        return not_modified(encoded.etag, cache_control)
+    return json_response(encoded, cache_control)
+
+async def remote_panchanga_month(request: PanchangaMonthRequest, normalized: PanchangaMonthRequest) -> PanchangaMonthResponse:
+    """Month of remote daily panchangas, fetched concurrently
+    
+    Days the remote API fails on (or returns incomplete) are filled in from
+    the local calculation; if every day fails the HTTPException propagates.
+    """
+    dates = get_month_dates(request.year, request.month)
+    yoga_rules = get_compiled_yoga_rules()
+    semaphore = asyncio.Semaphore(REMOTE_FANOUT_CONCURRENCY)
+    
+    async def fetch_day(day: str) -> PanchangaDay:
+        remote_params = {
+            "date": day,
+            "latitude": request.latitude,
+            "longitude": request.longitude,
+            "reference_time": "sunrise"
+        }
+        async with semaphore:
+            remote_data = await call_remote_api("v1/panchanga/precise/daily", "GET", params=remote_params)
+        return transform_remote_panchanga_day(remote_data, day, request.timezone, yoga_rules)
+    
+    results = await asyncio.gather(*(fetch_day(day) for day in dates), return_exceptions=True)
+    failed = [day for day, result in zip(dates, results) if isinstance(result, BaseException)]
+    if len(failed) == len(dates):
+        error = results[0]
+        if isinstance(error, HTTPException):
+            raise error
+        raise HTTPException(status_code=502, detail=f"Error transforming remote data: {error}")
+    if failed:
+        print(f"Remote API failed for {len(failed)} of {len(dates)} days, filling them locally")
+        REMOTE_FALLBACKS.inc(len(failed), endpoint="v1/panchanga/precise/daily")
+        local = await compute_executor.run(compute_panchanga_month, normalized)
+        local_days = {day.date: day for day in local.days}
+        results = [local_days[day] if isinstance(result, BaseException) else result
+                   for day, result in zip(dates, results)]
+    return PanchangaMonthResponse(days=results)
+
+async def warm_up_month_cache(jobs: List[tuple]) -> None:
+    """Compute (endpoint, request fields) warm-up jobs into the month caches"""
+    endpoints = {
+        "positions": (PositionsMonthRequest, compute_positions_month),
+        "panchanga": (PanchangaMonthRequest, compute_panchanga_month)
+    }
+    
+    async def warm(endpoint: str, fields: dict) -> None:
+        model, compute = endpoints[endpoint]
+        request = normalize_month_request(model(**fields))
+        await local_month_response(endpoint, compute, request, DEFAULT_CACHE_CONTROL)
+    
+    # The compute executor bounds how many run at once
+    await asyncio.gather(*(warm(endpoint, fields) for endpoint, fields in jobs))
 
 @app.post("/positions/month", response_model=PositionsMonthResponse)
-async def get_positions_month(request: PositionsMonthRequest):
+async def get_positions_month(request: PositionsMonthRequest, if_none_match: Optional[str] = Header(None)):
     """Get planetary positions for an entire month"""
     try:
+        # Revalidation is answered from the ETag index, before any calculation
+        normalized = normalize_month_request(request)
+        cache_control = cache_control_until(get_month_last_date(request.year, request.month))
+        etag = etag_index.get(month_cache_key("positions", normalized))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, cache_control)
+        
         # Try remote API first if configured
         if REMOTE_API_BASE_URL:
             try:
@@ -721,176 +1577,82 @@ async def get_positions_month(request: PositionsMonthRequest):
                     "when_utc": f"{request.year}-{request.month:02d}-01T12:00:00Z",
                     "planets": "Sun,Moon,Mercury,Venus,Mars,Jupiter,Saturn,Rahu,Ketu"
                 }
-                remote_data = call_remote_api("v1/ephemeris/planets", "GET", params=remote_params)
+                remote_data = await call_remote_api("v1/ephemeris/planets", "GET", params=remote_params)
                 # Transform remote response to our contract
-                return transform_remote_positions(remote_data)
+                return remote_response(month_cache_key("positions", normalized), transform_remote_positions(remote_data), if_none_match)
             except HTTPException as e:
                 print(f"Remote API failed, falling back to local calculation: {e.detail}")
+                REMOTE_FALLBACKS.inc(endpoint="v1/ephemeris/planets")
                 # Fall back to local calculation
         
         # Local calculation
-        dates = get_month_dates(request.year, request.month)
-        planets_data = {}
-        transitions = []
-        
-        # Initialize planets
-        for planet_name in PLANETS.keys():
-            planets_data[planet_name] = {"name": planet_name, "days": []}
-        
-        # Calculate for each day
-        for date_str in dates:
-            jd = julian_day(date_str)
-            
-            for planet_name, planet_id in PLANETS.items():
-                if planet_name == "Ketu":
-                    # Ketu is opposite to Rahu
-                    rahu_pos = get_planet_position(planet_id, jd)
-                    ketu_long = (rahu_pos["longitude"] + 180) % 360
-                    nakshatra = get_nakshatra(ketu_long)
-                    sign = get_sidereal_sign(ketu_long)
-                    
-                    planet_day = PlanetDay(
-                        date=date_str,
-                        nakshatra=NakshatraInfo(**nakshatra),
-                        signSidereal=sign,
-                        retrograde=rahu_pos["speed"] < 0,
-                        speed=abs(rahu_pos["speed"])
-                    )
-                else:
-                    pos = get_planet_position(planet_id, jd)
-                    nakshatra = get_nakshatra(pos["longitude"])
-                    sign = get_sidereal_sign(pos["longitude"])
-                    
-                    planet_day = PlanetDay(
-                        date=date_str,
-                        nakshatra=NakshatraInfo(**nakshatra),
-                        signSidereal=sign,
-                        retrograde=pos["speed"] < 0,
-                        speed=abs(pos["speed"])
-                    )
-                
-                planets_data[planet_name]["days"].append(planet_day)
+        return await local_month_response("positions", compute_positions_month, normalized, cache_control, if_none_match)
         
-        # Detect transitions (simplified)
-        for planet_name, planet_data in planets_data.items():
-            for i in range(1, len(planet_data["days"])):
-                prev_nak = planet_data["days"][i-1].nakshatra.index
-                curr_nak = planet_data["days"][i].nakshatra.index
-                if prev_nak != curr_nak:
-                    transitions.append(Transition(
-                        planet=planet_name,
-                        date=planet_data["days"][i].date,
-                        from_nak=prev_nak,
-                        to_nak=curr_nak
-                    ))
-        
-        return PositionsMonthResponse(
-            range={"startISO": f"{dates[0]}T00:00:00Z", "endISO": f"{dates[-1]}T23:59:59Z"},
-            planets=list(planets_data.values()),
-            transitions=transitions
-        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/positions/ingresses", response_model=IngressResponse)
+async def get_positions_ingresses(request: IngressRequest):
+    """Get exact UTC nakshatra, pada and sign ingresses over a date range"""
+    try:
+        return await compute_executor.run(compute_positions_ingresses, request)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/panchanga/month", response_model=PanchangaMonthResponse)
-async def get_panchanga_month(request: PanchangaMonthRequest):
+async def get_panchanga_month(request: PanchangaMonthRequest, if_none_match: Optional[str] = Header(None)):
     """Get Panchanga for an entire month"""
     try:
+        # Revalidation is answered from the ETag index, before any calculation
+        normalized = normalize_month_request(request)
+        cache_control = cache_control_until(get_month_last_date(request.year, request.month))
+        etag = etag_index.get(month_cache_key("panchanga", normalized))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, cache_control)
+        
         # Try remote API first if configured
         if REMOTE_API_BASE_URL:
             try:
-                # Convert our request to the remote API format
-                remote_params = {
-                    "date": f"{request.year}-{request.month:02d}-01",
-                    "latitude": request.latitude,
-                    "longitude": request.longitude,
-                    "reference_time": "sunrise"
-                }
-                remote_data = call_remote_api("v1/panchanga/precise/daily", "GET", params=remote_params)
-                # Transform remote response to our contract
-                return transform_remote_panchanga(remote_data)
+                # Every day of the month is fetched concurrently and merged in date order
+                month = await remote_panchanga_month(request, normalized)
+                return remote_response(month_cache_key("panchanga", normalized), month, if_none_match)
             except HTTPException as e:
                 print(f"Remote API failed, falling back to local calculation: {e.detail}")
+                REMOTE_FALLBACKS.inc(len(get_month_dates(request.year, request.month)), endpoint="v1/panchanga/precise/daily")
                 # Fall back to local calculation
         
         # Local calculation
-        dates = get_month_dates(request.year, request.month)
-        days_data = []
-        yoga_rules = load_yoga_rules()
-        
-        for date_str in dates:
-            jd = julian_day(date_str)
-            
-            # Get Sun and Moon positions
-            sun_pos = get_planet_position(swe.SUN, jd)
-            moon_pos = get_planet_position(swe.MOON, jd)
-            
-            # Calculate Panchanga elements
-            tithi = get_tithi(sun_pos["longitude"], moon_pos["longitude"])
-            nakshatra = get_nakshatra(moon_pos["longitude"])
-            yoga = get_yoga(sun_pos["longitude"], moon_pos["longitude"])
-            karana = get_karana(list(TITHI_GROUPS.keys()).index(tithi["code"]) + 1)
-            
-            # Get vara (day of week)
-            dt = parser.parse(date_str)
-            vara = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"][dt.weekday()]
-            
-            # Calculate sunrise/sunset (simplified)
-            sunrise_iso = f"{date_str}T06:00:00Z"
-            sunset_iso = f"{date_str}T18:00:00Z"
-            
-            # Evaluate special yogas
-            special_yogas = []
-            context = {
-                "vara": vara,
-                "tithiGroup": tithi["group"],
-                "nakshatraIndex": nakshatra["index"]
-            }
-            
-            for rule in yoga_rules:
-                if evaluate_yoga_rule(rule["rule"], context):
-                    # Add variables that fulfilled the rule
-                    fulfilled_vars = {}
-                    if "vara" in rule["rule"] and context["vara"] in rule["rule"]:
-                        fulfilled_vars["vara"] = context["vara"]
-                    if "tithiGroup" in rule["rule"] and context["tithiGroup"] in rule["rule"]:
-                        fulfilled_vars["tithiGroup"] = context["tithiGroup"]
-                    if "nakshatraIndex" in rule["rule"] and str(context["nakshatraIndex"]) in rule["rule"]:
-                        fulfilled_vars["nakshatraIndex"] = context["nakshatraIndex"]
-                    
-                    yoga_data = {
-                        "name": rule["name"],
-                        "polarity": rule["polarity"],
-                        "rule": rule["rule"],
-                        "reason": rule["explain"],
-                        "fulfilled_variables": fulfilled_vars
-                    }
-                    special_yogas.append(SpecialYoga(**yoga_data))
-            
-            panchanga_day = PanchangaDay(
-                date=date_str,
-                sunriseISO=sunrise_iso,
-                sunsetISO=sunset_iso,
-                tithi=TithiInfo(**tithi),
-                vara=vara,
-                nakshatra=NakshatraInfo(**nakshatra),
-                yoga=yoga,
-                karana=karana,
-                specialYogas=special_yogas
-            )
-            
-            days_data.append(panchanga_day)
-        
-        return PanchangaMonthResponse(days=days_data)
+        return await local_month_response("panchanga", compute_panchanga_month, normalized, cache_control, if_none_match)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.post("/panchanga/batch", response_model=PanchangaBatchResponse)
+async def get_panchanga_batch(request: PanchangaBatchRequest):
+    """Get Panchanga for many locations over one date range"""
+    try:
+        return await compute_executor.run(compute_panchanga_batch, request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/muhurta/search", response_model=MuhurtaSearchResponse)
+async def search_muhurta(request: MuhurtaSearchRequest):
+    """Find dates whose panchanga matches vara, tithi, nakshatra, yoga, karana and rule constraints"""
+    try:
+        return await compute_executor.run(compute_muhurta_search, request)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/navatara/calculate", response_model=NavataraResponse)
-async def calculate_navatara(request: NavataraRequest):
+async def calculate_navatara(request: NavataraRequest, if_none_match: Optional[str] = Header(None)):
     """Calculate Navatara with advanced options"""
     try:
+        cache_key = ("navatara", encode_json(request))
+        etag = etag_index.get(cache_key)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, DEFAULT_CACHE_CONTROL)
+        
         # Set defaults
         frame = request.frame or "moon"
         scheme = request.scheme or 27
@@ -900,100 +1662,24 @@ async def calculate_navatara(request: NavataraRequest):
         if frame in ["moon", "sun", "lagna"] and request.datetime and REMOTE_API_BASE_URL:
             try:
                 # Try remote API first
-                remote_data = call_remote_api("navatara/calculate", "POST", request.model_dump())
-                return NavataraResponse(**remote_data)
+                remote_data = await call_remote_api("navatara/calculate", "POST", request.model_dump())
+                return remote_response(cache_key, NavataraResponse(**remote_data), if_none_match)
             except HTTPException:
                 # Fall back to local calculation
                 print(f"Remote API failed for navatara, using local calculation")
+                REMOTE_FALLBACKS.inc(endpoint="navatara/calculate")
             except Exception as e:
                 print(f"Error with remote API for navatara: {e}")
+                REMOTE_FALLBACKS.inc(endpoint="navatara/calculate")
                 # Continue with local calculation
         
-        # Calculate start nakshatra
-        if request.startNakshatraIndex:
-            start_index = request.startNakshatraIndex
-            start_name = NAKSHATRAS_IAST[start_index - 1]
-        elif request.startNakshatraName:
-            start_name = request.startNakshatraName
-            start_index = NAKSHATRAS_IAST.index(start_name) + 1
-        else:
-            # Default to current moon nakshatra
-            if request.datetime and request.latitude and request.longitude:
-                jd = julian_day(request.datetime)
-                moon_pos = get_planet_position(swe.MOON, jd)
-                nakshatra = get_nakshatra(moon_pos["longitude"])
-                start_index = nakshatra["index"]
-                start_name = nakshatra["nameIAST"]
-            else:
-                start_index = 1
-                start_name = NAKSHATRAS_IAST[0]
+        async def calculate() -> EncodedResponse:
+            encoded = encode_response(await compute_executor.run(compute_navatara, request, frame, scheme))
+            etag_index.set(cache_key, encoded.etag)
+            return encoded
         
-        # Generate mapping
-        lokas = ["Bhu", "Bhuva", "Swarga"]
-        groups9 = ["Deva", "Manushya", "Rakshasa"]
-        mapping = []
-        
-        for i in range(27):
-            rel_position = i + 1
-            cycle = ((i + start_index - 1) // 9) % 3 + 1
-            loka = lokas[i % 3]
-            group9 = groups9[i % 3]
-            group_deity = "Vishnu" if group9 == "Deva" else "Brahma" if group9 == "Manushya" else "Shiva"
-            
-            absolute_index = ((start_index - 1 + i) % 27) + 1
-            absolute_name = NAKSHATRAS_IAST[absolute_index - 1]
-            
-            special_taras = []
-            if absolute_index == 8:  # Pushya
-                special_taras.append("Abhijit")
-            
-            role_label = f"Tara {rel_position}"
-            role_summary = f"Position {rel_position} in {loka} loka"
-            
-            mapping.append(NavataraMapping(
-                relPosition=rel_position,
-                cycle=cycle,
-                loka=loka,
-                group9=group9,
-                groupDeity=group_deity,
-                absolute=NakshatraInfo(
-                    index=absolute_index,
-                    nameIAST=absolute_name,
-                    pada=1
-                ),
-                specialTaras=special_taras,
-                roleLabel=role_label,
-                roleSummary=role_summary
-            ))
-        
-        response_data = {
-            "frame": frame,
-            "scheme": scheme,
-            "start": {
-                "index": start_index,
-                "nameIAST": start_name,
-                "planetLord": "Moon"
-            },
-            "lokas": lokas,
-            "groups9": groups9,
-            "mapping": mapping
-        }
-        
-        if request.includeMetadata:
-            response_data["metadata"] = {
-                "nakshatras": NAKSHATRAS_IAST,
-                "roleLabels": [f"Tara {i+1}" for i in range(27)],
-                "groupDeities": {
-                    "Deva": "Vishnu",
-                    "Manushya": "Brahma", 
-                    "Rakshasa": "Shiva"
-                },
-                "specialTarasLegend": {
-                    "Abhijit": "Special Tara for auspicious activities"
-                }
-            }
-        
-        return NavataraResponse(**response_data)
+        encoded = await compute_flights.do(cache_key, calculate)
+        return json_response(encoded, DEFAULT_CACHE_CONTROL)
         
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1007,32 +1693,7 @@ async def get_positions(
 ):
     """Get planetary positions for a given date and location"""
     try:
-        jd = julian_day(date)
-        positions = []
-        
-        for planet_name, planet_id in PLANETS.items():
-            if planet_name == "Ketu":
-                # Ketu is opposite to Rahu
-                rahu_pos = get_planet_position(planet_id, jd)
-                ketu_long = (rahu_pos["longitude"] + 180) % 360
-                positions.append(PositionResponse(
-                    planet=planet_name,
-                    longitude=ketu_long,
-                    latitude=-rahu_pos["latitude"],
-                    speed=rahu_pos["speed"],
-                    house=int(ketu_long / 30) + 1
-                ))
-            else:
-                pos = get_planet_position(planet_id, jd)
-                positions.append(PositionResponse(
-                    planet=planet_name,
-                    longitude=pos["longitude"],
-                    latitude=pos["latitude"],
-                    speed=pos["speed"],
-                    house=pos["house"]
-                ))
-        
-        return positions
+        return await compute_executor.run(compute_positions, date)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1044,42 +1705,7 @@ async def get_panchanga(
 ):
     """Get Panchanga (five elements of time) for a given date and location"""
     try:
-        jd = julian_day(date)
-        
-        # Get Sun and Moon positions
-        sun_pos = get_planet_position(swe.SUN, jd)
-        moon_pos = get_planet_position(swe.MOON, jd)
-        
-        # Calculate Panchanga elements
-        tithi = get_tithi(sun_pos["longitude"], moon_pos["longitude"])
-        nakshatra = get_nakshatra(moon_pos["longitude"])
-        yoga = get_yoga(sun_pos["longitude"], moon_pos["longitude"])
-        karana = get_karana(list(TITHI_GROUPS.keys()).index(tithi["code"]) + 1)
-        
-        # Get vara (day of week)
-        dt = parser.parse(date)
-        vara = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"][dt.weekday()]
-        
-        # Convert to legacy format
-        tithi_legacy = {
-            "name": tithi["code"],
-            "number": list(TITHI_GROUPS.keys()).index(tithi["code"]) + 1,
-            "paksha": "Shukla" if tithi["code"] in ["Pratipada", "Dwitiya", "Tritiya", "Chaturthi", "Panchami", "Shashthi", "Saptami", "Ashtami", "Navami", "Dashami", "Ekadashi", "Dwadashi", "Trayodashi", "Chaturdashi", "Purnima"] else "Krishna"
-        }
-        
-        nakshatra_legacy = {
-            "name": nakshatra["nameIAST"],
-            "number": nakshatra["index"]
-        }
-        
-        return PanchangaResponse(
-            date=date,
-            tithi=TithiInfoLegacy(**tithi_legacy),
-            vara=vara,
-            nakshatra=NakshatraInfoLegacy(**nakshatra_legacy),
-            yoga=yoga,
-            karana=karana
-        )
+        return await compute_executor.run(compute_panchanga, date)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1095,46 +1721,7 @@ async def calculate_navatara_legacy(
         if birth_nakshatra not in NAKSHATRAS_IAST:
             raise HTTPException(status_code=400, detail="Invalid birth nakshatra")
         
-        jd = julian_day(date)
-        moon_pos = get_planet_position(swe.MOON, jd)
-        current_nakshatra = get_nakshatra(moon_pos["longitude"])
-        
-        # Calculate navatara number
-        birth_idx = NAKSHATRAS_IAST.index(birth_nakshatra)
-        current_idx = current_nakshatra["index"] - 1
-        diff = current_idx - birth_idx
-        if diff < 0:
-            diff += 27
-        navatara_num = (diff % 9) + 1
-        
-        # Determine if auspicious
-        auspicious_navataras = [1, 3, 5, 7, 9]
-        is_auspicious = navatara_num in auspicious_navataras
-        
-        # Generate recommendations
-        recommendations = []
-        if is_auspicious:
-            recommendations.extend([
-                "Good time for starting new ventures",
-                "Auspicious for ceremonies and rituals",
-                "Favorable for important decisions"
-            ])
-        else:
-            recommendations.extend([
-                "Consider postponing important activities",
-                "Focus on spiritual practices",
-                "Avoid starting new projects"
-            ])
-        
-        return NavataraResponseLegacy(
-            date=date,
-            birth_nakshatra=birth_nakshatra,
-            current_nakshatra=current_nakshatra["nameIAST"],
-            navatara_period=f"Navatara {navatara_num}",
-            navatara_number=navatara_num,
-            is_auspicious=is_auspicious,
-            recommendations=recommendations
-        )
+        return await compute_executor.run(compute_navatara_legacy, date, birth_nakshatra)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1153,7 +1740,7 @@ async def proxy_panchanga_yogas_detect(
             "longitude": longitude
         }
         
-        result = call_remote_api("v1/panchanga/yogas/detect", "GET", params=params)
+        result = await call_remote_api("v1/panchanga/yogas/detect", "GET", params=params)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Proxy error: {str(e)}")
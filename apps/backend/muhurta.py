@@ -0,0 +1,79 @@
+"""Per-day panchanga timeline index for muhurta searches.
+
+A ``DayTimeline`` holds one value per day for each panchanga attribute
+(vara, tithi, nakshatra, ...) of a run of consecutive civil days, stored as
+inverted lists: attribute -> value -> sorted day offsets. A search is then
+a union of posting lists per constrained attribute and an intersection
+across attributes, smallest first, without touching the ephemeris.
+
+Timelines are built one calendar year at a time per location and cached in
+``timeline_cache``, so multi-year queries reuse the years already built.
+"""
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Collection, Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from cache import LRUCache
+
+timeline_cache = LRUCache(int(os.getenv("MUHURTA_TIMELINE_CACHE_SIZE", "256")))
+
+# Attributes whose daily value is a collection (e.g. the yoga rules that fire)
+MULTI_VALUED = (list, tuple, set, frozenset)
+
+
+class DayTimeline:
+    """Inverted lists of panchanga attributes over consecutive days"""
+
+    def __init__(self, dates: List[str], columns: Dict[str, Sequence]):
+        self.dates = dates
+        self.index: Dict[str, Dict[Hashable, np.ndarray]] = {}
+        for attribute, values in columns.items():
+            postings = defaultdict(list)
+            for day, value in enumerate(values):
+                for item in (value if isinstance(value, MULTI_VALUED) else (value,)):
+                    postings[item].append(day)
+            self.index[attribute] = {
+                item: np.asarray(days, dtype=np.int32) for item, days in postings.items()
+            }
+
+    def match(self, constraints: Dict[str, Collection[Hashable]]) -> np.ndarray:
+        """Day offsets where every constrained attribute has one of its listed values"""
+        candidates = []
+        for attribute, values in constraints.items():
+            postings = self.index[attribute]
+            lists = [postings[value] for value in values if value in postings]
+            if not lists:
+                return np.empty(0, dtype=np.int32)
+            candidates.append(lists[0] if len(lists) == 1 else np.unique(np.concatenate(lists)))
+        if not candidates:
+            return np.arange(len(self.dates), dtype=np.int32)
+        candidates.sort(key=len)
+        days = candidates[0]
+        for other in candidates[1:]:
+            days = np.intersect1d(days, other, assume_unique=True)
+            if not len(days):
+                break
+        return days
+
+    def search(self, constraints: Dict[str, Collection[Hashable]],
+               start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[str]:
+        """Matching ISO dates, optionally limited to [start_date, end_date]"""
+        first = bisect_left(self.dates, start_date) if start_date else 0
+        last = bisect_right(self.dates, end_date) if end_date else len(self.dates)
+        days = self.match(constraints)
+        days = days[(days >= first) & (days < last)]
+        return [self.dates[day] for day in days.tolist()]
+
+
+def search_timelines(timelines: Iterable[DayTimeline], constraints: Dict[str, Collection[Hashable]],
+                     start_date: str, end_date: str, limit: Optional[int] = None) -> List[str]:
+    """Matching dates across consecutive timelines, in date order"""
+    matches: List[str] = []
+    for timeline in timelines:
+        matches.extend(timeline.search(constraints, start_date, end_date))
+        if limit is not None and len(matches) >= limit:
+            return matches[:limit]
+    return matches
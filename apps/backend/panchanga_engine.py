@@ -0,0 +1,167 @@
+"""Panchanga boundary engine.
+
+Tithi, karana, yoga and the Moon's nakshatra are all functions of the Sun and
+Moon longitudes alone. ``SunMoonGrid`` samples both bodies once over a date
+range (plus a margin so that every element overlapping the range has a
+known start and end) and serves:
+
+- exact start/end instants of every element, refined from the shared grid
+  with the same safeguarded Newton solver used for planetary ingresses;
+- interpolated Sun/Moon longitudes at arbitrary instants (cubic Hermite on
+  the grid), so evaluating an element at sunrise or noon costs no extra
+  ephemeris calls.
+"""
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from ayanamsa import get_ayanamsa_provider
+from ephemeris import NAKSHATRA_SPAN
+from metrics import CALC_UT_CALLS
+from transitions import solve_crossing, wrap180
+
+TITHI_SPAN = 12.0
+KARANA_SPAN = 6.0
+YOGA_SPAN = 360.0 / 27
+
+# Grid step (days) and margin around the requested range (days). Elements
+# last at most ~27 hours, so a 2-day margin always contains both boundaries.
+GRID_STEP_DAYS = 0.25
+GRID_MARGIN_DAYS = 2.0
+
+ELEMENTS = ("tithi", "karana", "yoga", "nakshatra")
+
+# Element -> (segment size in degrees, segments per circle)
+ELEMENT_SEGMENTS = {
+    "tithi": (TITHI_SPAN, 30),
+    "karana": (KARANA_SPAN, 60),
+    "yoga": (YOGA_SPAN, 27),
+    "nakshatra": (NAKSHATRA_SPAN, 27),
+}
+
+
+def _unwrap(longitude: np.ndarray) -> np.ndarray:
+    steps = wrap180(np.diff(longitude))
+    return np.concatenate(([longitude[0]], longitude[0] + np.cumsum(steps)))
+
+
+class SunMoonGrid:
+    """Shared Sun/Moon longitude grid over a Julian day range (UT)"""
+
+    def __init__(self, start_jd: float, end_jd: float, step_days: float = GRID_STEP_DAYS,
+                 margin_days: float = GRID_MARGIN_DAYS):
+        self.start_jd = start_jd
+        self.end_jd = end_jd
+        count = int(np.ceil((end_jd - start_jd + 2 * margin_days) / step_days))
+        self.jds = start_jd - margin_days + np.arange(count + 1) * step_days
+        self.step_days = step_days
+
+        sun = np.empty((len(self.jds), 2), dtype=np.float64)
+        moon = np.empty_like(sun)
+        for i, jd in enumerate(self.jds.tolist()):
+            xx = swe.calc_ut(jd, swe.SUN)[0]
+            sun[i] = xx[0], xx[3]
+            xx = swe.calc_ut(jd, swe.MOON)[0]
+            moon[i] = xx[0], xx[3]
+        CALC_UT_CALLS.inc(2 * len(self.jds))
+
+        self.ayanamsa = get_ayanamsa_provider().at_many(self.jds)
+        # Unwrapped tropical longitudes and speeds (degrees, degrees/day)
+        self.sun = _unwrap(sun[:, 0])
+        self.moon = _unwrap(moon[:, 0])
+        self.sun_speed = sun[:, 1]
+        self.moon_speed = moon[:, 1]
+        self._spans: Optional[Dict[str, List[dict]]] = None
+
+    def _quantity(self, element: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Unwrapped element angle and its rate on the grid"""
+        if element in ("tithi", "karana"):
+            return self.moon - self.sun, self.moon_speed - self.sun_speed
+        if element == "yoga":
+            return (self.moon + self.sun - 2 * self.ayanamsa,
+                    self.moon_speed + self.sun_speed)
+        return self.moon - self.ayanamsa, self.moon_speed
+
+    @staticmethod
+    def _evaluate(element: str, jd: float, reference: float) -> Tuple[float, float]:
+        """Exact element angle at jd unwrapped near `reference`, and its rate"""
+        sun = swe.calc_ut(jd, swe.SUN)[0]
+        moon = swe.calc_ut(jd, swe.MOON)[0]
+        CALC_UT_CALLS.inc(2)
+        if element in ("tithi", "karana"):
+            value, rate = moon[0] - sun[0], moon[3] - sun[3]
+        elif element == "yoga":
+            value = moon[0] + sun[0] - 2 * get_ayanamsa_provider().at(jd)
+            rate = moon[3] + sun[3]
+        else:
+            value, rate = moon[0] - get_ayanamsa_provider().at(jd), moon[3]
+        return reference + wrap180(value - reference), rate
+
+    def _boundaries(self, element: str) -> List[Tuple[float, int]]:
+        """Exact (jd, index after the boundary) for every crossing on the grid"""
+        span, cycle = ELEMENT_SEGMENTS[element]
+        value, rate = self._quantity(element)
+        segment = np.floor(value / span).astype(np.int64)
+        boundaries = []
+        for i in np.flatnonzero(np.diff(segment)).tolist():
+            # Elongation, yoga and Moon longitude only ever increase
+            for boundary in range(int(segment[i]) + 1, int(segment[i + 1]) + 1):
+                jd = solve_crossing(
+                    lambda t, reference: self._evaluate(element, t, reference),
+                    self.jds[i], self.jds[i + 1], value[i], value[i + 1],
+                    rate[i], rate[i + 1], boundary * span
+                )
+                boundaries.append((jd, boundary % cycle))
+        return boundaries
+
+    def spans(self) -> Dict[str, List[dict]]:
+        """Complete spans of every element overlapping the grid range.
+
+        Returns ``{element: [{"index", "start", "end"}, ...]}`` with 0-based
+        indexes (tithi 0-29, karana 0-59, yoga 0-26, nakshatra 0-26) and
+        start/end as Julian days (UT), ordered by start.
+        """
+        if self._spans is None:
+            self._spans = {}
+            for element in ELEMENTS:
+                boundaries = self._boundaries(element)
+                self._spans[element] = [
+                    {"index": index, "start": start, "end": end}
+                    for (start, index), (end, _) in zip(boundaries, boundaries[1:])
+                    if end > self.start_jd and start < self.end_jd
+                ]
+        return self._spans
+
+    def spans_between(self, element: str, start_jd: float, end_jd: float) -> List[dict]:
+        """Spans of one element overlapping [start_jd, end_jd)"""
+        spans = self.spans()[element]
+        starts = [span["start"] for span in spans]
+        first = max(bisect_right(starts, start_jd) - 1, 0)
+        result = []
+        for span in spans[first:]:
+            if span["start"] >= end_jd:
+                break
+            if span["end"] > start_jd:
+                result.append(span)
+        return result
+
+    def longitudes_at(self, jds) -> Tuple[np.ndarray, np.ndarray]:
+        """Tropical Sun and Moon longitudes (0-360) at arbitrary instants.
+
+        Cubic Hermite interpolation on the grid using the sampled speeds.
+        """
+        jds = np.atleast_1d(np.asarray(jds, dtype=np.float64))
+        i = np.clip(np.searchsorted(self.jds, jds, side="right") - 1, 0, len(self.jds) - 2)
+        h = self.jds[i + 1] - self.jds[i]
+        s = (jds - self.jds[i]) / h
+        s2, s3 = s * s, s * s * s
+        h00, h10 = 2 * s3 - 3 * s2 + 1, s3 - 2 * s2 + s
+        h01, h11 = -2 * s3 + 3 * s2, s3 - s2
+
+        def interpolate(values, speeds):
+            return np.mod(h00 * values[i] + h10 * h * speeds[i]
+                          + h01 * values[i + 1] + h11 * h * speeds[i + 1], 360.0)
+
+        return interpolate(self.sun, self.sun_speed), interpolate(self.moon, self.moon_speed)
@@ -0,0 +1,158 @@
+"""Opt-in per-request profiling.
+
+Off unless ``PROFILING_ENABLED`` is set at startup; only then is
+``ProfilingMiddleware`` installed, so normal deployments run no profiling
+code at all. When enabled, a request to one of ``PROFILED_ROUTES`` carrying
+``X-Profile: 1`` (or ``X-Profile: <PROFILING_TOKEN>`` when a token is
+configured) runs under ``cProfile``: the handler on the event loop and the
+calculation jobs it sends to the compute executor, in whichever worker thread
+or process they run. The response gets an ``X-Profile-Id`` header and the
+top-N functions by cumulative time are kept for
+``GET /diagnostics/profiles/{id}``.
+
+The event-loop side profiles everything the loop runs meanwhile, and the
+interpreter allows one profiler per thread, so only one request is profiled
+at a time: a request asking for a profile while another one runs is served
+normally, without ``X-Profile-Id``. A cached month is answered without
+calculating; profile a month not requested before (or after a restart).
+"""
+import cProfile
+import os
+import pstats
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cache import LRUCache
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+PROFILING_TOP_N = int(os.getenv("PROFILING_TOP_N", "30"))
+PROFILED_ROUTES = ("/positions/month", "/panchanga/month", "/navatara/calculate")
+PROFILE_HEADER = b"x-profile"
+
+# Profile id -> summary of the most recent profiled requests
+profiles = LRUCache(int(os.getenv("PROFILING_KEEP", "50")))
+
+# Held while a request is being profiled on the event loop
+_profiling = threading.Lock()
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+# (file, line, function) -> (primitive calls, calls, own seconds, cumulative seconds)
+RawStats = Dict[Tuple[str, int, str], Tuple[int, int, float, float]]
+
+
+def _raw_stats(profile: cProfile.Profile) -> RawStats:
+    return {func: (cc, nc, tt, ct) for func, (cc, nc, tt, ct, _) in pstats.Stats(profile).stats.items()}
+
+
+def profiled_call(call: Callable[[], Any]) -> Tuple[Any, RawStats]:
+    """Run call() under cProfile (in a compute worker); returns its result and stats"""
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Another profiler already owns this thread
+        return call(), {}
+    try:
+        result = call()
+    finally:
+        profile.disable()
+    return result, _raw_stats(profile)
+
+
+def active_profile() -> Optional["RequestProfile"]:
+    """The profile of the current request, None when not profiling"""
+    return _current.get() if PROFILING_ENABLED else None
+
+
+class RequestProfile:
+    """Merged cProfile stats of one request"""
+
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.started = time.perf_counter()
+        self.stats: RawStats = {}
+
+    def add(self, stats: RawStats) -> None:
+        for func, (cc, nc, tt, ct) in stats.items():
+            previous = self.stats.get(func)
+            if previous is not None:
+                cc, nc, tt, ct = cc + previous[0], nc + previous[1], tt + previous[2], ct + previous[3]
+            self.stats[func] = (cc, nc, tt, ct)
+
+    def summary(self, top: int = PROFILING_TOP_N) -> dict:
+        ranked = sorted(self.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "durationMs": round((time.perf_counter() - self.started) * 1000, 2),
+            "functions": [
+                {
+                    "function": f"{filename}:{line}({name})",
+                    "calls": nc,
+                    "primitiveCalls": cc,
+                    "ownMs": round(tt * 1000, 3),
+                    "cumulativeMs": round(ct * 1000, 3),
+                }
+                for (filename, line, name), (cc, nc, tt, ct) in ranked
+            ],
+        }
+
+
+def _requested(scope) -> bool:
+    if scope["type"] != "http" or scope["path"] not in PROFILED_ROUTES:
+        return False
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER:
+            value = value.decode("latin-1").strip()
+            return value == PROFILING_TOKEN if PROFILING_TOKEN else value.lower() in ("1", "true", "yes")
+    return False
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requests that ask for it"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not _requested(scope) or not _profiling.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            _profiling.release()
+
+    async def _profile(self, scope, receive, send):
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler already owns the event-loop thread
+            await self.app(scope, receive, send)
+            return
+        request_profile = RequestProfile(scope["method"], scope["path"])
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", request_profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = _current.set(request_profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.disable()
+            _current.reset(token)
+            request_profile.add(_raw_stats(profile))
+            profiles.set(request_profile.id, request_profile.summary())
@@ -0,0 +1,105 @@
+"""Stale-while-revalidate cache for deterministic remote API responses.
+
+An entry is fresh for ``ttl`` seconds after it was fetched and is served
+directly. For a further ``stale_ttl`` seconds it is still served at once,
+but the first such lookup starts a background task that refetches it; if
+the refresh fails the stale copy stays until it ages out. Only a key never
+seen before (or older than ``ttl + stale_ttl``) waits for the remote API.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from cache import LRUCache
+
+
+class StaleWhileRevalidateCache:
+    """Size-bounded remote response cache refreshed in the background"""
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float):
+        if ttl <= 0 or stale_ttl < 0:
+            raise ValueError("ttl must be positive and stale_ttl not negative")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # key -> (value, fresh until on the monotonic clock)
+        self._entries = LRUCache(maxsize, ttl=ttl + stale_ttl if stale_ttl else ttl)
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @classmethod
+    def from_env(cls) -> "StaleWhileRevalidateCache":
+        return cls(
+            int(os.getenv("REMOTE_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("REMOTE_CACHE_TTL", "3600")),
+            stale_ttl=float(os.getenv("REMOTE_CACHE_STALE_TTL", "86400")),
+        )
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached value for key, calling fetch() on a miss or refreshing it when stale"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            value = await fetch()
+            self.set(key, value)
+            return value
+        value, fresh_until = entry
+        if time.monotonic() < fresh_until:
+            self.fresh_hits += 1
+        else:
+            self.stale_hits += 1
+            self._refresh(key, fetch)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries.set(key, (value, time.monotonic() + self.ttl))
+
+    def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._refreshing.get(key)
+        if task is not None and task.get_loop() is loop and not task.done():
+            return
+        task = loop.create_task(self._revalidate(key, fetch))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+
+    async def _revalidate(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> None:
+        self.refreshes += 1
+        try:
+            self.set(key, await fetch())
+        except Exception as e:
+            self.refresh_failures += 1
+            print(f"Background refresh of {key!r} failed, keeping the stale response: {e}")
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._refreshing.get(key) is task:
+            del self._refreshing[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    def stats(self) -> dict:
+        lookups = self.fresh_hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self._entries.maxsize,
+            "ttl": self.ttl,
+            "staleTtl": self.stale_ttl,
+            "freshHits": self.fresh_hits,
+            "staleHits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refreshFailures": self.refresh_failures,
+            "refreshing": len(self._refreshing),
+            "evictions": self._entries.evictions,
+            "hitRate": round((self.fresh_hits + self.stale_hits) / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,224 @@
+"""Async client for the remote Jyotish API.
+
+One ``httpx.AsyncClient`` is shared by every request so connections to the
+remote host are pooled and kept alive instead of being opened per call. A
+semaphore bounds how many requests are in flight at once, failed attempts
+are retried after a jittered ``asyncio.sleep`` (never blocking the event
+loop), and each call has an overall deadline covering the wait for a slot,
+every attempt and the back-off between them. An optional circuit breaker
+refuses calls outright while the remote API is failing or slow.
+"""
+import asyncio
+import os
+import random
+import time
+from typing import Any, Dict, Optional, Sequence, Set
+
+import httpx
+
+from circuit_breaker import CircuitBreaker
+from metrics import REMOTE_CALLS, REMOTE_RETRIES
+
+RETRY_DELAYS = (0.25, 0.5, 1.0)  # seconds, upper bounds of the jittered back-off
+
+
+class RemoteAPIError(Exception):
+    """A remote call that failed after its retries or ran out of time"""
+
+    def __init__(self, detail: str, status: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status = status
+
+
+class CircuitOpenError(RemoteAPIError):
+    """A call refused because the circuit breaker is open"""
+
+
+def _retryable(status: int) -> bool:
+    return status == 429 or status >= 500
+
+
+class RemoteClient:
+    """Pooled, concurrency-bounded client with retries and per-call deadlines"""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None,
+                 max_connections: int = 20, max_concurrency: int = 10,
+                 timeout: float = 20.0, deadline: float = 30.0,
+                 retry_delays: Sequence[float] = RETRY_DELAYS,
+                 breaker: Optional[CircuitBreaker] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_key = api_key
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.deadline = deadline
+        self.retry_delays = tuple(retry_delays)
+        self.breaker = breaker
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["RemoteClient"]:
+        base_url = os.getenv("REMOTE_API_BASE_URL")
+        if not base_url:
+            return None
+        return cls(
+            base_url,
+            api_key=os.getenv("REMOTE_API_KEY"),
+            max_connections=int(os.getenv("REMOTE_API_MAX_CONNECTIONS", "20")),
+            max_concurrency=int(os.getenv("REMOTE_API_MAX_CONCURRENCY", "10")),
+            timeout=float(os.getenv("REMOTE_API_TIMEOUT", "20")),
+            deadline=float(os.getenv("REMOTE_API_DEADLINE", "30")),
+            breaker=CircuitBreaker.from_env(),
+        )
+
+    def _bind(self) -> None:
+        # Pooled connections and the semaphore belong to one event loop; a
+        # new loop (e.g. a test client per request) gets fresh ones
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop:
+            return
+        if self._client is not None:
+            self._close_stale(self._client, self._loop)
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.api_key:
+            headers["X-API-Key"] = self.api_key
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+            transport=self.transport,
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = loop
+
+    def _close_stale(self, client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Close the connection pool of a client bound to another event loop"""
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+            return
+
+        async def close() -> None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Closing the remote API client of a finished event loop failed: {e}")
+
+        # The old loop is gone: close the pool from this one (keep a reference until done)
+        task = asyncio.get_running_loop().create_task(close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client of the running event loop"""
+        self._bind()
+        return self._client
+
+    async def request(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                      json: Any = None, deadline: Optional[float] = None) -> Any:
+        """Decoded JSON response, retrying transport errors, 429 and 5xx"""
+        if self.breaker is None:
+            return await self._request(method, endpoint, params, json, deadline)
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"circuit open, not calling {endpoint.lstrip('/')}")
+        start = time.monotonic()
+        ok = None
+        try:
+            result = await self._request(method, endpoint, params, json, deadline)
+            ok = True
+            return result
+        except RemoteAPIError as e:
+            # A 4xx answer means the remote is up; it is the request that is wrong
+            ok = e.status is not None and e.status < 500 and e.status != 429
+            raise
+        finally:
+            self.breaker.record(ok, time.monotonic() - start)
+
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict],
+                       json: Any, deadline: Optional[float]) -> Any:
+        self._bind()
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (self.deadline if deadline is None else deadline)
+        url = endpoint.lstrip("/")
+        attempts = len(self.retry_delays) + 1
+        error = "no attempt made"
+        status = None
+        out_of_time = False
+
+        for attempt in range(attempts):
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                out_of_time = True
+                break
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), remaining)
+            except asyncio.TimeoutError:
+                error, out_of_time = "timed out waiting for a connection slot", True
+                break
+            try:
+                # httpx timeouts apply per socket operation; wait_for bounds the total
+                remaining = max(expires - loop.time(), 0.001)
+                response = await asyncio.wait_for(
+                    self._client.request(
+                        method.upper(), url, params=params, json=json,
+                        timeout=min(self.timeout, remaining),
+                    ),
+                    remaining,
+                )
+            except asyncio.TimeoutError:
+                REMOTE_CALLS.inc(endpoint=url, outcome="timeout")
+                error, status, out_of_time = f"timed out requesting {url}", None, True
+                break
+            except httpx.HTTPError as e:
+                REMOTE_CALLS.inc(endpoint=url, outcome="error")
+                error, status = f"{type(e).__name__}: {e}", None
+            else:
+                REMOTE_CALLS.inc(endpoint=url, outcome=f"{response.status_code // 100}xx")
+                if response.status_code < 400:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        raise RemoteAPIError(f"Invalid JSON from {url}: {e}", response.status_code) from e
+                error, status = f"HTTP {response.status_code} from {url}", response.status_code
+                if not _retryable(response.status_code):
+                    raise RemoteAPIError(error, status)
+            finally:
+                self._semaphore.release()
+
+            if attempt == attempts - 1:
+                break
+            # Full jitter: spread retries of concurrent callers apart
+            delay = random.uniform(0, self.retry_delays[attempt])
+            if loop.time() + delay >= expires:
+                out_of_time = True
+                break
+            print(f"Remote API attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s...")
+            REMOTE_RETRIES.inc(endpoint=url)
+            await asyncio.sleep(delay)
+
+        if out_of_time:
+            error = f"deadline exceeded: {error}"
+        raise RemoteAPIError(error, status)
+
+    async def get(self, endpoint: str, params: Optional[Dict] = None, **kwargs) -> Any:
+        return await self.request("GET", endpoint, params=params, **kwargs)
+
+    async def post(self, endpoint: str, json: Any = None, **kwargs) -> Any:
+        return await self.request("POST", endpoint, json=json, **kwargs)
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
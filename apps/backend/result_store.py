@@ -0,0 +1,189 @@
+"""Persistent SQLite store for computed month responses.
+
+Instances restart often and the in-process caches start empty, so encoded
+month responses are also written to an SQLite file (``RESULT_STORE_PATH``)
+that a new instance can serve from. Rows are keyed by the canonical request
+key and tagged with the engine version; opening the store with a different
+version drops every row written by another one.
+
+Reads go through a memory-mapped database (``PRAGMA mmap_size``), and writes
+are buffered and committed in batches so a burst of cold months costs one
+transaction rather than one per response. A batch is committed when it is
+full, and otherwise by the background flusher (``start``) at most
+``flush_interval`` seconds later; rows still pending when the process
+crashes are lost, and other processes only see rows once committed.
+
+Every method blocks on SQLite, so the app calls them from worker threads
+(``asyncio.to_thread``), never on the event loop.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import swisseph as swe
+
+from ayanamsa import resolve_sidereal_mode
+from http_cache import EncodedResponse
+
+# Any change to the content of a month response (calculation or output
+# format) must bump this, or rows written by older builds keep being served
+ENGINE_REVISION = "2"
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT NOT NULL,
+    created REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def engine_version() -> str:
+    """Version tag of everything a stored response depends on"""
+    return f"{ENGINE_REVISION}:swe-{swe.version}:sid-{resolve_sidereal_mode()}"
+
+
+def canonical_key(key: Hashable) -> str:
+    """Stable text form of a cache key tuple"""
+    return json.dumps(key, separators=(",", ":"))
+
+
+class ResultStore:
+    """SQLite-backed map of canonical request key -> encoded response"""
+
+    def __init__(self, path: str, version: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+                 mmap_size: int = DEFAULT_MMAP_SIZE):
+        self.path = path
+        self.version = version or engine_version()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Tuple[bytes, str, float]] = {}
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._conn.execute(_SCHEMA)
+        # Automatic invalidation: rows from other engine versions are stale
+        self.invalidated = self._conn.execute(
+            "DELETE FROM results WHERE version != ?", (self.version,)
+        ).rowcount
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["ResultStore"]:
+        """Store configured by RESULT_STORE_PATH, or None when unset"""
+        path = os.getenv("RESULT_STORE_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            batch_size=int(os.getenv("RESULT_STORE_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))),
+            flush_interval=float(os.getenv("RESULT_STORE_FLUSH_INTERVAL", str(DEFAULT_FLUSH_INTERVAL))),
+        )
+
+    def get(self, key: Hashable) -> Optional[EncodedResponse]:
+        text_key = canonical_key(key)
+        with self._lock:
+            pending = self._pending.get(text_key)
+            if pending is not None:
+                self.hits += 1
+                return EncodedResponse(pending[0], pending[1])
+            row = self._conn.execute(
+                "SELECT body, etag FROM results WHERE key = ? AND version = ?",
+                (text_key, self.version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return EncodedResponse(bytes(row[0]), row[1])
+
+    def put(self, key: Hashable, encoded: EncodedResponse) -> None:
+        """Queue a response; the batch is committed when full or stale"""
+        with self._lock:
+            self._pending[canonical_key(key)] = (encoded.body, encoded.etag, time.time())
+            due = (len(self._pending) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if due:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        rows: List[tuple] = [
+            (key, self.version, body, etag, created)
+            for key, (body, etag, created) in self._pending.items()
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, version, body, etag, created) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        self._pending.clear()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except sqlite3.Error as e:
+                print(f"Result store flush failed, retrying later: {e}")
+
+    def start(self) -> None:
+        """Commit pending writes every flush_interval seconds in the background"""
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+
+    def rows(self) -> int:
+        """Committed rows (pending writes excluded)"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "version": self.version,
+            "rows": self.rows(),
+            "pending": len(self._pending),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": round(self.hits / lookups, 4) if lookups else None,
+        }
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Script para medir el rendimiento de los cálculos y detectar regresiones
+Uso: python scripts/benchmark.py run [--only get_tithi ...] [--rounds N] [--min-time S] \
+        [--save benchmarks/baseline.json] [--output resultados.json]
+     python scripts/benchmark.py compare [--baseline benchmarks/baseline.json] \
+        [--current resultados.json] [--threshold 0.25] [--only ...]
+
+compare mide de nuevo (o lee --current) y termina con código 1 si alguna
+mediana es más lenta que la de la línea base en más de --threshold.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark import BASELINE_PATH, DEFAULT_THRESHOLD, compare, load_results, run_benchmarks, save_results
+
+def format_seconds(value: float) -> str:
+    """Tiempo legible (µs o ms)"""
+    if value < 1e-3:
+        return f"{value * 1e6:.1f} µs"
+    return f"{value * 1e3:.2f} ms"
+
+def measure(args) -> dict:
+    """Ejecutar los benchmarks pedidos mostrando cada resultado"""
+    print("🔄 Ejecutando benchmarks...")
+    results = run_benchmarks(args.only, rounds=args.rounds, min_time=args.min_time)
+    for name, result in results["benchmarks"].items():
+        print(f"  {name:<24} {format_seconds(result['median']):>12}  (mín. {format_seconds(result['min'])}, {result['description']})")
+    return results
+
+def command_run(args):
+    """Medir y guardar los resultados"""
+    results = measure(args)
+    for path in (args.save, args.output):
+        if path:
+            save_results(results, Path(path))
+            print(f"✅ Resultados guardados en {path}")
+
+def command_compare(args):
+    """Comparar con la línea base y fallar si hay regresiones"""
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"❌ No existe la línea base {baseline_path}; crearla con 'run --save'", file=sys.stderr)
+        sys.exit(1)
+    baseline = load_results(baseline_path)
+    current = load_results(Path(args.current)) if args.current else measure(args)
+
+    rows = compare(baseline, current, args.threshold)
+    print(f"\n📊 Comparación con {baseline_path} (umbral +{args.threshold:.0%})")
+    for row in rows:
+        if row.baseline is None:
+            print(f"  ➕ {row.name:<24} {format_seconds(row.current):>12}  (sin línea base)")
+            continue
+        icon = "❌" if row.regressed else "✅"
+        print(f"  {icon} {row.name:<24} {format_seconds(row.baseline):>12} → {format_seconds(row.current):>12}  ({row.change:+.1%})")
+
+    regressions = [row.name for row in rows if row.regressed]
+    if regressions:
+        print(f"\n❌ Regresiones: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+    print("\n✅ Sin regresiones")
+
+def main():
+    """Función principal"""
+    arg_parser = argparse.ArgumentParser(description="Benchmarks de los cálculos con línea base")
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    def add_measure_args(parser):
+        parser.add_argument("--only", action="append", help="Benchmark a ejecutar (repetible), por defecto todos")
+        parser.add_argument("--rounds", type=int, default=5, help="Rondas por benchmark (por defecto 5)")
+        parser.add_argument("--min-time", type=float, default=0.2, help="Segundos mínimos por ronda (por defecto 0.2)")
+
+    run_parser = subparsers.add_parser("run", help="Medir")
+    add_measure_args(run_parser)
+    run_parser.add_argument("--save", nargs="?", const=str(BASELINE_PATH), help="Guardar como línea base (por defecto benchmarks/baseline.json)")
+    run_parser.add_argument("--output", help="Guardar los resultados en otro archivo JSON")
+    run_parser.set_defaults(handler=command_run)
+
+    compare_parser = subparsers.add_parser("compare", help="Comparar con la línea base")
+    add_measure_args(compare_parser)
+    compare_parser.add_argument("--baseline", default=str(BASELINE_PATH), help="Línea base (por defecto benchmarks/baseline.json)")
+    compare_parser.add_argument("--current", help="Resultados ya medidos (JSON de 'run --output') en lugar de medir")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Regresión tolerada (por defecto 0.25 = +25%%)")
+    compare_parser.set_defaults(handler=command_compare)
+
+    args = arg_parser.parse_args()
+    args.handler(args)
+
+if __name__ == "__main__":
+    main()
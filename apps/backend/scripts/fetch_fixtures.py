@@ -12,16 +12,16 @@ import httpx
 from datetime import datetime
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from warmup import DEFAULT_CITIES
+
 # Configuración por defecto
 DEFAULT_YEAR = 2025
 DEFAULT_MONTH = 1
 DEFAULT_CITY = "Paris"
-DEFAULT_COORDS = {
-    "Paris": {"lat": 48.8566, "lon": 2.3522, "tz": "Europe/Paris"},
-    "Mumbai": {"lat": 19.0760, "lon": 72.8777, "tz": "Asia/Kolkata"},
-    "New York": {"lat": 40.7128, "lon": -74.0060, "tz": "America/New_York"},
-    "Tokyo": {"lat": 35.6762, "lon": 139.6503, "tz": "Asia/Tokyo"},
-}
+# Tabla de ciudades compartida con el precalentamiento (warmup.DEFAULT_CITIES)
+DEFAULT_COORDS = DEFAULT_CITIES
 
 def get_coordinates(city: str) -> dict:
     """Obtener coordenadas y timezone para una ciudad"""
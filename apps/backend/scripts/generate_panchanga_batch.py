@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Script para generar panchanga de muchas ciudades y meses en paralelo
+Uso: python scripts/generate_panchanga_batch.py --from 2025-01 --to 2025-12 \
+        [--city Paris --city Mumbai] [--workers N] [--output panchanga.jsonl]
+
+Escribe una línea JSON por (ciudad, mes) en el orden de envío.
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from batch import iter_panchanga_batch
+from fetch_fixtures import DEFAULT_COORDS
+
+def parse_month(value: str) -> Tuple[int, int]:
+    """Parsear YYYY-MM"""
+    year, month = value.split("-")
+    return int(year), int(month)
+
+def month_range(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Meses entre start y end (ambos incluidos)"""
+    months = []
+    year, month = start
+    while (year, month) <= end:
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def build_requests(cities: List[str], months: List[Tuple[int, int]]) -> List[dict]:
+    """Un request de /panchanga/month por (ciudad, mes)"""
+    requests = []
+    for city in cities:
+        coords = DEFAULT_COORDS[city]
+        for year, month in months:
+            requests.append({
+                "year": year,
+                "month": month,
+                "timezone": coords["tz"],
+                "latitude": coords["lat"],
+                "longitude": coords["lon"]
+            })
+    return requests
+
+def main():
+    """Función principal"""
+    arg_parser = argparse.ArgumentParser(description="Generar panchanga mensual en lote")
+    arg_parser.add_argument("--from", dest="start", required=True, type=parse_month, help="Primer mes (YYYY-MM)")
+    arg_parser.add_argument("--to", dest="end", type=parse_month, help="Último mes (YYYY-MM), por defecto igual a --from")
+    arg_parser.add_argument("--city", dest="cities", action="append", choices=sorted(DEFAULT_COORDS),
+                            help="Ciudad (repetible), por defecto todas")
+    arg_parser.add_argument("--workers", type=int, help="Procesos (por defecto: número de CPUs)")
+    arg_parser.add_argument("--output", type=Path, help="Archivo JSONL de salida (por defecto stdout)")
+    args = arg_parser.parse_args()
+
+    cities = args.cities or list(DEFAULT_COORDS)
+    requests = build_requests(cities, month_range(args.start, args.end or args.start))
+    print(f"🔄 Generando {len(requests)} meses de panchanga", file=sys.stderr)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    try:
+        for result in iter_panchanga_batch(requests, workers=args.workers):
+            if result["error"]:
+                failures += 1
+                print(f"  ❌ {result['request']}: {result['error']}", file=sys.stderr)
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+    finally:
+        if args.output:
+            output.close()
+
+    if failures:
+        print(f"❌ {failures} de {len(requests)} fallaron", file=sys.stderr)
+        sys.exit(1)
+    print(f"✅ {len(requests)} meses generados", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
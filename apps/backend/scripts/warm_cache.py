@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script para precalcular meses populares en el almacén persistente de resultados
+Uso: python scripts/warm_cache.py [--months N] [--from YYYY-MM] [--city Paris ...] \
+        [--cities-file ciudades.json] [--workers N] [--store results.db]
+
+Calcula positions (una vez por mes) y panchanga (por ciudad y mes) en paralelo
+y los guarda en RESULT_STORE_PATH (o --store), para que las instancias nuevas
+los sirvan desde disco.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import month_cache_key, normalize_month_request, result_store, PanchangaMonthRequest, PositionsMonthRequest
+from result_store import ResultStore
+from warmup import iter_warmup, load_cities, month_window, warmup_jobs
+
+def parse_month(value: str) -> tuple:
+    """Parsear YYYY-MM"""
+    year, month = value.split("-")
+    return int(year), int(month)
+
+def job_key(endpoint: str, fields: dict) -> tuple:
+    """Clave del almacén para un trabajo de precalentamiento"""
+    model = PositionsMonthRequest if endpoint == "positions" else PanchangaMonthRequest
+    return month_cache_key(endpoint, normalize_month_request(model(**fields)))
+
+def main():
+    """Función principal"""
+    arg_parser = argparse.ArgumentParser(description="Precalcular meses populares")
+    arg_parser.add_argument("--months", type=int, default=2, help="Meses a calcular (por defecto 2)")
+    arg_parser.add_argument("--from", dest="start", type=parse_month, help="Primer mes (YYYY-MM), por defecto el actual")
+    arg_parser.add_argument("--city", dest="cities", action="append", help="Ciudad de la tabla (repetible), por defecto todas")
+    arg_parser.add_argument("--cities-file", help="JSON {ciudad: {lat, lon, tz}} (por defecto WARMUP_CITIES_FILE o la tabla integrada)")
+    arg_parser.add_argument("--workers", type=int, help="Procesos (por defecto: número de CPUs)")
+    arg_parser.add_argument("--store", help="Archivo SQLite (por defecto RESULT_STORE_PATH)")
+    args = arg_parser.parse_args()
+
+    store = ResultStore(args.store) if args.store else result_store
+    if store is None:
+        print("❌ Indicar --store o RESULT_STORE_PATH", file=sys.stderr)
+        sys.exit(1)
+
+    cities = load_cities(args.cities_file)
+    if args.cities:
+        unknown = [city for city in args.cities if city not in cities]
+        if unknown:
+            print(f"❌ Ciudades desconocidas: {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(1)
+        cities = {city: cities[city] for city in args.cities}
+
+    jobs = warmup_jobs(cities, month_window(args.months, args.start))
+    print(f"🔄 Precalculando {len(jobs)} respuestas para {len(cities)} ciudades")
+
+    try:
+        for (endpoint, fields), encoded in iter_warmup(jobs, workers=args.workers):
+            store.put(job_key(endpoint, fields), encoded)
+    finally:
+        store.close()
+
+    print(f"✅ {len(jobs)} respuestas guardadas en {store.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Coalescing of identical in-flight work.
+
+``SingleFlight.do(key, fn)`` runs ``fn()`` for the first caller with a given
+key; callers arriving with the same key while it runs await the same task
+instead of starting their own. The work runs as its own task, so a caller
+that disconnects does not cancel it for the others.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """At most one running task per key, shared by every concurrent caller"""
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        task = self._tasks.get(key)
+        if task is not None and task.get_loop() is loop and not task.done():
+            self.shared += 1
+        else:
+            task = loop.create_task(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+            self.leaders += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # Every caller may have gone; the error must not be reported as unretrieved
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"inFlight": len(self._tasks), "leaders": self.leaders, "shared": self.shared}
@@ -0,0 +1,58 @@
+"""Sunrise and sunset with a per-location LRU cache.
+
+Rise and set instants come from ``swe.rise_trans`` (upper limb, standard
+refraction), searched from local mean midnight so the result belongs to the
+requested date at that longitude. Results are cached by rounded coordinates
+and date; we serve the same few hundred cities all day.
+"""
+import os
+from datetime import date
+from typing import List, Optional, Sequence, Tuple
+
+import swisseph as swe
+
+from cache import LRUCache
+
+# Coordinates are rounded to this many decimals for cache keys
+# (0.001 degrees of longitude shifts sunrise by a quarter of a second)
+SUN_TIMES_COORD_PRECISION = 3
+
+sun_times_cache = LRUCache(int(os.getenv("SUNRISE_CACHE_SIZE", "100000")))
+
+SunTimes = Tuple[Optional[float], Optional[float]]
+
+
+def _search(start_jd: float, event: int, geopos: Tuple[float, float, float]) -> Optional[float]:
+    """Next rise or set after start_jd, or None when the Sun is circumpolar"""
+    res, tret = swe.rise_trans(start_jd, swe.SUN, event, geopos)
+    if res != 0:
+        return None
+    return tret[0]
+
+
+def compute_sun_times(date_str: str, latitude: float, longitude: float) -> SunTimes:
+    """Sunrise and sunset Julian days (UT) for a date at a location"""
+    d = date.fromisoformat(date_str)
+    local_midnight = swe.julday(d.year, d.month, d.day, 0.0) - longitude / 360.0
+    geopos = (longitude, latitude, 0.0)
+    sunrise = _search(local_midnight, swe.CALC_RISE, geopos)
+    sunset = _search(sunrise if sunrise is not None else local_midnight, swe.CALC_SET, geopos)
+    # Keep the set on the same local day when there is no rise (polar day/night)
+    if sunset is not None and sunset >= local_midnight + 1:
+        sunset = None
+    return sunrise, sunset
+
+
+def get_sun_times(date_str: str, latitude: float, longitude: float) -> SunTimes:
+    """Cached ``compute_sun_times``"""
+    key = (round(latitude, SUN_TIMES_COORD_PRECISION), round(longitude, SUN_TIMES_COORD_PRECISION), date_str)
+    cached = sun_times_cache.get(key)
+    if cached is None:
+        cached = compute_sun_times(date_str, key[0], key[1])
+        sun_times_cache.set(key, cached)
+    return cached
+
+
+def get_sun_times_for_dates(dates: Sequence[str], latitude: float, longitude: float) -> List[SunTimes]:
+    """Sunrise/sunset for each date, e.g. a whole month"""
+    return [get_sun_times(date_str, latitude, longitude) for date_str in dates]
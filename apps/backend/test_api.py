@@ -1,8 +1,18 @@
+import asyncio
 import pytest
 import httpx
+import time
 import json
+import os
 from fastapi.testclient import TestClient
-from main import app
+import main
+from circuit_breaker import CircuitBreaker
+from datasets import StaticDataset
+from datetime import date
+from http_cache import etag_index
+from main import app, month_response_cache
+from remote_cache import StaleWhileRevalidateCache
+from result_store import ResultStore
 
 client = TestClient(app)
 
@@ -108,6 +118,65 @@ class TestPositionsMonthEndpoint:
         
         response = client.post("/positions/month", json=request_data)
         assert response.status_code == 422  # Validation error
+    
+    def test_positions_month_exact_transitions(self):
+        """Test transitions carry exact UTC ingress instants within the month"""
+        request_data = {
+            "year": 2024,
+            "month": 1,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        
+        response = client.post("/positions/month", json=request_data)
+        assert response.status_code == 200
+        
+        transitions = response.json()["transitions"]
+        moon_transitions = [t for t in transitions if t["planet"] == "Moon"]
+        # The Moon changes nakshatra about once a day
+        assert 25 <= len(moon_transitions) <= 32
+        for transition in transitions:
+            assert transition["atISO"].startswith(transition["date"])
+            assert "2024-01-01" <= transition["date"] <= "2024-01-31"
+            assert transition["from"] != transition["to"]
+
+class TestPositionsIngressesEndpoint:
+    """Test POST /positions/ingresses endpoint"""
+    
+    def test_ingresses_valid_request(self):
+        """Test ingresses for a subset of planets and kinds"""
+        request_data = {
+            "startDate": "2024-01-01",
+            "endDate": "2024-01-07",
+            "planets": ["Moon", "Sun"],
+            "kinds": ["nakshatra", "sign"]
+        }
+        
+        response = client.post("/positions/ingresses", json=request_data)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["range"]["startISO"] == "2024-01-01T00:00:00Z"
+        assert data["range"]["endISO"] == "2024-01-08T00:00:00Z"
+        assert data["events"]
+        for event in data["events"]:
+            assert event["planet"] in ["Moon", "Sun"]
+            assert event["kind"] in ["nakshatra", "sign"]
+            assert event["atISO"].endswith("Z")
+        assert [e["atISO"] for e in data["events"]] == sorted(e["atISO"] for e in data["events"])
+    
+    def test_ingresses_unknown_planet(self):
+        """Test unknown planets are rejected"""
+        request_data = {"startDate": "2024-01-01", "endDate": "2024-01-07", "planets": ["Pluto"]}
+        response = client.post("/positions/ingresses", json=request_data)
+        assert response.status_code == 400
+    
+    def test_ingresses_reversed_range(self):
+        """Test an end date before the start date is rejected"""
+        request_data = {"startDate": "2024-01-07", "endDate": "2024-01-01"}
+        response = client.post("/positions/ingresses", json=request_data)
+        assert response.status_code == 400
 
 class TestPanchangaMonthEndpoint:
     """Test POST /panchanga/month endpoint"""
@@ -180,6 +249,33 @@ class TestPanchangaMonthEndpoint:
         data = response.json()
         assert len(data["days"]) == 29  # February 2024 has 29 days (leap year)
     
+    def test_panchanga_month_intervals(self):
+        """Test each day reports element intervals with start and end instants"""
+        request_data = {
+            "year": 2024,
+            "month": 1,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        
+        response = client.post("/panchanga/month", json=request_data)
+        assert response.status_code == 200
+        
+        for day in response.json()["days"]:
+            intervals = day["intervals"]
+            for element in ["tithi", "karana", "yoga", "nakshatra"]:
+                assert intervals[element]
+                for interval in intervals[element]:
+                    assert interval["startISO"] < interval["endISO"]
+                    assert interval["name"]
+            # Real sunrise before sunset (New Delhi is never polar)
+            assert day["sunriseISO"] < day["sunsetISO"]
+            assert day["sunriseISO"] != f"{day['date']}T06:00:00Z"
+            # The reported tithi is one of the day's tithi intervals
+            assert day["tithi"]["code"] in [i["name"] for i in intervals["tithi"]]
+            assert day["karana"] in [i["name"] for i in intervals["karana"]]
+    
     def test_panchanga_month_february_non_leap_year(self):
         """Test panchanga month for February in non-leap year"""
         request_data = {
@@ -195,6 +291,622 @@ class TestPanchangaMonthEndpoint:
         
         data = response.json()
         assert len(data["days"]) == 28  # February 2023 has 28 days
+    
+    def test_panchanga_month_timezone(self):
+        """Test days are civil days in the requested timezone, evaluated at sunrise"""
+        request_data = {
+            "year": 2024,
+            "month": 3,
+            "timezone": "America/Los_Angeles",
+            "latitude": 34.0522,
+            "longitude": -118.2437
+        }
+        
+        response = client.post("/panchanga/month", json=request_data)
+        assert response.status_code == 200
+        
+        days = response.json()["days"]
+        # 2024-03-01 was a Friday
+        assert days[0]["vara"] == "Friday"
+        # Sunrise is reported in local time, across the DST change on 2024-03-10
+        assert days[8]["sunriseISO"].startswith("2024-03-09T06:") and days[8]["sunriseISO"].endswith("-08:00")
+        assert days[10]["sunriseISO"].startswith("2024-03-11T07:") and days[10]["sunriseISO"].endswith("-07:00")
+        # New moon at 01:00 PST on 2024-03-10, so sunrise falls in Pratipada
+        assert days[9]["tithi"]["code"] == "Pratipada"
+    
+    def test_panchanga_month_invalid_timezone(self):
+        """Test unknown timezones are rejected"""
+        request_data = {
+            "year": 2024,
+            "month": 3,
+            "timezone": "Mars/Olympus_Mons",
+            "latitude": 34.0522,
+            "longitude": -118.2437
+        }
+        
+        response = client.post("/panchanga/month", json=request_data)
+        assert response.status_code == 400
+
+class TestMonthResponseCache:
+    """Test the month endpoints' response cache"""
+    
+    def setup_method(self):
+        month_response_cache.clear()
+    
+    def test_repeated_requests_hit_cache(self):
+        """Test identical and near-identical requests are served from the cache"""
+        request_data = {
+            "year": 2024,
+            "month": 5,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        first = client.post("/panchanga/month", json=request_data)
+        # Differs only below the coordinate rounding
+        second = client.post("/panchanga/month", json={**request_data, "latitude": 28.61392})
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        
+        stats = client.get("/diagnostics/cache").json()["monthResponses"]
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+    
+    def test_distinct_requests_miss(self):
+        """Test other locations and months are computed separately"""
+        request_data = {
+            "year": 2024,
+            "month": 5,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        client.post("/panchanga/month", json=request_data)
+        client.post("/panchanga/month", json={**request_data, "latitude": 19.0760})
+        client.post("/panchanga/month", json={**request_data, "month": 6})
+        assert month_response_cache.stats()["misses"] == 3
+    
+    def test_positions_keyed_by_month_only(self):
+        """Test local positions are shared across locations"""
+        request_data = {
+            "year": 2024,
+            "month": 5,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        first = client.post("/positions/month", json=request_data)
+        second = client.post("/positions/month", json={**request_data, "timezone": "Europe/Paris", "latitude": 48.8566})
+        assert first.json() == second.json()
+        assert month_response_cache.stats()["hits"] == 1
+    
+    def test_concurrent_misses_compute_once(self, monkeypatch):
+        """Test simultaneous identical requests share a single calculation"""
+        calculate = main.compute_panchanga_month
+        calls = []
+        def counting(request):
+            calls.append(request)
+            time.sleep(0.05)
+            return calculate(request)
+        monkeypatch.setattr(main, "compute_panchanga_month", counting)
+        request_data = {
+            "year": 2024,
+            "month": 7,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        
+        async def burst():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await asyncio.gather(
+                    *(async_client.post("/panchanga/month", json=request_data) for _ in range(10))
+                )
+        
+        responses = asyncio.run(burst())
+        assert all(response.status_code == 200 for response in responses)
+        assert len({response.headers["ETag"] for response in responses}) == 1
+        assert len(calls) == 1
+    
+    def test_edited_yoga_rules_invalidate_months(self, tmp_path, monkeypatch):
+        """Test editing the yoga rules file recomputes cached and stored months"""
+        rules_path = tmp_path / "yogas.rules.json"
+        def write_rules(rule, mtime):
+            rules_path.write_text(json.dumps([{"name": "Test Yoga", "polarity": "auspicious", "rule": rule, "explain": "test"}]))
+            os.utime(rules_path, ns=(mtime, mtime))
+        write_rules("nakshatraIndex >= 1", 1_000_000_000)
+        monkeypatch.setattr(main, "yoga_rules_dataset", StaticDataset(str(rules_path), [], check_interval=0))
+        store = ResultStore(str(tmp_path / "results.db"))
+        monkeypatch.setattr(main, "result_store", store)
+        request_data = {
+            "year": 2024,
+            "month": 8,
+            "timezone": "Asia/Kolkata",
+            "latitude": 28.6139,
+            "longitude": 77.2090
+        }
+        def yoga_names(response):
+            assert response.status_code == 200
+            return {yoga["name"] for day in response.json()["days"] for yoga in day["specialYogas"]}
+        
+        first = client.post("/panchanga/month", json=request_data)
+        assert yoga_names(first) == {"Test Yoga"}
+        write_rules("nakshatraIndex >= 100", 2_000_000_000)
+        second = client.post("/panchanga/month", json=request_data, headers={"If-None-Match": first.headers["ETag"]})
+        assert yoga_names(second) == set()
+        assert second.headers["ETag"] != first.headers["ETag"]
+        store.close()
+
+class TestConditionalRequests:
+    """Test ETag, Cache-Control and If-None-Match handling"""
+    
+    request_data = {
+        "year": 2024,
+        "month": 2,
+        "timezone": "Asia/Kolkata",
+        "latitude": 28.6139,
+        "longitude": 77.2090
+    }
+    
+    def test_month_etag_and_not_modified(self, monkeypatch):
+        """Test a matching If-None-Match returns 304 without recalculating"""
+        response = client.post("/panchanga/month", json=self.request_data)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert etag.startswith('"')
+        # Past months never change
+        assert "immutable" in response.headers["cache-control"]
+        
+        month_response_cache.clear()
+        monkeypatch.setattr(main, "compute_panchanga_month", lambda request: pytest.fail("recalculated"))
+        revalidated = client.post("/panchanga/month", json=self.request_data, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+        assert revalidated.content == b""
+    
+    def test_etag_is_content_hash(self):
+        """Test recomputed responses keep the same ETag and stale tags get a full body"""
+        first = client.post("/positions/month", json=self.request_data)
+        month_response_cache.clear()
+        second = client.post("/positions/month", json=self.request_data, headers={"If-None-Match": '"stale"'})
+        assert second.status_code == 200
+        assert second.headers["etag"] == first.headers["etag"]
+        assert second.json() == first.json()
+    
+    def test_current_month_is_not_immutable(self):
+        """Test ranges that are not over yet get the default max-age"""
+        today = date.today()
+        response = client.post("/panchanga/month", json={**self.request_data, "year": today.year, "month": today.month})
+        assert response.status_code == 200
+        assert "immutable" not in response.headers["cache-control"]
+        assert "max-age=" in response.headers["cache-control"]
+    
+    def test_navatara_not_modified(self):
+        """Test navatara responses support revalidation"""
+        request_data = {"startNakshatraIndex": 5, "includeMetadata": False}
+        response = client.post("/navatara/calculate", json=request_data)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        revalidated = client.post("/navatara/calculate", json=request_data, headers={"If-None-Match": f"W/{etag}"})
+        assert revalidated.status_code == 304
+    
+    def test_dataset_gzip(self):
+        """Test datasets are served pre-gzipped when accepted"""
+        gzipped = client.get("/data/panchanga/recommendations", headers={"Accept-Encoding": "gzip"})
+        plain = client.get("/data/panchanga/recommendations", headers={"Accept-Encoding": "identity"})
+        assert gzipped.headers["content-encoding"] == "gzip"
+        assert "content-encoding" not in plain.headers
+        assert gzipped.json() == plain.json()
+        assert gzipped.headers["etag"] != plain.headers["etag"]
+        assert "Accept-Encoding" in gzipped.headers["vary"]
+    
+    def test_dataset_not_modified(self):
+        """Test /data endpoints carry ETags and answer revalidation with 304"""
+        response = client.get("/data/yogas")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        revalidated = client.get("/data/yogas", headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+
+class TestPersistentResultStore:
+    """Test month responses served from the on-disk result store"""
+    
+    def test_served_after_restart(self, tmp_path, monkeypatch):
+        """Test a cold process serves stored months without recalculating"""
+        store = ResultStore(str(tmp_path / "results.db"), version="test")
+        monkeypatch.setattr(main, "result_store", store)
+        month_response_cache.clear()
+        request_data = {
+            "year": 2023,
+            "month": 7,
+            "timezone": "Europe/Paris",
+            "latitude": 48.8566,
+            "longitude": 2.3522
+        }
+        first = client.post("/panchanga/month", json=request_data)
+        assert first.status_code == 200
+        
+        # Simulate a restart: in-process caches are empty
+        month_response_cache.clear()
+        etag_index.clear()
+        monkeypatch.setattr(main, "compute_panchanga_month", lambda request: pytest.fail("recalculated"))
+        second = client.post("/panchanga/month", json=request_data)
+        assert second.status_code == 200
+        assert second.content == first.content
+        
+        etag_index.clear()
+        revalidated = client.post("/panchanga/month", json=request_data, headers={"If-None-Match": first.headers["etag"]})
+        assert revalidated.status_code == 304
+        store.close()
+
+class TestStartupWarmup:
+    """Test the optional startup warm-up hook"""
+    
+    def test_warmup_on_startup(self, tmp_path, monkeypatch):
+        """Test popular months are cached before the app serves requests"""
+        cities = tmp_path / "cities.json"
+        cities.write_text(json.dumps({"Delhi": {"lat": 28.6139, "lon": 77.2090, "tz": "Asia/Kolkata"}}))
+        monkeypatch.setenv("WARMUP_ON_STARTUP", "1")
+        monkeypatch.setenv("WARMUP_MONTHS", "1")
+        monkeypatch.setenv("WARMUP_CITIES_FILE", str(cities))
+        month_response_cache.clear()
+        
+        today = date.today()
+        with TestClient(app) as warmed_client:
+            assert len(month_response_cache) == 2
+            response = warmed_client.post("/panchanga/month", json={
+                "year": today.year,
+                "month": today.month,
+                "timezone": "Asia/Kolkata",
+                "latitude": 28.6139,
+                "longitude": 77.2090
+            })
+            assert response.status_code == 200
+            assert month_response_cache.stats()["hits"] == 1
+
+class TestPanchangaBatchEndpoint:
+    """Test POST /panchanga/batch endpoint"""
+    
+    locations = [
+        {"id": "delhi", "timezone": "Asia/Kolkata", "latitude": 28.6139, "longitude": 77.2090},
+        {"id": "la", "timezone": "America/Los_Angeles", "latitude": 34.0522, "longitude": -118.2437},
+        {"timezone": "Asia/Tokyo", "latitude": 35.6762, "longitude": 139.6503}
+    ]
+    
+    def test_batch_matches_month_endpoint(self):
+        """Test each location gets the same days as a single month request"""
+        response = client.post("/panchanga/batch", json={
+            "startDate": "2024-03-01",
+            "endDate": "2024-03-31",
+            "locations": self.locations
+        })
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [r["location"]["id"] for r in results] == ["delhi", "la", None]
+        for location, result in zip(self.locations, results):
+            month = client.post("/panchanga/month", json={
+                "year": 2024,
+                "month": 3,
+                "timezone": location["timezone"],
+                "latitude": location["latitude"],
+                "longitude": location["longitude"]
+            }).json()
+            assert result["days"] == month["days"]
+    
+    def test_batch_date_range(self):
+        """Test arbitrary inclusive date ranges"""
+        response = client.post("/panchanga/batch", json={
+            "startDate": "2024-12-30",
+            "endDate": "2025-01-02",
+            "locations": self.locations[:1]
+        })
+        assert response.status_code == 200
+        days = response.json()["results"][0]["days"]
+        assert [day["date"] for day in days] == ["2024-12-30", "2024-12-31", "2025-01-01", "2025-01-02"]
+    
+    def test_batch_invalid_requests(self):
+        """Test reversed ranges, oversized ranges and empty location lists"""
+        reversed_range = client.post("/panchanga/batch", json={
+            "startDate": "2024-02-01", "endDate": "2024-01-01", "locations": self.locations
+        })
+        assert reversed_range.status_code == 400
+        
+        too_long = client.post("/panchanga/batch", json={
+            "startDate": "2024-01-01", "endDate": "2025-06-01", "locations": self.locations
+        })
+        assert too_long.status_code == 400
+        
+        no_locations = client.post("/panchanga/batch", json={
+            "startDate": "2024-01-01", "endDate": "2024-01-31", "locations": []
+        })
+        assert no_locations.status_code == 422
+
+class TestMuhurtaSearchEndpoint:
+    """Test POST /muhurta/search endpoint"""
+    
+    location = {"timezone": "Asia/Kolkata", "latitude": 28.6139, "longitude": 77.2090}
+    
+    def month_days(self):
+        response = client.post("/panchanga/month", json={"year": 2024, "month": 3, **self.location})
+        return response.json()["days"]
+    
+    def search(self, **constraints):
+        return client.post("/muhurta/search", json={
+            "startDate": "2024-03-01", "endDate": "2024-03-31", **self.location, **constraints
+        })
+    
+    def test_matches_month_panchanga(self):
+        """Test search results agree with /panchanga/month"""
+        days = self.month_days()
+        
+        response = self.search(vara=["Thursday"])
+        assert response.status_code == 200
+        assert response.json()["dates"] == [d["date"] for d in days if d["vara"] == "Thursday"]
+        
+        response = self.search(tithiGroup=["Purna"], nakshatra=[8, "Hasta"])
+        expected = [d["date"] for d in days
+                    if d["tithi"]["group"] == "Purna" and d["nakshatra"]["nameIAST"] in ("Puṣya", "Hasta")]
+        assert response.json()["dates"] == expected
+        assert response.json()["count"] == len(expected)
+    
+    def test_rule_and_element_constraints(self):
+        """Test named rules, yoga, karana and tithi constraints"""
+        days = self.month_days()
+        rule = days[0]["specialYogas"][0]["name"] if days[0]["specialYogas"] else "Amrita Yoga"
+        response = self.search(rules=[rule])
+        assert response.json()["dates"] == [
+            d["date"] for d in days if rule in [s["name"] for s in d["specialYogas"]]
+        ]
+        
+        first = days[0]
+        response = self.search(yoga=[first["yoga"]], karana=[first["karana"]], tithi=[first["tithi"]["code"]])
+        assert first["date"] in response.json()["dates"]
+    
+    def test_multi_year_range_and_limit(self):
+        """Test long ranges and the result limit"""
+        response = client.post("/muhurta/search", json={
+            "startDate": "2024-01-01", "endDate": "2026-12-31", **self.location,
+            "vara": ["Sunday"], "limit": 3
+        })
+        assert response.status_code == 200
+        assert response.json()["dates"] == ["2024-01-07", "2024-01-14", "2024-01-21"]
+    
+    def test_edited_yoga_rules_rebuild_timelines(self, tmp_path, monkeypatch):
+        """Test rules added to the rules file are searchable at once"""
+        rules_path = tmp_path / "yogas.rules.json"
+        def write_rules(name, mtime):
+            rules_path.write_text(json.dumps([{"name": name, "polarity": "auspicious", "rule": "nakshatraIndex >= 1", "explain": "test"}]))
+            os.utime(rules_path, ns=(mtime, mtime))
+        write_rules("Old Yoga", 1_000_000_000)
+        monkeypatch.setattr(main, "yoga_rules_dataset", StaticDataset(str(rules_path), [], check_interval=0))
+        assert self.search(rules=["Old Yoga"]).json()["count"] == 31
+        
+        write_rules("New Yoga", 2_000_000_000)
+        assert self.search(rules=["New Yoga"]).json()["count"] == 31
+        assert self.search(rules=["Old Yoga"]).status_code == 400
+    
+    def test_invalid_constraints(self):
+        """Test unknown names, out-of-range indexes and reversed ranges"""
+        assert self.search(vara=["Funday"]).status_code == 400
+        assert self.search(nakshatra=[28]).status_code == 400
+        assert self.search(rules=["No Such Yoga"]).status_code == 400
+        response = client.post("/muhurta/search", json={
+            "startDate": "2024-03-31", "endDate": "2024-03-01", **self.location
+        })
+        assert response.status_code == 400
+
+class TestRemoteAPIClient:
+    """Test endpoints that call the remote API through the shared client"""
+    
+    def use_remote(self, monkeypatch, handler):
+        remote = main.RemoteClient("https://remote.test", retry_delays=(0.01,),
+                                   transport=httpx.MockTransport(handler))
+        monkeypatch.setattr(main, "REMOTE_API_BASE_URL", "https://remote.test")
+        monkeypatch.setattr(main, "remote_client", remote)
+        monkeypatch.setattr(main, "remote_response_cache", StaleWhileRevalidateCache(16, ttl=60, stale_ttl=60))
+        return remote
+    
+    def test_proxy_uses_remote_client(self, monkeypatch):
+        """Test the yogas proxy forwards its query to the remote API"""
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"yogas": ["Siddha"]})
+        
+        self.use_remote(monkeypatch, handler)
+        response = client.get("/proxy/panchanga/yogas/detect?date=2024-01-15&latitude=48.85&longitude=2.35")
+        assert response.status_code == 200
+        assert response.json() == {"yogas": ["Siddha"]}
+        assert seen[0].url.path == "/v1/panchanga/yogas/detect"
+        assert seen[0].url.params["date"] == "2024-01-15"
+    
+    def test_remote_responses_are_cached(self, monkeypatch):
+        """Test a repeated deterministic remote GET is answered from the response cache"""
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"yogas": []})
+        
+        self.use_remote(monkeypatch, handler)
+        url = "/proxy/panchanga/yogas/detect?date=2024-01-15&latitude=48.85&longitude=2.35"
+        assert client.get(url).json() == client.get(url).json() == {"yogas": []}
+        assert len(seen) == 1
+        assert client.get("/diagnostics/cache").json()["remoteResponses"]["freshHits"] == 1
+    
+    def test_month_falls_back_when_remote_fails(self, monkeypatch):
+        """Test a failing remote API is retried, then the month is calculated locally"""
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+        
+        self.use_remote(monkeypatch, handler)
+        response = client.post("/panchanga/month", json={
+            "year": 2024, "month": 1, "latitude": 48.85, "longitude": 2.35, "timezone": "Europe/Paris"
+        })
+        assert response.status_code == 200
+        assert len(response.json()["days"]) == 31
+        # Every day was tried (with one retry) before falling back
+        assert len(calls) == 31 * 2
+    
+    def test_positions_month_from_remote(self, monkeypatch):
+        """Test a successful remote ephemeris response is transformed and returned"""
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={
+                "timestamp": "2024-01-01T12:00:00Z",
+                "planets": {
+                    "Sun": {"nakshatra": {"number": 19, "name": "Mūla", "pada": 3}, "rasi": {"name": "Dhanu"}},
+                    "Moon": {"nakshatra": {"number": 5, "name": "Mṛgaśīrṣa", "pada": 1}, "rasi": {"name": "Vṛṣabha"}}
+                }
+            })
+        
+        self.use_remote(monkeypatch, handler)
+        response = client.post("/positions/month", json={
+            "year": 2024, "month": 1, "latitude": 48.85, "longitude": 2.35, "timezone": "Europe/Paris"
+        })
+        assert response.status_code == 200
+        assert seen[0].url.path == "/v1/ephemeris/planets"
+        planets = {planet["name"]: planet for planet in response.json()["planets"]}
+        assert set(planets) == {"Sun", "Moon"}
+        assert planets["Sun"]["days"][0]["date"] == "2024-01-01"
+        assert planets["Sun"]["days"][0]["nakshatra"] == {"index": 19, "nameIAST": "Mūla", "pada": 3}
+        assert planets["Moon"]["days"][0]["signSidereal"] == "Vṛṣabha"
+    
+    def remote_day(self, request):
+        day = int(request.url.params["date"][-2:])
+        if day == 15:
+            return httpx.Response(500)
+        return httpx.Response(200, json={
+            "date": request.url.params["date"],
+            "sunrise_time": "07:10:00",
+            "sunset_time": "17:40:00",
+            "panchanga": {
+                "tithi": {"number": day, "name": "x"},
+                "vara": {"name": "Monday"},
+                "nakshatra": {"number": 10, "name": "Magha", "pada": 2},
+                "yoga": {"name": "Siddha"},
+                "karana": {"name": "Bava"}
+            }
+        })
+    
+    def test_remote_month_fans_out_per_day(self, monkeypatch):
+        """Test every day is fetched remotely and failed days are filled locally"""
+        seen = []
+        def handler(request):
+            seen.append(request.url.params["date"])
+            return self.remote_day(request)
+        
+        self.use_remote(monkeypatch, handler)
+        request_data = {
+            "year": 2024, "month": 1, "latitude": 28.6139, "longitude": 77.2090, "timezone": "Asia/Kolkata"
+        }
+        response = client.post("/panchanga/month", json=request_data)
+        assert response.status_code == 200
+        days = response.json()["days"]
+        assert [day["date"] for day in days] == [f"2024-01-{d:02d}" for d in range(1, 32)]
+        assert len(set(seen)) == 31
+        
+        remote = days[0]
+        assert remote["sunriseISO"] == "2024-01-01T07:10:00+05:30"
+        assert remote["tithi"] == {"code": "Pratipada", "group": "Nanda"}
+        assert remote["nakshatra"] == {"index": 10, "nameIAST": "Maghā", "pada": 2}
+        assert remote["yoga"] == "Siddha"
+        assert remote["intervals"] is None
+        
+        # Day 15 failed remotely and comes from the local calculation
+        local = main.compute_panchanga_month(main.normalize_month_request(main.PanchangaMonthRequest(**request_data)))
+        assert days[14] == local.days[14].model_dump(mode="json")
+    
+    def test_remote_month_revalidation(self, monkeypatch):
+        """Test a month served from the remote API is revalidated with a 304"""
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return self.remote_day(request)
+        
+        self.use_remote(monkeypatch, handler)
+        request_data = {
+            "year": 2023, "month": 2, "latitude": 19.076, "longitude": 72.8777, "timezone": "Asia/Kolkata"
+        }
+        first = client.post("/panchanga/month", json=request_data)
+        assert first.status_code == 200
+        calls = len(seen)
+        
+        second = client.post("/panchanga/month", json=request_data, headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+        assert second.headers["ETag"] == first.headers["ETag"]
+        # Answered from the ETag index, without calling the remote API again
+        assert len(seen) == calls
+    
+    def test_open_circuit_goes_straight_to_local(self, monkeypatch):
+        """Test an open breaker skips the remote API and shows in /diagnostics/ping"""
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+        
+        remote = self.use_remote(monkeypatch, handler)
+        remote.breaker = CircuitBreaker(window=1, min_calls=1, open_seconds=60)
+        remote.breaker.record(False, 0.1)
+        response = client.post("/positions/month", json={
+            "year": 2024, "month": 1, "latitude": 28.6139, "longitude": 77.2090, "timezone": "Asia/Kolkata"
+        })
+        assert response.status_code == 200
+        assert calls == []
+        
+        response = client.get("/diagnostics/ping")
+        assert response.status_code == 200
+        circuit = response.json()["remote"]["circuit"]
+        assert circuit["state"] == "open"
+        assert circuit["rejected"] >= 1
+    
+    def test_ping_returns_latest_probe_snapshot(self, monkeypatch):
+        """Test /diagnostics/ping reports the background probes without calling the remote"""
+        calls = []
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200 if request.url.path == "/health/healthz" else 404)
+        
+        self.use_remote(monkeypatch, handler)
+        monitor = main.HealthMonitor(main.check_remote_endpoint, main.REMOTE_HEALTH_ENDPOINTS)
+        monkeypatch.setattr(main, "health_monitor", monitor)
+        
+        remote = client.get("/diagnostics/ping").json()["remote"]
+        assert remote["ok"] is False
+        assert remote["error"] == "No health probe has completed yet"
+        assert calls == []
+        
+        asyncio.run(monitor.probe_once())
+        assert sorted(calls) == sorted(main.REMOTE_HEALTH_ENDPOINTS)
+        remote = client.get("/diagnostics/ping").json()["remote"]
+        assert remote["ok"] is True
+        assert remote["checkedAt"] is not None
+        assert remote["endpoints"]["/health/healthz"]["samples"] == 1
+        assert remote["endpoints"]["/v1/ephemeris/planets"]["status"] == 404
+        assert len(calls) == 3
+
+class TestMetricsEndpoint:
+    """Test GET /metrics"""
+    
+    def test_metrics_exposition(self):
+        """Test route latency, calc_ut, cache and executor metrics are exposed as text"""
+        month_response_cache.clear()
+        client.post("/panchanga/month", json={
+            "year": 2024, "month": 3, "latitude": 28.6139, "longitude": 77.2090, "timezone": "Asia/Kolkata"
+        })
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert 'jyotish_http_request_duration_seconds_count{method="POST",route="/panchanga/month",status="200"}' in text
+        assert "jyotish_swe_calc_ut_calls_total " in text
+        assert 'jyotish_cache_misses_total{cache="monthResponses"} 1' in text
+        assert 'jyotish_cache_hit_ratio{cache="monthResponses"} 0' in text
+        assert "jyotish_executor_queue_depth 0" in text
 
 class TestNavataraCalculateEndpoint:
     """Test POST /navatara/calculate endpoint"""
@@ -365,6 +1077,17 @@ class TestLegacyEndpoints:
         assert "yoga" in data
         assert "karana" in data
     
+    def test_legacy_panchanga_yoga_is_sidereal(self):
+        """Test the legacy yoga uses sidereal longitudes like /panchanga/month"""
+        jd = main.julian_day("2024-01-01")
+        sun = main.get_planet_position(main.swe.SUN, jd)["longitude"]
+        moon = main.get_planet_position(main.swe.MOON, jd)["longitude"]
+        ayanamsa = main.get_ayanamsa_provider().at(jd)
+        
+        yoga = client.get("/panchanga?date=2024-01-01&lat=28.6139&lon=77.2090").json()["yoga"]
+        assert yoga == main.get_yoga(sun - ayanamsa, moon - ayanamsa)
+        assert yoga != main.get_yoga(sun, moon)
+    
     def test_legacy_navatara_endpoint(self):
         """Test legacy GET /navatara/calculate endpoint"""
         response = client.get("/navatara/calculate?date=2024-01-01&lat=28.6139&lon=77.2090&birth_nakshatra=Aśvinī")
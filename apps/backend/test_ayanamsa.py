@@ -0,0 +1,62 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import swisseph as swe
+from ayanamsa import AyanamsaProvider, resolve_sidereal_mode, TABLE_START_JD, TABLE_END_JD
+
+class TestResolveSiderealMode:
+    """Test SIDEREAL_AYANAMSHA name resolution"""
+    
+    def test_default_alias(self):
+        """Test the documented default maps to True Citra"""
+        assert resolve_sidereal_mode("TRUE_CHITRA_PAKSHA_LAHIRI") == swe.SIDM_TRUE_CITRA
+    
+    def test_swisseph_names(self):
+        """Test plain SIDM_* suffixes are accepted"""
+        assert resolve_sidereal_mode("lahiri") == swe.SIDM_LAHIRI
+        assert resolve_sidereal_mode("RAMAN") == swe.SIDM_RAMAN
+    
+    def test_unknown_name(self):
+        """Test unknown names are rejected"""
+        with pytest.raises(ValueError):
+            resolve_sidereal_mode("NOT_AN_AYANAMSA")
+
+class TestAyanamsaProvider:
+    """Test interpolated ayanamsa lookups"""
+    
+    provider = AyanamsaProvider(swe.SIDM_TRUE_CITRA)
+    
+    def exact(self, jd):
+        swe.set_sid_mode(swe.SIDM_TRUE_CITRA)
+        return swe.get_ayanamsa_ut(jd)
+    
+    def test_scalar_matches_swisseph(self):
+        """Test scalar lookups stay within 0.5 arcsec of swisseph"""
+        for jd in np.linspace(TABLE_START_JD + 1, TABLE_END_JD - 1, 50):
+            assert self.provider.at(jd) == pytest.approx(self.exact(jd), abs=0.5 / 3600)
+    
+    def test_vector_matches_scalar(self):
+        """Test at_many agrees with at"""
+        jds = np.linspace(2451545.0, 2460000.0, 25)
+        expected = [self.provider.at(jd) for jd in jds]
+        assert self.provider.at_many(jds) == pytest.approx(expected, abs=1e-9)
+    
+    def test_value_changes_with_date(self):
+        """Test ayanamsa is per-date, not a fixed epoch value"""
+        assert self.provider.at(2488000.0) - self.provider.at(2415100.0) > 2.5
+    
+    def test_out_of_range_falls_back(self):
+        """Test dates outside the table use swisseph directly"""
+        jd = TABLE_START_JD - 3650
+        assert self.provider.at(jd) == pytest.approx(self.exact(jd))
+        assert self.provider.at_many(np.array([jd]))[0] == pytest.approx(self.exact(jd))
+    
+    def test_concurrent_first_use(self):
+        """Test threads racing to build the table all interpolate on the full grid"""
+        provider = AyanamsaProvider(swe.SIDM_TRUE_CITRA)
+        jds = np.linspace(2451545.0, 2460000.0, 25)
+        expected = self.provider.at_many(jds)
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(lambda _: provider.at_many(jds), range(16)))
+        for result in results:
+            assert result == pytest.approx(expected, abs=1e-9)
@@ -0,0 +1,30 @@
+from batch import run_panchanga_batch
+from main import PanchangaMonthRequest, compute_panchanga_month
+
+class TestPanchangaBatch:
+    """Test process-pool batch generation"""
+    
+    def test_results_in_submission_order(self):
+        """Test results match the single-request calculation, in order"""
+        requests = [
+            {"year": 2024, "month": 2, "timezone": "Asia/Kolkata", "latitude": 19.076, "longitude": 72.8777},
+            PanchangaMonthRequest(year=2024, month=1, timezone="Europe/Paris", latitude=48.8566, longitude=2.3522),
+        ]
+        results = run_panchanga_batch(requests, workers=2)
+        
+        assert [r["request"]["month"] for r in results] == [2, 1]
+        assert all(r["error"] is None for r in results)
+        expected = compute_panchanga_month(requests[1]).model_dump(mode="json")
+        assert results[1]["response"] == expected
+    
+    def test_failures_do_not_abort_batch(self):
+        """Test an invalid request reports an error and the rest still run"""
+        requests = [
+            {"year": 2024, "month": 1, "timezone": "Not/AZone", "latitude": 0.0, "longitude": 0.0},
+            {"year": 2024, "month": 1, "timezone": "UTC", "latitude": 0.0, "longitude": 0.0},
+        ]
+        results = run_panchanga_batch(requests, workers=1)
+        
+        assert results[0]["response"] is None
+        assert results[0]["error"]
+        assert len(results[1]["response"]["days"]) == 31
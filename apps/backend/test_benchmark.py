@@ -0,0 +1,40 @@
+import pytest
+import main
+from benchmark import compare, load_results, run_benchmarks, save_results
+
+def results(**medians):
+    return {"benchmarks": {name: {"median": median} for name, median in medians.items()}}
+
+class TestBenchmarkComparison:
+    """Test regression detection against a baseline"""
+    
+    def test_regression_beyond_threshold(self):
+        """Test only slowdowns beyond the threshold count as regressions"""
+        rows = compare(results(a=1.0, b=1.0, c=1.0), results(a=1.2, b=1.3, c=0.5), threshold=0.25)
+        assert [(row.name, row.regressed) for row in rows] == [("a", False), ("b", True), ("c", False)]
+        assert rows[1].change == pytest.approx(0.3)
+    
+    def test_new_benchmarks_are_not_regressions(self):
+        """Test benchmarks missing from the baseline are reported without failing"""
+        [row] = compare(results(), results(new=2.0))
+        assert row.baseline is None and not row.regressed
+
+class TestBenchmarkRun:
+    """Test running the suite"""
+    
+    def test_run_and_round_trip(self, tmp_path):
+        """Test selected benchmarks run, restore the app state and survive a save/load"""
+        remote, store = main.REMOTE_API_BASE_URL, main.result_store
+        run = run_benchmarks(["get_tithi", "positions_month"], rounds=1, min_time=0)
+        assert set(run["benchmarks"]) == {"get_tithi", "positions_month"}
+        assert all(result["median"] > 0 for result in run["benchmarks"].values())
+        assert (main.REMOTE_API_BASE_URL, main.result_store) == (remote, store)
+        assert len(main.month_response_cache) == 0
+        path = tmp_path / "baseline.json"
+        save_results(run, path)
+        assert not any(row.regressed for row in compare(load_results(path), run))
+    
+    def test_unknown_benchmark(self):
+        """Test asking for an unknown benchmark fails"""
+        with pytest.raises(ValueError):
+            run_benchmarks(["nope"])
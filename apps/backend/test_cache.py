@@ -0,0 +1,68 @@
+import pytest
+from cache import LRUCache
+
+class TestLRUCache:
+    """Test the size-bounded LRU cache"""
+    
+    def test_get_and_set(self):
+        """Test stored values are returned and misses give the default"""
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("b", 0) == 0
+    
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used key is evicted first"""
+        cache = LRUCache(2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert len(cache) == 2
+    
+    def test_stats(self):
+        """Test hit/miss counters"""
+        cache = LRUCache(4)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("a")
+        cache.get("missing")
+        stats = cache.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+        assert stats["hitRate"] == pytest.approx(2 / 3, abs=1e-4)
+        assert stats["size"] == 1
+    
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after the TTL and count as misses"""
+        now = [1000.0]
+        monkeypatch.setattr("cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(4, ttl=60)
+        cache.set("a", 1)
+        now[0] += 59
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert "a" not in cache
+        assert cache.get("a") is None
+        stats = cache.stats()
+        assert stats["expirations"] == 1
+        assert stats["misses"] == 1
+        assert stats["size"] == 0
+    
+    def test_eviction_counter(self):
+        """Test LRU evictions are counted"""
+        cache = LRUCache(1)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.stats()["evictions"] == 1
+    
+    def test_invalid_size(self):
+        """Test a cache must hold at least one entry"""
+        with pytest.raises(ValueError):
+            LRUCache(0)
+        with pytest.raises(ValueError):
+            LRUCache(1, ttl=0)
@@ -0,0 +1,97 @@
+import pytest
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_breaker(**kwargs):
+    clock = FakeClock()
+    options = dict(window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=1.0,
+                   slow_call_rate=0.75, open_seconds=10.0, clock=clock)
+    options.update(kwargs)
+    return CircuitBreaker(**options), clock
+
+def call(breaker, ok, duration=0.1):
+    assert breaker.allow()
+    breaker.record(ok, duration)
+
+class TestCircuitBreaker:
+    """Test failure-rate and latency tripping and half-open probing"""
+
+    def test_opens_on_failure_rate(self):
+        """Test the circuit opens once failures reach the threshold over a full window"""
+        breaker, _ = make_breaker()
+        call(breaker, True)
+        call(breaker, False)
+        call(breaker, True)
+        assert breaker.state == CLOSED
+        call(breaker, False)
+        assert breaker.state == OPEN
+        assert "failure rate 50%" in breaker.last_reason
+
+    def test_needs_min_calls(self):
+        """Test a few early failures do not trip the circuit"""
+        breaker, _ = make_breaker()
+        for _ in range(3):
+            call(breaker, False)
+        assert breaker.state == CLOSED
+
+    def test_opens_on_slow_calls(self):
+        """Test successful but slow calls trip the circuit too"""
+        breaker, _ = make_breaker()
+        call(breaker, True, 0.1)
+        for _ in range(3):
+            call(breaker, True, 2.0)
+        assert breaker.state == OPEN
+        assert "slower than 1s" in breaker.last_reason
+
+    def test_rejects_while_open(self):
+        """Test calls are refused until the open period ends"""
+        breaker, clock = make_breaker()
+        for _ in range(4):
+            call(breaker, False)
+        clock.now = 9.9
+        assert not breaker.allow()
+        assert breaker.snapshot()["rejected"] == 1
+        assert breaker.snapshot()["retryInSeconds"] == pytest.approx(0.1)
+
+    def test_half_open_probe_closes(self):
+        """Test one successful probe after the open period closes the circuit"""
+        breaker, clock = make_breaker()
+        for _ in range(4):
+            call(breaker, False)
+        clock.now = 10.0
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        assert not breaker.allow()  # only one probe at a time
+        breaker.record(True, 0.1)
+        assert breaker.state == CLOSED
+        assert breaker.snapshot()["calls"] == 0
+
+    @pytest.mark.parametrize("ok, duration", [(False, 0.1), (True, 5.0)])
+    def test_half_open_probe_reopens(self, ok, duration):
+        """Test a failed or slow probe reopens the circuit for another period"""
+        breaker, clock = make_breaker()
+        for _ in range(4):
+            call(breaker, False)
+        clock.now = 10.0
+        call(breaker, ok, duration)
+        assert breaker.state == OPEN
+        assert breaker.times_opened == 2
+        clock.now = 15.0
+        assert not breaker.allow()
+
+    def test_abandoned_probe_frees_its_slot(self):
+        """Test a cancelled probe lets the next call probe instead"""
+        breaker, clock = make_breaker()
+        for _ in range(4):
+            call(breaker, False)
+        clock.now = 10.0
+        assert breaker.allow()
+        breaker.record(None, 0.0)
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow()
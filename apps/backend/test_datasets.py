@@ -0,0 +1,65 @@
+import gzip
+import json
+import os
+from datasets import StaticDataset
+from http_cache import compute_etag
+
+class TestStaticDataset:
+    """Test in-memory static datasets"""
+    
+    def test_loads_once(self, tmp_path):
+        """Test the file is parsed once and served with encoded bytes"""
+        path = tmp_path / "rules.json"
+        path.write_text(json.dumps([{"name": "Siddha"}]))
+        dataset = StaticDataset(str(path), [], check_interval=0)
+        
+        for _ in range(3):
+            snapshot = dataset.snapshot()
+        assert dataset.loads == 1
+        assert snapshot.data == [{"name": "Siddha"}]
+        assert json.loads(snapshot.body) == snapshot.data
+        assert gzip.decompress(snapshot.gzip_body) == snapshot.body
+        assert snapshot.etag == compute_etag(snapshot.body)
+        assert snapshot.gzip_etag != snapshot.etag
+    
+    def test_reloads_when_modified(self, tmp_path):
+        """Test a changed mtime triggers a reload"""
+        path = tmp_path / "rules.json"
+        path.write_text("[1]")
+        dataset = StaticDataset(str(path), [], check_interval=0)
+        first = dataset.snapshot()
+        
+        path.write_text("[1, 2]")
+        os.utime(path, ns=(first.mtime_ns + 10**9, first.mtime_ns + 10**9))
+        assert dataset.data == [1, 2]
+        assert dataset.loads == 2
+        assert dataset.snapshot().etag != first.etag
+    
+    def test_check_interval(self, tmp_path):
+        """Test the mtime is not re-checked within the interval"""
+        path = tmp_path / "rules.json"
+        path.write_text("[1]")
+        dataset = StaticDataset(str(path), [], check_interval=3600)
+        dataset.snapshot()
+        path.write_text("[1, 2]")
+        os.utime(path, ns=(10**18, 10**18))
+        assert dataset.data == [1]
+    
+    def test_derived(self, tmp_path):
+        """Test derived values are rebuilt only after a reload"""
+        path = tmp_path / "rules.json"
+        path.write_text("[1, 2]")
+        dataset = StaticDataset(str(path), [], check_interval=0)
+        first = dataset.derived(tuple)
+        assert first == (1, 2)
+        assert dataset.derived(tuple) is first
+        
+        path.write_text("[3]")
+        os.utime(path, ns=(10**18, 10**18))
+        assert dataset.derived(tuple) == (3,)
+    
+    def test_missing_file(self, tmp_path):
+        """Test a missing file serves the default"""
+        dataset = StaticDataset(str(tmp_path / "missing.json"), {})
+        assert dataset.data == {}
+        assert dataset.snapshot().body == b"{}"
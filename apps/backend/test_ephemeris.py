@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from ephemeris import compute_positions_batch, julian_days, nakshatra_indices
+from main import (
+    PLANETS, get_planet_position, get_nakshatra, get_sidereal_sign,
+    get_month_dates, julian_day, SIGNS_SIDEREAL
+)
+
+class TestJulianDays:
+    """Test Julian day vector construction"""
+    
+    def test_matches_scalar_julian_day(self):
+        """Test julian_days matches julian_day at noon"""
+        dates = get_month_dates(2024, 2)
+        jds = julian_days(dates)
+        assert jds.shape == (29,)
+        for date_str, jd in zip(dates, jds):
+            assert jd == pytest.approx(julian_day(date_str))
+
+class TestNakshatraIndices:
+    """Test vectorized nakshatra/pada/sign derivation"""
+    
+    def test_boundaries(self):
+        """Test indices at and around segment boundaries"""
+        sidereal = np.array([0.0, 3.34, 13.34, 29.99, 31.0, 359.99])
+        result = nakshatra_indices(sidereal)
+        assert result["nakshatra_index"].tolist() == [1, 1, 2, 3, 3, 27]
+        assert result["pada"].tolist() == [1, 2, 1, 1, 2, 4]
+        assert result["sign_index"].tolist() == [0, 0, 0, 0, 1, 11]
+
+class TestComputePositionsBatch:
+    """Test the batch engine against the scalar helpers"""
+    
+    def test_shapes(self):
+        """Test arrays are shaped (planets, days)"""
+        jds = julian_days(get_month_dates(2024, 1))
+        batch = compute_positions_batch(jds, PLANETS)
+        for key in ("longitude", "latitude", "speed", "nakshatra_index", "pada", "sign_index"):
+            assert batch[key].shape == (9, 31)
+    
+    def test_matches_scalar_path(self):
+        """Test every cell matches get_planet_position + get_nakshatra"""
+        dates = get_month_dates(2024, 3)
+        batch = compute_positions_batch(julian_days(dates), PLANETS)
+        for row, (name, planet_id) in enumerate(PLANETS.items()):
+            for col, date_str in enumerate(dates):
+                jd = julian_day(date_str)
+                pos = get_planet_position(planet_id, jd)
+                longitude = pos["longitude"]
+                if name == "Ketu":
+                    longitude = (longitude + 180) % 360
+                nakshatra = get_nakshatra(longitude, jd)
+                assert batch["nakshatra_index"][row, col] == nakshatra["index"]
+                assert batch["pada"][row, col] == nakshatra["pada"]
+                assert SIGNS_SIDEREAL[batch["sign_index"][row, col]] == get_sidereal_sign(longitude, jd)
+                assert batch["speed"][row, col] == pytest.approx(pos["speed"])
+    
+    def test_ketu_opposite_rahu(self):
+        """Test Ketu is computed 180 degrees from Rahu"""
+        jds = julian_days(["2024-06-15"])
+        batch = compute_positions_batch(jds, {"Rahu": PLANETS["Rahu"], "Ketu": PLANETS["Ketu"]})
+        diff = (batch["longitude"][1, 0] - batch["longitude"][0, 0]) % 360
+        assert diff == pytest.approx(180.0)
+        assert batch["latitude"][1, 0] == pytest.approx(-batch["latitude"][0, 0])
@@ -0,0 +1,71 @@
+import asyncio
+import time
+import pytest
+import swisseph as swe
+from executor import ComputeExecutor
+
+def sun_longitude(jd):
+    return swe.calc_ut(jd, swe.SUN)[0][0]
+
+def raise_value_error():
+    raise ValueError("bad input")
+
+class TestComputeExecutor:
+    """Test the thread/process compute executor"""
+    
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_run_returns_result(self, mode):
+        """Test work dispatched to either pool returns the same result"""
+        executor = ComputeExecutor(mode, workers=2)
+        try:
+            result = asyncio.run(executor.run(sun_longitude, 2451545.0))
+        finally:
+            executor.shutdown()
+        assert result == pytest.approx(sun_longitude(2451545.0))
+    
+    def test_exceptions_propagate(self):
+        """Test exceptions raised in a worker reach the caller"""
+        executor = ComputeExecutor("thread", workers=1)
+        try:
+            with pytest.raises(ValueError, match="bad input"):
+                asyncio.run(executor.run(raise_value_error))
+        finally:
+            executor.shutdown()
+    
+    def test_queue_depth(self):
+        """Test jobs beyond the pool size are counted as queued while they wait"""
+        executor = ComputeExecutor("thread", workers=1)
+        seen = []
+        async def scenario():
+            jobs = [asyncio.ensure_future(executor.run(time.sleep, 0.02)) for _ in range(3)]
+            await asyncio.sleep(0)
+            seen.append((executor.in_flight, executor.queued))
+            await asyncio.gather(*jobs)
+            seen.append((executor.in_flight, executor.queued))
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        assert seen == [(3, 2), (0, 0)]
+    
+    def test_pool_is_lazy(self):
+        """Test the pool is only started on first use and recreated after shutdown"""
+        executor = ComputeExecutor("thread", workers=1)
+        assert executor._pool is None
+        pool = executor.pool
+        assert executor.pool is pool
+        executor.shutdown()
+        assert executor._pool is None
+    
+    def test_from_env(self, monkeypatch):
+        """Test mode and worker count come from the environment"""
+        monkeypatch.setenv("COMPUTE_EXECUTOR", "Process")
+        monkeypatch.setenv("COMPUTE_WORKERS", "3")
+        executor = ComputeExecutor.from_env()
+        assert executor.mode == "process"
+        assert executor.workers == 3
+    
+    def test_invalid_mode(self):
+        """Test unknown modes are rejected"""
+        with pytest.raises(ValueError):
+            ComputeExecutor("fiber")
@@ -0,0 +1,84 @@
+import asyncio
+from health_monitor import HealthMonitor, ProbeResult, percentile
+
+class TestPercentile:
+    """Test nearest-rank percentiles"""
+
+    def test_percentiles(self):
+        values = [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 100.0]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 95) == 100.0
+        assert percentile([5.0], 95) == 5.0
+        assert percentile([], 50) is None
+
+class TestHealthMonitor:
+    """Test background probing and rolling statistics"""
+
+    def test_probes_run_concurrently(self):
+        """Test one round takes about as long as the slowest probe, not their sum"""
+        async def check(endpoint):
+            await asyncio.sleep(0.05)
+            return ProbeResult(ok=True, status=200, latency_ms=50.0)
+
+        monitor = HealthMonitor(check, ["/a", "/b", "/c", "/d"])
+        async def timed():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await monitor.probe_once()
+            return loop.time() - start
+
+        assert asyncio.run(timed()) < 0.15
+        assert set(monitor.snapshot()["endpoints"]) == {"/a", "/b", "/c", "/d"}
+
+    def test_rolling_statistics(self):
+        """Test p50/p95 and error rate over the kept window"""
+        results = iter(
+            [ProbeResult(ok=True, status=200, latency_ms=float(ms)) for ms in (10, 20, 30, 40)]
+            + [ProbeResult(ok=False, error="timeout")]
+        )
+        async def check(endpoint):
+            return next(results)
+
+        monitor = HealthMonitor(check, ["/health/healthz"], window=4)
+        async def rounds():
+            for _ in range(5):
+                await monitor.probe_once()
+
+        asyncio.run(rounds())
+        status = monitor.snapshot()["endpoints"]["/health/healthz"]
+        assert status["ok"] is False
+        assert status["error"] == "timeout"
+        assert status["samples"] == 4
+        assert status["errorRate"] == 0.25
+        assert status["p50Ms"] == 30.0
+        assert status["p95Ms"] == 40.0
+
+    def test_check_exceptions_count_as_errors(self):
+        """Test a probe that raises is recorded as a failed probe"""
+        async def check(endpoint):
+            raise RuntimeError("boom")
+
+        monitor = HealthMonitor(check, ["/a"])
+        asyncio.run(monitor.probe_once())
+        assert monitor.snapshot()["endpoints"]["/a"]["error"] == "boom"
+
+    def test_background_task(self):
+        """Test start() keeps probing every interval until stop()"""
+        calls = []
+        async def check(endpoint):
+            calls.append(endpoint)
+            return ProbeResult(ok=True, status=200, latency_ms=1.0)
+
+        monitor = HealthMonitor(check, ["/a"], interval=0.01)
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.05)
+            await monitor.stop()
+            seen = len(calls)
+            await asyncio.sleep(0.03)
+            return seen
+
+        seen = asyncio.run(scenario())
+        assert seen >= 2
+        assert len(calls) == seen
+        assert monitor.snapshot()["checkedAt"] is not None
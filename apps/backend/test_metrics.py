@@ -0,0 +1,59 @@
+import asyncio
+import time
+from metrics import LoopLagMonitor, Registry
+
+class TestRegistry:
+    """Test the Prometheus text rendering"""
+
+    def test_counter(self):
+        """Test labelled counters render one sample per label set"""
+        registry = Registry()
+        calls = registry.counter("calls_total", "Calls", ("endpoint",))
+        calls.inc(endpoint="a")
+        calls.inc(2, endpoint="a")
+        calls.inc(endpoint='say "hi"')
+        text = registry.render()
+        assert "# HELP calls_total Calls\n# TYPE calls_total counter\n" in text
+        assert 'calls_total{endpoint="a"} 3\n' in text
+        assert 'calls_total{endpoint="say \\"hi\\""} 1\n' in text
+        assert calls.value(endpoint="a") == 3
+
+    def test_histogram(self):
+        """Test buckets are cumulative and include their upper bound"""
+        registry = Registry()
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            latency.observe(value)
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{le="0.1"} 2' in lines
+        assert 'latency_seconds_bucket{le="1"} 3' in lines
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in lines
+        assert "latency_seconds_sum 3.65" in lines
+        assert "latency_seconds_count 4" in lines
+
+    def test_callback_metrics_read_at_render(self):
+        """Test callback gauges reflect the value at scrape time and skip None"""
+        registry = Registry()
+        state = {"depth": 1}
+        registry.callback("queue_depth", "Depth", "gauge", lambda: [((), state["depth"])])
+        registry.callback("unknown", "Skipped", "gauge", lambda: [((), None)])
+        state["depth"] = 4
+        text = registry.render()
+        assert "queue_depth 4\n" in text
+        assert "unknown" not in text
+
+class TestLoopLagMonitor:
+    """Test event loop lag measurement"""
+
+    def test_measures_blocking(self):
+        """Test a blocked loop shows up as lag"""
+        monitor = LoopLagMonitor(interval=0.01)
+        async def scenario():
+            monitor.start()
+            await asyncio.sleep(0.02)
+            time.sleep(0.05)  # block the loop
+            await asyncio.sleep(0.02)
+            await monitor.stop()
+
+        asyncio.run(scenario())
+        assert monitor.last_lag is not None
@@ -0,0 +1,46 @@
+from muhurta import DayTimeline, search_timelines
+
+DATES = ["2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"]
+
+def make_timeline():
+    return DayTimeline(DATES, {
+        "vara": ["Monday", "Tuesday", "Wednesday", "Thursday"],
+        "nakshatra": [8, 8, 9, 8],
+        "rules": [("A",), (), ("A", "B"), ("B",)]
+    })
+
+class TestDayTimeline:
+    """Test the inverted-list day timeline"""
+    
+    def test_single_constraint(self):
+        """Test a constraint matches any of its values"""
+        timeline = make_timeline()
+        assert timeline.search({"vara": {"Monday", "Thursday"}}) == ["2024-01-01", "2024-01-04"]
+    
+    def test_intersection(self):
+        """Test constraints on several attributes must all hold"""
+        timeline = make_timeline()
+        assert timeline.search({"nakshatra": {8}, "rules": {"B"}}) == ["2024-01-04"]
+        assert timeline.search({"nakshatra": {9}, "vara": {"Monday"}}) == []
+    
+    def test_multi_valued_attribute(self):
+        """Test days are indexed under every value of a collection attribute"""
+        timeline = make_timeline()
+        assert timeline.search({"rules": {"A"}}) == ["2024-01-01", "2024-01-03"]
+    
+    def test_no_constraints_and_range(self):
+        """Test an empty constraint set matches every day within the range"""
+        timeline = make_timeline()
+        assert timeline.search({}, "2024-01-02", "2024-01-03") == ["2024-01-02", "2024-01-03"]
+        assert timeline.search({"vara": {"Friday"}}) == []
+    
+    def test_search_timelines_limit(self):
+        """Test results across timelines stay in order and honour the limit"""
+        first = make_timeline()
+        second = DayTimeline(["2025-01-01"], {"vara": ["Wednesday"], "nakshatra": [8], "rules": [()]})
+        assert search_timelines([first, second], {"nakshatra": {8}}, "2024-01-01", "2025-12-31") == [
+            "2024-01-01", "2024-01-02", "2024-01-04", "2025-01-01"
+        ]
+        assert search_timelines([first, second], {"nakshatra": {8}}, "2024-01-01", "2025-12-31", limit=2) == [
+            "2024-01-01", "2024-01-02"
+        ]
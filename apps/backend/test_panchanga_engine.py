@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import swisseph as swe
+from ayanamsa import get_ayanamsa_provider
+from panchanga_engine import SunMoonGrid, ELEMENTS
+
+START_JD = swe.julday(2024, 1, 1, 0.0)
+END_JD = START_JD + 31
+
+def element_index(element, jd):
+    sun = swe.calc_ut(jd, swe.SUN)[0][0]
+    moon = swe.calc_ut(jd, swe.MOON)[0][0]
+    ayanamsa = get_ayanamsa_provider().at(jd)
+    if element == "tithi":
+        return int(((moon - sun) % 360) // 12)
+    if element == "karana":
+        return int(((moon - sun) % 360) // 6)
+    if element == "yoga":
+        return int(((moon + sun - 2 * ayanamsa) % 360) // (360 / 27))
+    return int(((moon - ayanamsa) % 360) // (360 / 27))
+
+@pytest.fixture(scope="module")
+def grid():
+    return SunMoonGrid(START_JD, END_JD)
+
+class TestSpans:
+    """Test element spans computed from the shared grid"""
+    
+    def test_spans_cover_range(self, grid):
+        """Test spans are contiguous and cover the requested range"""
+        for element in ELEMENTS:
+            spans = grid.spans()[element]
+            assert spans[0]["start"] <= START_JD
+            assert spans[-1]["end"] >= END_JD
+            for previous, current in zip(spans, spans[1:]):
+                assert previous["end"] == current["start"]
+    
+    def test_span_counts(self, grid):
+        """Test a month holds about a lunar month of each element"""
+        spans = grid.spans()
+        assert 30 <= len(spans["tithi"]) <= 34
+        assert 60 <= len(spans["karana"]) <= 66
+        assert 30 <= len(spans["yoga"]) <= 35
+        assert 30 <= len(spans["nakshatra"]) <= 35
+    
+    def test_span_boundaries_are_exact(self, grid):
+        """Test the element index holds just inside both ends of each span"""
+        for element in ELEMENTS:
+            for span in grid.spans()[element][:8]:
+                assert element_index(element, span["start"] + 2e-5) == span["index"]
+                assert element_index(element, span["end"] - 2e-5) == span["index"]
+    
+    def test_spans_between(self, grid):
+        """Test selecting the spans overlapping one day"""
+        day_start = START_JD + 10
+        spans = grid.spans_between("tithi", day_start, day_start + 1)
+        assert 1 <= len(spans) <= 3
+        assert spans[0]["start"] <= day_start < spans[0]["end"]
+        assert spans[-1]["end"] >= day_start + 1
+
+class TestLongitudesAt:
+    """Test interpolated Sun/Moon longitudes"""
+    
+    def test_matches_swisseph(self, grid):
+        """Test interpolation stays within 0.1 arcsec of swisseph"""
+        jds = np.linspace(START_JD, END_JD, 40)
+        sun, moon = grid.longitudes_at(jds)
+        for jd, sun_long, moon_long in zip(jds, sun, moon):
+            assert (sun_long - swe.calc_ut(jd, swe.SUN)[0][0] + 180) % 360 - 180 == pytest.approx(0, abs=0.1 / 3600)
+            assert (moon_long - swe.calc_ut(jd, swe.MOON)[0][0] + 180) % 360 - 180 == pytest.approx(0, abs=0.1 / 3600)
@@ -0,0 +1,98 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+import main
+import profiling
+from main import month_response_cache
+from profiling import ProfilingMiddleware, RequestProfile, profiled_call
+
+MONTH = {"year": 2023, "month": 11, "latitude": 28.6139, "longitude": 77.2090, "timezone": "Asia/Kolkata"}
+
+@pytest.fixture
+def profiled_client(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILING_TOKEN", None)
+    month_response_cache.clear()
+    return TestClient(ProfilingMiddleware(main.app))
+
+class TestProfiling:
+    """Test the opt-in per-request profiler"""
+
+    def test_disabled_by_default(self):
+        """Test the middleware is not installed and no profile id is returned"""
+        assert not profiling.PROFILING_ENABLED
+        assert all(m.cls is not ProfilingMiddleware for m in main.app.user_middleware)
+        response = TestClient(main.app).post("/panchanga/month", json=MONTH, headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    def test_profiled_month_includes_calculation(self, profiled_client):
+        """Test the summary covers the calculation run in the compute executor"""
+        response = profiled_client.post("/panchanga/month", json=MONTH, headers={"X-Profile": "1"})
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+
+        summary = profiled_client.get(f"/diagnostics/profiles/{profile_id}").json()
+        assert summary["path"] == "/panchanga/month"
+        assert 0 < len(summary["functions"]) <= profiling.PROFILING_TOP_N
+        names = [entry["function"] for entry in summary["functions"]]
+        assert any("compute_panchanga_month" in name for name in names)
+        cumulative = [entry["cumulativeMs"] for entry in summary["functions"]]
+        assert cumulative == sorted(cumulative, reverse=True)
+
+    def test_only_when_asked(self, profiled_client):
+        """Test requests without the header, or to other routes, are not profiled"""
+        assert "x-profile-id" not in profiled_client.post("/panchanga/month", json=MONTH).headers
+        response = profiled_client.get("/healthz", headers={"X-Profile": "1"})
+        assert "x-profile-id" not in response.headers
+
+    def test_token(self, profiled_client, monkeypatch):
+        """Test a configured token must be sent as the header value"""
+        monkeypatch.setattr(profiling, "PROFILING_TOKEN", "s3cret")
+        request = {"startNakshatraIndex": 5}
+        assert "x-profile-id" not in profiled_client.post("/navatara/calculate", json=request, headers={"X-Profile": "1"}).headers
+        response = profiled_client.post("/navatara/calculate", json=request, headers={"X-Profile": "s3cret"})
+        assert response.status_code == 200
+        assert "x-profile-id" in response.headers
+
+    def test_concurrent_requests(self, profiled_client, monkeypatch):
+        """Test a request overlapping a profiled one is served unprofiled"""
+        calculate = main.compute_panchanga_month
+        def slow(request):
+            time.sleep(0.1)
+            return calculate(request)
+        monkeypatch.setattr(main, "compute_panchanga_month", slow)
+        app = ProfilingMiddleware(main.app)
+
+        async def overlapping():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+                return await asyncio.gather(*(
+                    async_client.post("/panchanga/month", json={**MONTH, "month": month}, headers={"X-Profile": "1"})
+                    for month in (1, 2)
+                ))
+
+        responses = asyncio.run(overlapping())
+        assert [response.status_code for response in responses] == [200, 200]
+        profile_ids = [response.headers["x-profile-id"] for response in responses if "x-profile-id" in response.headers]
+        assert len(profile_ids) == 1
+        summary = profiled_client.get(f"/diagnostics/profiles/{profile_ids[0]}").json()
+        assert any("compute_panchanga_month" in entry["function"] for entry in summary["functions"])
+        # The guard is released afterwards
+        assert "x-profile-id" in profiled_client.post("/panchanga/month", json=MONTH, headers={"X-Profile": "1"}).headers
+
+    def test_unknown_profile(self):
+        """Test unknown ids are 404"""
+        assert TestClient(main.app).get("/diagnostics/profiles/nope").status_code == 404
+
+    def test_profiled_call_and_merge(self):
+        """Test worker stats are returned with the result and merged by function"""
+        result, stats = profiled_call(lambda: sorted(range(100)))
+        assert result == list(range(100))
+        profile = RequestProfile("POST", "/positions/month")
+        profile.add(stats)
+        profile.add(stats)
+        key = next(iter(stats))
+        assert profile.stats[key][1] == 2 * stats[key][1]
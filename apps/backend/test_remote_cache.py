@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from remote_cache import StaleWhileRevalidateCache
+
+class Remote:
+    """Fetch function counting its calls"""
+
+    def __init__(self, fail=False):
+        self.calls = 0
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if self.fail:
+            raise RuntimeError("remote down")
+        return {"version": self.calls}
+
+async def settle():
+    # Let background refresh tasks run
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+class TestStaleWhileRevalidateCache:
+    """Test the remote response cache"""
+
+    def test_fresh_entries_are_not_refetched(self):
+        """Test a fresh entry is served without calling the remote"""
+        cache = StaleWhileRevalidateCache(8, ttl=60, stale_ttl=60)
+        remote = Remote()
+        async def scenario():
+            return [await cache.get("day", remote) for _ in range(3)]
+
+        assert asyncio.run(scenario()) == [{"version": 1}] * 3
+        assert remote.calls == 1
+        assert cache.stats()["freshHits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_stale_entry_served_then_refreshed(self):
+        """Test a stale entry is returned at once and replaced in the background"""
+        cache = StaleWhileRevalidateCache(8, ttl=0.01, stale_ttl=60)
+        remote = Remote()
+        async def scenario():
+            first = await cache.get("day", remote)
+            await asyncio.sleep(0.02)
+            stale = await cache.get("day", remote)
+            again = await cache.get("day", remote)  # refresh already running
+            await settle()
+            return first, stale, again, await cache.get("day", remote)
+
+        first, stale, again, refreshed = asyncio.run(scenario())
+        assert first == stale == again == {"version": 1}
+        assert refreshed == {"version": 2}
+        assert remote.calls == 2
+        assert cache.stats()["staleHits"] == 2
+        assert cache.stats()["refreshes"] == 1
+
+    def test_failed_refresh_keeps_stale_entry(self):
+        """Test the stale copy survives a failing background refresh"""
+        cache = StaleWhileRevalidateCache(8, ttl=0.01, stale_ttl=60)
+        async def scenario():
+            await cache.get("day", Remote())
+            await asyncio.sleep(0.02)
+            value = await cache.get("day", Remote(fail=True))
+            await settle()
+            return value, await cache.get("day", Remote(fail=True))
+
+        assert asyncio.run(scenario()) == ({"version": 1}, {"version": 1})
+        assert cache.stats()["refreshFailures"] >= 1
+
+    def test_entries_expire_after_stale_window(self):
+        """Test entries older than ttl + stale_ttl are fetched again in the request"""
+        cache = StaleWhileRevalidateCache(8, ttl=0.01, stale_ttl=0.01)
+        remote = Remote()
+        async def scenario():
+            await cache.get("day", remote)
+            await asyncio.sleep(0.03)
+            return await cache.get("day", remote)
+
+        assert asyncio.run(scenario()) == {"version": 2}
+        assert cache.stats()["misses"] == 2
+
+    def test_misses_propagate_errors(self):
+        """Test a failing fetch for an unknown key raises and caches nothing"""
+        cache = StaleWhileRevalidateCache(8, ttl=60, stale_ttl=60)
+        with pytest.raises(RuntimeError):
+            asyncio.run(cache.get("day", Remote(fail=True)))
+        assert cache.stats()["size"] == 0
+
+    def test_size_bound(self):
+        """Test the least recently used responses are evicted"""
+        cache = StaleWhileRevalidateCache(2, ttl=60, stale_ttl=60)
+        async def scenario():
+            for key in ("a", "b", "c"):
+                await cache.get(key, Remote())
+
+        asyncio.run(scenario())
+        assert cache.stats()["size"] == 2
+        assert cache.stats()["evictions"] == 1
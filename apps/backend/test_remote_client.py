@@ -0,0 +1,169 @@
+import asyncio
+import httpx
+import pytest
+from circuit_breaker import OPEN, CircuitBreaker
+from remote_client import CircuitOpenError, RemoteAPIError, RemoteClient
+
+def make_client(handler, **kwargs):
+    kwargs.setdefault("retry_delays", (0.01, 0.01, 0.01))
+    return RemoteClient("https://remote.test/api", api_key="secret",
+                        transport=httpx.MockTransport(handler), **kwargs)
+
+async def call(client, *args, **kwargs):
+    try:
+        return await client.request(*args, **kwargs)
+    finally:
+        await client.aclose()
+
+class TestRemoteClient:
+    """Test the pooled async remote API client"""
+
+    def test_request_sends_headers_and_params(self):
+        """Test URL joining, API key header, query params and JSON bodies"""
+        seen = []
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+        assert asyncio.run(call(client, "GET", "/v1/ephemeris/planets", params={"planets": "Sun"})) == {"ok": True}
+        assert str(seen[0].url) == "https://remote.test/api/v1/ephemeris/planets?planets=Sun"
+        assert seen[0].headers["X-API-Key"] == "secret"
+
+        client = make_client(handler)
+        asyncio.run(call(client, "POST", "navatara/calculate", json={"scheme": 27}))
+        assert seen[1].method == "POST"
+        assert seen[1].content == b'{"scheme":27}'
+
+    def test_retries_server_errors(self):
+        """Test 5xx and transport errors are retried until one attempt succeeds"""
+        responses = iter([
+            httpx.ConnectError("refused"),
+            httpx.Response(503),
+            httpx.Response(200, json=[1, 2]),
+        ])
+        def handler(request):
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        assert asyncio.run(call(make_client(handler), "GET", "x")) == [1, 2]
+
+    def test_client_errors_are_not_retried(self):
+        """Test a 4xx response fails at once"""
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(404)
+
+        with pytest.raises(RemoteAPIError) as excinfo:
+            asyncio.run(call(make_client(handler), "GET", "missing"))
+        assert excinfo.value.status == 404
+        assert len(calls) == 1
+
+    def test_gives_up_after_retries(self):
+        """Test the last error is raised once every attempt failed"""
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(500)
+
+        with pytest.raises(RemoteAPIError, match="HTTP 500"):
+            asyncio.run(call(make_client(handler), "GET", "x"))
+        assert len(calls) == 4
+
+    def test_deadline_bounds_the_whole_call(self):
+        """Test a slow remote is abandoned once the per-call deadline passes"""
+        async def handler(request):
+            await asyncio.sleep(1)
+            return httpx.Response(200, json={})
+
+        client = make_client(handler, retry_delays=(0.5,))
+        loop_time = []
+        async def timed():
+            start = asyncio.get_running_loop().time()
+            try:
+                await call(client, "GET", "slow", deadline=0.1)
+            finally:
+                loop_time.append(asyncio.get_running_loop().time() - start)
+
+        with pytest.raises(RemoteAPIError, match="deadline exceeded"):
+            asyncio.run(timed())
+        assert loop_time[0] < 0.5
+
+    def test_concurrency_is_bounded(self):
+        """Test no more than max_concurrency requests are in flight"""
+        in_flight = []
+        peak = []
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            return httpx.Response(200, json={})
+
+        client = make_client(handler, max_concurrency=3)
+        async def burst():
+            try:
+                await asyncio.gather(*(client.request("GET", "x") for _ in range(12)))
+            finally:
+                await client.aclose()
+
+        asyncio.run(burst())
+        assert len(peak) == 12
+        assert max(peak) == 3
+
+    def test_open_circuit_skips_the_remote(self):
+        """Test failing calls open the breaker, after which no request is sent"""
+        calls = []
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503)
+
+        breaker = CircuitBreaker(window=2, min_calls=2, open_seconds=60)
+        client = make_client(handler, retry_delays=(), breaker=breaker)
+        for _ in range(2):
+            with pytest.raises(RemoteAPIError):
+                asyncio.run(call(client, "GET", "x"))
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(call(client, "GET", "x"))
+        assert len(calls) == 2
+
+    def test_client_errors_do_not_trip_the_circuit(self):
+        """Test 4xx answers count as the remote being up"""
+        breaker = CircuitBreaker(window=2, min_calls=2)
+        client = make_client(lambda request: httpx.Response(422), breaker=breaker)
+        for _ in range(3):
+            with pytest.raises(RemoteAPIError):
+                asyncio.run(call(client, "GET", "x"))
+        assert breaker.snapshot()["failureRate"] == 0.0
+
+    def test_client_is_shared_per_event_loop(self):
+        """Test calls on one loop reuse the pooled client and a new loop gets a fresh one"""
+        client = make_client(lambda request: httpx.Response(200, json={}))
+        async def twice():
+            first = client.client
+            await client.request("GET", "x")
+            return first, client.client
+
+        first, second = asyncio.run(twice())
+        assert first is second
+        third, _ = asyncio.run(twice())
+        assert third is not first
+        # The client of the finished loop had its pool closed
+        assert first.is_closed
+
+    def test_from_env(self, monkeypatch):
+        """Test the client is configured from the environment and disabled without a base URL"""
+        monkeypatch.delenv("REMOTE_API_BASE_URL", raising=False)
+        assert RemoteClient.from_env() is None
+
+        monkeypatch.setenv("REMOTE_API_BASE_URL", "https://remote.test")
+        monkeypatch.setenv("REMOTE_API_MAX_CONCURRENCY", "4")
+        monkeypatch.setenv("REMOTE_API_DEADLINE", "5")
+        client = RemoteClient.from_env()
+        assert client.base_url == "https://remote.test/"
+        assert client.max_concurrency == 4
+        assert client.deadline == 5.0
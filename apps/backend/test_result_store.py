@@ -0,0 +1,77 @@
+import asyncio
+from http_cache import encode_response
+from result_store import ResultStore, canonical_key
+
+KEY = ("panchanga", 2024, 1, "Asia/Kolkata", 28.614, 77.209)
+
+class TestResultStore:
+    """Test the SQLite result store"""
+    
+    def test_round_trip(self, tmp_path):
+        """Test stored responses are returned before and after a flush"""
+        store = ResultStore(str(tmp_path / "results.db"), version="v1")
+        encoded = encode_response({"days": [1, 2, 3]})
+        assert store.get(KEY) is None
+        store.put(KEY, encoded)
+        assert store.get(KEY) == encoded
+        store.flush()
+        assert store.get(KEY) == encoded
+        assert store.stats()["rows"] == 1
+        store.close()
+    
+    def test_survives_restart(self, tmp_path):
+        """Test a new store on the same file serves earlier results"""
+        path = str(tmp_path / "results.db")
+        encoded = encode_response({"days": []})
+        store = ResultStore(path, version="v1")
+        store.put(KEY, encoded)
+        store.close()
+        
+        reopened = ResultStore(path, version="v1")
+        assert reopened.get(KEY) == encoded
+        assert reopened.invalidated == 0
+        reopened.close()
+    
+    def test_other_versions_invalidated(self, tmp_path):
+        """Test rows written by another engine version are dropped on open"""
+        path = str(tmp_path / "results.db")
+        store = ResultStore(path, version="v1")
+        store.put(KEY, encode_response({"days": []}))
+        store.close()
+        
+        upgraded = ResultStore(path, version="v2")
+        assert upgraded.invalidated == 1
+        assert upgraded.get(KEY) is None
+        upgraded.close()
+    
+    def test_writes_are_batched(self, tmp_path):
+        """Test writes are committed once the batch is full"""
+        store = ResultStore(str(tmp_path / "results.db"), version="v1", batch_size=3, flush_interval=3600)
+        for month in range(1, 3):
+            store.put(("positions", 2024, month), encode_response({"month": month}))
+        assert store.stats()["rows"] == 0
+        assert store.stats()["pending"] == 2
+        store.put(("positions", 2024, 3), encode_response({"month": 3}))
+        assert store.stats()["rows"] == 3
+        assert store.stats()["pending"] == 0
+        store.close()
+    
+    def test_background_flush(self, tmp_path):
+        """Test pending writes are committed by the flusher without another put"""
+        store = ResultStore(str(tmp_path / "results.db"), version="v1", batch_size=100, flush_interval=3600)
+        store.put(KEY, encode_response({"days": []}))
+        assert store.stats()["rows"] == 0
+        store.flush_interval = 0.01
+        async def scenario():
+            store.start()
+            await asyncio.sleep(0.1)
+            await store.stop()
+        
+        asyncio.run(scenario())
+        assert store.stats()["rows"] == 1
+        assert store.stats()["pending"] == 0
+        store.close()
+    
+    def test_canonical_key(self):
+        """Test keys have a stable text form"""
+        assert canonical_key(("positions", 2024, 1)) == '["positions",2024,1]'
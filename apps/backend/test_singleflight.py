@@ -0,0 +1,85 @@
+import asyncio
+import pytest
+from singleflight import SingleFlight
+
+class TestSingleFlight:
+    """Test coalescing of identical in-flight work"""
+
+    def test_concurrent_callers_share_one_run(self):
+        """Test duplicates await the leader's result instead of running again"""
+        flights = SingleFlight()
+        runs = []
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return {"days": 31}
+
+        async def burst():
+            return await asyncio.gather(*(flights.do("2024-01", work) for _ in range(20)))
+
+        results = asyncio.run(burst())
+        assert len(runs) == 1
+        assert all(result is results[0] for result in results)
+        assert flights.stats() == {"inFlight": 0, "leaders": 1, "shared": 19}
+
+    def test_different_keys_run_separately(self):
+        """Test only identical keys are coalesced"""
+        flights = SingleFlight()
+        async def work(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        async def burst():
+            return await asyncio.gather(
+                flights.do("a", lambda: work(1)), flights.do("b", lambda: work(2))
+            )
+
+        assert asyncio.run(burst()) == [1, 2]
+        assert flights.leaders == 2
+
+    def test_finished_work_is_not_reused(self):
+        """Test a call after the previous one completed runs again"""
+        flights = SingleFlight()
+        runs = []
+        async def work():
+            runs.append(1)
+            return len(runs)
+
+        async def twice():
+            return [await flights.do("key", work), await flights.do("key", work)]
+
+        assert asyncio.run(twice()) == [1, 2]
+
+    def test_errors_reach_every_caller(self):
+        """Test an exception in the shared run is raised to all waiters"""
+        flights = SingleFlight()
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("bad month")
+
+        async def burst():
+            return await asyncio.gather(
+                *(flights.do("key", work) for _ in range(3)), return_exceptions=True
+            )
+
+        results = asyncio.run(burst())
+        assert all(isinstance(result, ValueError) for result in results)
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        """Test the leader disconnecting leaves the work running for the duplicates"""
+        flights = SingleFlight()
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flights.do("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flights.do("key", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(scenario()) == "done"
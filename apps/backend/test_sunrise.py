@@ -0,0 +1,41 @@
+from ephemeris import jd_to_iso
+from sunrise import compute_sun_times, get_sun_times, get_sun_times_for_dates, sun_times_cache
+
+class TestComputeSunTimes:
+    """Test sunrise/sunset computation"""
+    
+    def test_delhi_winter(self):
+        """Test New Delhi sunrise ~07:14 IST and sunset ~17:35 IST on 2024-01-01"""
+        sunrise, sunset = compute_sun_times("2024-01-01", 28.6139, 77.2090)
+        assert jd_to_iso(sunrise).startswith("2024-01-01T01:4")
+        assert jd_to_iso(sunset).startswith("2024-01-01T12:0")
+    
+    def test_west_longitude_sunset_next_utc_day(self):
+        """Test New York's June sunset falls on the next UTC date"""
+        sunrise, sunset = compute_sun_times("2024-06-21", 40.7128, -74.0060)
+        assert jd_to_iso(sunrise).startswith("2024-06-21T09:2")
+        assert jd_to_iso(sunset).startswith("2024-06-22T00:3")
+    
+    def test_polar_day(self):
+        """Test no rise or set is reported during the midnight sun"""
+        assert compute_sun_times("2024-06-21", 78.2, 15.6) == (None, None)
+
+class TestSunTimesCache:
+    """Test the per-location sunrise cache"""
+    
+    def test_repeat_requests_hit_cache(self):
+        """Test a repeated month is served from the cache"""
+        sun_times_cache.clear()
+        dates = [f"2024-03-{day:02d}" for day in range(1, 32)]
+        first = get_sun_times_for_dates(dates, 19.0760, 72.8777)
+        assert sun_times_cache.stats()["misses"] == 31
+        second = get_sun_times_for_dates(dates, 19.0760, 72.8777)
+        assert second == first
+        assert sun_times_cache.stats()["hits"] == 31
+    
+    def test_coordinates_rounded_for_key(self):
+        """Test nearby coordinates share a cache entry"""
+        sun_times_cache.clear()
+        get_sun_times("2024-03-01", 19.07601, 72.87771)
+        get_sun_times("2024-03-01", 19.07604, 72.87768)
+        assert sun_times_cache.stats()["hits"] == 1
@@ -0,0 +1,51 @@
+import pytest
+import pytz
+import swisseph as swe
+from ephemeris import jd_to_iso
+from timezones import (
+    build_offset_table, get_offset_table, jd_to_local_iso, local_midnight_jd,
+    offset_tables_cache, utc_offset_seconds
+)
+
+class TestOffsetTables:
+    """Test per-(timezone, year) offset tables"""
+    
+    def test_dst_transitions(self):
+        """Test New York's 2024 DST changes are found to the second"""
+        times, offsets = build_offset_table("America/New_York", 2024)
+        assert offsets == [-18000, -14400, -18000]
+        assert jd_to_iso(times[1] / 86400 + 2440587.5) == "2024-03-10T07:00:00Z"
+        assert jd_to_iso(times[2] / 86400 + 2440587.5) == "2024-11-03T06:00:00Z"
+    
+    def test_fixed_offset_zone(self):
+        """Test zones without DST have a single entry"""
+        times, offsets = build_offset_table("Asia/Kolkata", 2024)
+        assert offsets == [19800]
+    
+    def test_tables_are_cached(self):
+        """Test repeated lookups reuse the cached table"""
+        offset_tables_cache.clear()
+        for day in range(1, 29):
+            utc_offset_seconds("Europe/Paris", swe.julday(2024, 2, day, 12.0))
+        assert offset_tables_cache.stats()["misses"] == 1
+        assert get_offset_table("Europe/Paris", 2024) is get_offset_table("Europe/Paris", 2024)
+    
+    def test_unknown_timezone(self):
+        """Test unknown zone names raise"""
+        with pytest.raises(pytz.exceptions.UnknownTimeZoneError):
+            build_offset_table("Mars/Olympus_Mons", 2024)
+
+class TestLocalTimes:
+    """Test local midnight and local ISO formatting"""
+    
+    def test_local_midnight(self):
+        """Test local midnight lands on the previous UTC date east of Greenwich"""
+        assert jd_to_iso(local_midnight_jd("Asia/Kolkata", "2024-01-01")) == "2023-12-31T18:30:00Z"
+        assert jd_to_iso(local_midnight_jd("America/New_York", "2024-03-11")) == "2024-03-11T04:00:00Z"
+    
+    def test_local_iso(self):
+        """Test offsets are rendered as +HH:MM / -HH:MM"""
+        jd = swe.julday(2024, 1, 1, 0.0)
+        assert jd_to_local_iso(jd, "Asia/Kolkata") == "2024-01-01T05:30:00+05:30"
+        assert jd_to_local_iso(jd, "America/Los_Angeles") == "2023-12-31T16:00:00-08:00"
+        assert jd_to_local_iso(jd, "UTC") == "2024-01-01T00:00:00+00:00"
@@ -0,0 +1,27 @@
+import json
+from warmup import DEFAULT_CITIES, load_cities, month_window, warmup_jobs
+
+class TestWarmupPlan:
+    """Test warm-up job planning"""
+    
+    def test_month_window_wraps_year(self):
+        """Test consecutive months across a year boundary"""
+        assert month_window(3, (2024, 11)) == [(2024, 11), (2024, 12), (2025, 1)]
+    
+    def test_jobs(self):
+        """Test positions are planned once per month and panchanga per city"""
+        jobs = warmup_jobs(DEFAULT_CITIES, [(2025, 1), (2025, 2)])
+        endpoints = [endpoint for endpoint, _ in jobs]
+        assert endpoints.count("positions") == 2
+        assert endpoints.count("panchanga") == 2 * len(DEFAULT_CITIES)
+        paris = next(fields for endpoint, fields in jobs if endpoint == "panchanga")
+        assert paris == {"year": 2025, "month": 1, "timezone": "Europe/Paris", "latitude": 48.8566, "longitude": 2.3522}
+    
+    def test_load_cities(self, tmp_path, monkeypatch):
+        """Test the city table comes from a file when configured"""
+        monkeypatch.delenv("WARMUP_CITIES_FILE", raising=False)
+        assert load_cities() == DEFAULT_CITIES
+        path = tmp_path / "cities.json"
+        path.write_text(json.dumps({"Delhi": {"lat": 28.6139, "lon": 77.209, "tz": "Asia/Kolkata"}}))
+        monkeypatch.setenv("WARMUP_CITIES_FILE", str(path))
+        assert list(load_cities()) == ["Delhi"]
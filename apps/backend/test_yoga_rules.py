@@ -0,0 +1,89 @@
+import json
+import pytest
+from yoga_rules import CompiledRuleSet, RuleSyntaxError, compile_expression, compile_rule
+
+def evaluate(text, **context):
+    return compile_expression(text)[0](context)
+
+class TestRuleParser:
+    """Test the yoga rule DSL parser"""
+    
+    def test_operators(self):
+        """Test comparison, membership and boolean operators"""
+        assert evaluate("vara=='Monday' && nakshatraIndex in [1, 2]", vara="Monday", nakshatraIndex=2)
+        assert not evaluate("vara=='Monday' && nakshatraIndex in [1, 2]", vara="Monday", nakshatraIndex=3)
+        assert evaluate("vara=='Monday' || vara==\"Friday\"", vara="Friday")
+        assert evaluate("!(nakshatraIndex >= 10) and tithiGroup != 'Rikta'", nakshatraIndex=4, tithiGroup="Nanda")
+        assert evaluate("vara not in ['Sunday']", vara="Monday")
+    
+    def test_precedence(self):
+        """Test && binds tighter than ||"""
+        rule = "vara=='Sunday' || vara=='Monday' && nakshatraIndex==1"
+        assert evaluate(rule, vara="Sunday", nakshatraIndex=5)
+        assert not evaluate(rule, vara="Monday", nakshatraIndex=5)
+    
+    @pytest.mark.parametrize("text", [
+        "invalid_syntax && vara=='Thursday'",
+        "vara==",
+        "vara=='Monday' &&",
+        "(vara=='Monday'",
+        "nakshatraIndex in [1, vara]",
+        "__import__('os')",
+    ])
+    def test_syntax_errors(self, text):
+        """Test malformed rules and unknown names are rejected"""
+        with pytest.raises(RuleSyntaxError):
+            compile_expression(text)
+
+class TestCompiledRules:
+    """Test compiled rules and the rule set lookup table"""
+    
+    rules = [
+        {"name": "A", "polarity": "auspicious", "rule": "vara=='Thursday' && nakshatraIndex in [8, 12]", "explain": "a"},
+        {"name": "B", "polarity": "inauspicious", "rule": "tithiGroup=='Rikta' || vara=='Sunday'", "explain": "b"},
+        {"name": "Broken", "polarity": "auspicious", "rule": "vara==", "explain": "c"},
+    ]
+    
+    def test_fulfilled_variables_from_ast(self):
+        """Test fulfilled variables are those of the comparisons that hold"""
+        rule = compile_rule(self.rules[0])
+        assert rule.variables == ("vara", "nakshatraIndex")
+        # Index 1 appears in the rule text as part of 12, but does not satisfy it
+        assert rule.fulfilled_variables({"vara": "Thursday", "nakshatraIndex": 1}) == {"vara": "Thursday"}
+        
+        rule = compile_rule(self.rules[1])
+        assert rule.fulfilled_variables({"vara": "Sunday", "tithiGroup": "Nanda"}) == {"vara": "Sunday"}
+    
+    def test_table_lookup(self):
+        """Test detection over the tabulated day contexts"""
+        rule_set = CompiledRuleSet(self.rules)
+        assert rule_set.invalid == ["Broken"]
+        assert len(rule_set.table) == 7 * 5 * 27
+        
+        matches = rule_set.detect({"vara": "Thursday", "tithiGroup": "Rikta", "nakshatraIndex": 12})
+        assert [m["name"] for m in matches] == ["A", "B"]
+        assert matches[0]["fulfilled_variables"] == {"vara": "Thursday", "nakshatraIndex": 12}
+        assert matches[0]["reason"] == "a"
+        assert rule_set.detect({"vara": "Monday", "tithiGroup": "Nanda", "nakshatraIndex": 3}) == []
+    
+    def test_type_mismatch_never_matches(self):
+        """Test a rule comparing incompatible types does not break the rule set"""
+        rule_set = CompiledRuleSet(self.rules + [
+            {"name": "Typed", "polarity": "auspicious", "rule": "vara > 3", "explain": "d"},
+            {"name": "Partly", "polarity": "auspicious", "rule": "vara=='Sunday' || vara > 3", "explain": "e"},
+        ])
+        assert [m["name"] for m in rule_set.detect({"vara": "Monday", "tithiGroup": "Nanda", "nakshatraIndex": 3})] == []
+        matches = rule_set.detect({"vara": "Sunday", "tithiGroup": "Nanda", "nakshatraIndex": 3})
+        assert [m["name"] for m in matches] == ["B", "Partly"]
+        assert matches[1]["fulfilled_variables"] == {"vara": "Sunday"}
+    
+    def test_contexts_outside_table(self):
+        """Test contexts outside the tabulated domain are still evaluated"""
+        rule_set = CompiledRuleSet(self.rules)
+        assert [m["name"] for m in rule_set.detect({"vara": "Sunday"})] == ["B"]
+    
+    def test_dataset_rules_compile(self):
+        """Test every shipped rule compiles"""
+        with open("data/yogas.rules.json") as f:
+            rules = json.load(f)
+        assert CompiledRuleSet(rules).invalid == []
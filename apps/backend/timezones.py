@@ -0,0 +1,99 @@
+"""UTC offset tables per (timezone, year).
+
+pytz lookups are slow enough to matter inside month loops, so the offset
+transitions of a zone are found once per year (daily scan, refined to the
+second by bisection) and cached. Offsets for any instant are then a bisect away.
+"""
+import os
+from bisect import bisect_right
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytz
+
+from cache import LRUCache
+from ephemeris import UNIX_EPOCH_JD, jd_to_datetime
+
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+offset_tables_cache = LRUCache(int(os.getenv("TZ_OFFSET_CACHE_SIZE", "1024")))
+
+OffsetTable = Tuple[List[int], List[int]]
+
+
+def _timestamp(year: int, month: int, day: int) -> int:
+    return int((datetime(year, month, day, tzinfo=timezone.utc) - _UNIX_EPOCH).total_seconds())
+
+
+def _offset(tz, utc_seconds: int) -> int:
+    moment = _UNIX_EPOCH + timedelta(seconds=utc_seconds)
+    return int(moment.astimezone(tz).utcoffset().total_seconds())
+
+
+def build_offset_table(tz_name: str, year: int) -> OffsetTable:
+    """Offset transitions (UTC seconds, offset seconds) covering a year.
+
+    The table spans from a day before the year to a day after it, so local
+    midnights at either end resolve without touching a neighbouring table.
+    """
+    tz = pytz.timezone(tz_name)
+    start = _timestamp(year, 1, 1) - 86400
+    end = _timestamp(year + 1, 1, 1) + 2 * 86400
+    times = [start]
+    offsets = [_offset(tz, start)]
+    t = start
+    while t < end:
+        following = t + 86400
+        offset = _offset(tz, following)
+        if offset != offsets[-1]:
+            lo, hi = t, following
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _offset(tz, mid) == offsets[-1]:
+                    lo = mid
+                else:
+                    hi = mid
+            times.append(hi)
+            offsets.append(offset)
+        t = following
+    return times, offsets
+
+
+def get_offset_table(tz_name: str, year: int) -> OffsetTable:
+    """Cached ``build_offset_table``"""
+    key = (tz_name, year)
+    table = offset_tables_cache.get(key)
+    if table is None:
+        table = build_offset_table(tz_name, year)
+        offset_tables_cache.set(key, table)
+    return table
+
+
+def utc_offset_seconds(tz_name: str, jd: float) -> int:
+    """UTC offset of a zone at a Julian day (UT)"""
+    utc_seconds = (jd - UNIX_EPOCH_JD) * 86400.0
+    year = (_UNIX_EPOCH + timedelta(seconds=utc_seconds)).year
+    times, offsets = get_offset_table(tz_name, year)
+    return offsets[max(bisect_right(times, utc_seconds) - 1, 0)]
+
+
+def local_midnight_jd(tz_name: str, date_str: str) -> float:
+    """Julian day (UT) of 00:00 local time on a civil date"""
+    d = date.fromisoformat(date_str)
+    naive_jd = (_timestamp(d.year, d.month, d.day) / 86400.0) + UNIX_EPOCH_JD
+    offset = utc_offset_seconds(tz_name, naive_jd)
+    jd = naive_jd - offset / 86400.0
+    # Re-check when the guess straddles an offset change
+    corrected = utc_offset_seconds(tz_name, jd)
+    if corrected != offset:
+        jd = naive_jd - corrected / 86400.0
+    return jd
+
+
+def jd_to_local_iso(jd: float, tz_name: str) -> str:
+    """ISO 8601 local timestamp with UTC offset, e.g. 2024-01-01T07:13:30+05:30"""
+    offset = utc_offset_seconds(tz_name, jd)
+    local = jd_to_datetime(jd) + timedelta(seconds=offset)
+    sign = "+" if offset >= 0 else "-"
+    hours, minutes = divmod(abs(offset) // 60, 60)
+    return f"{local.strftime('%Y-%m-%dT%H:%M:%S')}{sign}{hours:02d}:{minutes:02d}"
@@ -0,0 +1,196 @@
+"""Exact ingress solver.
+
+Finds the instants at which planets cross pada, nakshatra and sign
+boundaries of the sidereal zodiac. Each planet is sampled on a coarse grid
+(positions and speeds), brackets are taken wherever the pada index changes
+between samples, and every crossed boundary is refined with a safeguarded
+Newton iteration seeded by cubic Hermite interpolation. Nakshatra and sign
+boundaries are a subset of pada boundaries, so one solve serves all three.
+"""
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from ayanamsa import get_ayanamsa_provider
+from ephemeris import OPPOSITE_BODIES, PADA_SPAN
+from metrics import CALC_UT_CALLS
+
+INGRESS_KINDS = ("nakshatra", "pada", "sign")
+
+PADAS_PER_NAKSHATRA = 4
+PADAS_PER_SIGN = 9
+PADAS_PER_CIRCLE = 108
+
+# Coarse sampling step per planet, in days. Must keep at most a few pada
+# crossings per step for fast movers and avoid straddling stations for others.
+COARSE_STEP_DAYS = {
+    "Moon": 0.5,
+    "Sun": 1.0,
+    "Mercury": 1.0,
+    "Venus": 1.0,
+    "Mars": 1.0,
+    "Jupiter": 2.0,
+    "Saturn": 2.0,
+    "Rahu": 2.0,
+    "Ketu": 2.0,
+}
+DEFAULT_STEP_DAYS = 1.0
+
+# Convergence tolerance in days (~0.1 s) and iteration cap per boundary.
+# A Newton step shorter than NEWTON_ACCEPT_DAYS (~9 s) is accepted without
+# re-evaluating: the quadratic error left after it is far below tolerance.
+TIME_TOLERANCE_DAYS = 1e-6
+NEWTON_ACCEPT_DAYS = 1e-4
+MAX_ITERATIONS = 40
+
+
+def wrap180(delta):
+    """Wrap an angle difference into [-180, 180)"""
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+def _sample(planet_id: int, jds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Tropical longitude and speed at each sample"""
+    longitude = np.empty(len(jds), dtype=np.float64)
+    speed = np.empty(len(jds), dtype=np.float64)
+    for i, jd in enumerate(jds.tolist()):
+        xx = swe.calc_ut(jd, planet_id)[0]
+        longitude[i] = xx[0]
+        speed[i] = xx[3]
+    CALC_UT_CALLS.inc(len(jds))
+    return longitude, speed
+
+
+def _unwrapped_sidereal(tropical: np.ndarray, jds: np.ndarray, opposite: bool) -> np.ndarray:
+    """Sidereal longitude unwrapped so the pada index is continuous"""
+    if opposite:
+        tropical = tropical + 180.0
+    longitude = np.mod(tropical - get_ayanamsa_provider().at_many(jds), 360.0)
+    steps = wrap180(np.diff(longitude))
+    return np.concatenate(([longitude[0]], longitude[0] + np.cumsum(steps)))
+
+
+def _longitude_at(planet_id: int, opposite: bool, jd: float, reference: float) -> Tuple[float, float]:
+    """Sidereal longitude at jd unwrapped to the branch nearest `reference`"""
+    xx = swe.calc_ut(jd, planet_id)[0]
+    CALC_UT_CALLS.inc()
+    longitude = xx[0] + 180.0 if opposite else xx[0]
+    longitude = (longitude - get_ayanamsa_provider().at(jd)) % 360.0
+    return reference + wrap180(longitude - reference), xx[3]
+
+
+def hermite_root(t0, t1, y0, y1, v0, v1, target) -> float:
+    """Root of the cubic Hermite interpolant through two samples"""
+    h = t1 - t0
+    m0, m1 = v0 * h, v1 * h
+    s = (target - y0) / (y1 - y0)
+    for _ in range(4):
+        s2, s3 = s * s, s * s * s
+        y = ((2 * s3 - 3 * s2 + 1) * y0 + (s3 - 2 * s2 + s) * m0
+             + (-2 * s3 + 3 * s2) * y1 + (s3 - s2) * m1)
+        dy = ((6 * s2 - 6 * s) * y0 + (3 * s2 - 4 * s + 1) * m0
+              + (-6 * s2 + 6 * s) * y1 + (3 * s2 - 2 * s) * m1)
+        if not dy:
+            break
+        s = min(max(s - (y - target) / dy, 0.0), 1.0)
+    return t0 + s * h
+
+
+def solve_crossing(evaluate: Callable[[float, float], Tuple[float, float]],
+                   t0: float, t1: float, y0: float, y1: float,
+                   v0: float, v1: float, target: float) -> float:
+    """Instant in [t0, t1] where an angular quantity equals `target`.
+
+    ``evaluate(t, reference)`` returns the quantity at ``t`` unwrapped to the
+    branch nearest ``reference`` and its rate in degrees/day. ``y``/``v``
+    are the bracket samples and their rates.
+    """
+    rising = y1 > y0
+    lo, hi = t0, t1
+    t = hermite_root(t0, t1, y0, y1, v0, v1, target)
+    for _ in range(MAX_ITERATIONS):
+        y, v = evaluate(t, target)
+        f = y - target
+        if (f < 0) == rising:
+            lo = t
+        else:
+            hi = t
+        step = f / v if v else float("inf")
+        candidate = t - step
+        if lo <= candidate <= hi and abs(step) < NEWTON_ACCEPT_DAYS:
+            return candidate
+        if not lo < candidate < hi:
+            candidate = (lo + hi) / 2
+        t = candidate
+        if hi - lo < TIME_TOLERANCE_DAYS:
+            break
+    return t
+
+
+def _pada_label(pada: int) -> int:
+    """Absolute pada number (0-107) to 1-based pada within its nakshatra"""
+    return pada % PADAS_PER_NAKSHATRA + 1
+
+
+def find_ingresses(start_jd: float, end_jd: float, planets: Dict[str, int],
+                   kinds: Optional[Iterable[str]] = None) -> List[dict]:
+    """Exact pada/nakshatra/sign ingresses for the planets in [start_jd, end_jd).
+
+    ``planets`` maps names to Swiss Ephemeris ids (``PLANETS`` in main.py).
+    Returns events sorted by time, each a dict with ``planet``, ``kind``,
+    ``jd``, ``from`` and ``to``. Nakshatra indexes are 1-27, padas 1-4 and
+    signs 0-11.
+    """
+    kinds = set(kinds or INGRESS_KINDS)
+    unknown = kinds - set(INGRESS_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown ingress kinds: {', '.join(sorted(unknown))}")
+
+    events = []
+    samples: Dict[Tuple[int, float], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+    for name, planet_id in planets.items():
+        opposite = name in OPPOSITE_BODIES
+        step = COARSE_STEP_DAYS.get(name, DEFAULT_STEP_DAYS)
+        if (planet_id, step) not in samples:
+            count = max(int(np.ceil((end_jd - start_jd) / step)), 1)
+            jds = np.minimum(start_jd + np.arange(count + 1) * step, end_jd)
+            samples[(planet_id, step)] = (jds,) + _sample(planet_id, jds)
+        jds, tropical, speed = samples[(planet_id, step)]
+        longitude = _unwrapped_sidereal(tropical, jds, opposite)
+
+        pada = np.floor(longitude / PADA_SPAN).astype(np.int64)
+        for i in np.flatnonzero(np.diff(pada)).tolist():
+            p0, p1 = int(pada[i]), int(pada[i + 1])
+            forward = p1 > p0
+            boundaries = range(p0 + 1, p1 + 1) if forward else range(p0, p1, -1)
+            for boundary in boundaries:
+                jd = solve_crossing(
+                    lambda t, reference, planet_id=planet_id, opposite=opposite: _longitude_at(planet_id, opposite, t, reference),
+                    jds[i], jds[i + 1], longitude[i], longitude[i + 1],
+                    speed[i], speed[i + 1], boundary * PADA_SPAN
+                )
+                after = boundary % PADAS_PER_CIRCLE if forward else (boundary - 1) % PADAS_PER_CIRCLE
+                before = (boundary - 1) % PADAS_PER_CIRCLE if forward else boundary % PADAS_PER_CIRCLE
+
+                if "pada" in kinds:
+                    events.append({
+                        "planet": name, "kind": "pada", "jd": jd,
+                        "from": _pada_label(before), "to": _pada_label(after),
+                        "nakshatra": after // PADAS_PER_NAKSHATRA + 1
+                    })
+                if "nakshatra" in kinds and boundary % PADAS_PER_NAKSHATRA == 0:
+                    events.append({
+                        "planet": name, "kind": "nakshatra", "jd": jd,
+                        "from": before // PADAS_PER_NAKSHATRA + 1,
+                        "to": after // PADAS_PER_NAKSHATRA + 1
+                    })
+                if "sign" in kinds and boundary % PADAS_PER_SIGN == 0:
+                    events.append({
+                        "planet": name, "kind": "sign", "jd": jd,
+                        "from": before // PADAS_PER_SIGN,
+                        "to": after // PADAS_PER_SIGN
+                    })
+
+    events.sort(key=lambda event: event["jd"])
+    return [event for event in events if start_jd <= event["jd"] < end_jd]
@@ -0,0 +1,92 @@
+"""Precomputation of popular month responses.
+
+Traffic concentrates on the current and next month for a handful of cities,
+and the first request for each after a deploy pays the full calculation.
+This module plans those (endpoint, request) jobs from a city table
+(``{name: {lat, lon, tz}}``) and computes them:
+
+- ``scripts/warm_cache.py`` runs the jobs across a process pool and writes
+  them into the persistent result store;
+- with ``WARMUP_ON_STARTUP`` set, the app runs the same jobs through its
+  compute executor before it starts serving (see ``main.warm_up_month_cache``).
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from executor import init_worker
+from http_cache import EncodedResponse
+
+# Shared with scripts/fetch_fixtures.py (DEFAULT_COORDS) and the batch script
+DEFAULT_CITIES = {
+    "Paris": {"lat": 48.8566, "lon": 2.3522, "tz": "Europe/Paris"},
+    "Mumbai": {"lat": 19.0760, "lon": 72.8777, "tz": "Asia/Kolkata"},
+    "New York": {"lat": 40.7128, "lon": -74.0060, "tz": "America/New_York"},
+    "Tokyo": {"lat": 35.6762, "lon": 139.6503, "tz": "Asia/Tokyo"},
+}
+
+# (endpoint, month request fields)
+WarmupJob = Tuple[str, dict]
+
+
+def load_cities(path: Optional[str] = None) -> Dict[str, dict]:
+    """City table from a JSON file ({name: {lat, lon, tz}}), or the defaults"""
+    path = path or os.getenv("WARMUP_CITIES_FILE")
+    if not path:
+        return DEFAULT_CITIES
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def month_window(count: int, start: Optional[Tuple[int, int]] = None) -> List[Tuple[int, int]]:
+    """`count` consecutive (year, month) pairs from `start` (default: this month)"""
+    if start is None:
+        today = date.today()
+        start = (today.year, today.month)
+    year, month = start
+    months = []
+    for _ in range(count):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def warmup_jobs(cities: Dict[str, dict], months: List[Tuple[int, int]]) -> List[WarmupJob]:
+    """Positions once per month (they do not depend on the location) and
+    panchanga per city and month"""
+    jobs = []
+    for year, month in months:
+        for index, coords in enumerate(cities.values()):
+            request = {
+                "year": year,
+                "month": month,
+                "timezone": coords["tz"],
+                "latitude": coords["lat"],
+                "longitude": coords["lon"]
+            }
+            if index == 0:
+                jobs.append(("positions", request))
+            jobs.append(("panchanga", request))
+    return jobs
+
+
+def _compute(job: WarmupJob) -> EncodedResponse:
+    """Worker job: the encoded response for one warm-up job"""
+    # Deferred so that importing this module does not load the app
+    import main
+    from http_cache import encode_response
+
+    endpoint, fields = job
+    if endpoint == "positions":
+        request = main.normalize_month_request(main.PositionsMonthRequest(**fields))
+        return encode_response(main.compute_positions_month(request))
+    request = main.normalize_month_request(main.PanchangaMonthRequest(**fields))
+    return encode_response(main.compute_panchanga_month(request))
+
+
+def iter_warmup(jobs: List[WarmupJob], workers: Optional[int] = None) -> Iterator[Tuple[WarmupJob, EncodedResponse]]:
+    """Compute warm-up jobs across a process pool, in job order"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as pool:
+        yield from zip(jobs, pool.map(_compute, jobs))
@@ -0,0 +1,282 @@
+"""Compiled special-yoga rules.
+
+Rules in ``data/yogas.rules.json`` are small boolean expressions over the day
+context, e.g. ``vara=='Thursday' && nakshatraIndex in [8, 12, 16]``. Each is
+parsed once into a predicate (nested closures) plus the comparisons it is
+made of, so ``fulfilled_variables`` comes from the comparisons that held
+rather than from searching the rule text.
+
+Grammar::
+
+    expr       := and_expr (('||' | 'or') and_expr)*
+    and_expr   := not_expr (('&&' | 'and') not_expr)*
+    not_expr   := ('!' | 'not') not_expr | '(' expr ')' | comparison
+    comparison := operand [('==' | '!=' | '<' | '<=' | '>' | '>=' | 'in' | 'not in') operand]
+    operand    := variable | string | number | '[' [literal (',' literal)*] ']'
+
+Every variable ranges over a small known domain (7 varas x 5 tithi groups x
+27 nakshatras = 945 contexts), so ``CompiledRuleSet`` evaluates all rules
+for every context up front and per-day detection is a dict lookup.
+"""
+import operator
+import re
+from itertools import product
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+VARIABLE_DEFAULTS = {"vara": "", "tithiGroup": "", "nakshatraIndex": 0}
+
+VARA_DOMAIN = ("Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+TITHI_GROUP_DOMAIN = ("Nanda", "Bhadra", "Jaya", "Rikta", "Purna")
+NAKSHATRA_INDEX_DOMAIN = tuple(range(1, 28))
+
+_TOKEN_RE = re.compile(r"""\s*(?:
+    (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<string>'[^']*'|"[^"]*")
+  | (?P<op>==|!=|<=|>=|&&|\|\||[<>!()\[\],])
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*)
+)""", re.VERBOSE)
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda a, b: a in b,
+    "not in": lambda a, b: a not in b,
+}
+
+Predicate = Callable[[dict], bool]
+
+
+class RuleSyntaxError(ValueError):
+    """A yoga rule that does not parse"""
+
+
+def holds(predicate: Predicate, context: dict) -> bool:
+    """predicate(context), False when the rule compares incompatible types"""
+    try:
+        return bool(predicate(context))
+    except TypeError:
+        # e.g. vara > 3: such a rule never matches (as with the old evaluator)
+        return False
+
+
+class Comparison(NamedTuple):
+    """One leaf of a rule, e.g. ``nakshatraIndex in [8, 12]``"""
+    variables: Tuple[str, ...]
+    predicate: Predicate
+
+
+class CompiledRule(NamedTuple):
+    name: str
+    polarity: str
+    rule: str
+    explain: str
+    predicate: Predicate
+    comparisons: Tuple[Comparison, ...]
+
+    @property
+    def variables(self) -> Tuple[str, ...]:
+        seen = []
+        for comparison in self.comparisons:
+            seen.extend(v for v in comparison.variables if v not in seen)
+        return tuple(seen)
+
+    def fulfilled_variables(self, context: dict) -> dict:
+        """Context values of the variables in comparisons that hold"""
+        fulfilled = {}
+        for comparison in self.comparisons:
+            if holds(comparison.predicate, context):
+                for variable in comparison.variables:
+                    fulfilled[variable] = context[variable]
+        return fulfilled
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN_RE.match(text, position)
+        if match is None or match.end() == position:
+            raise RuleSyntaxError(f"Unexpected character at {position}: {text[position:]!r}")
+        position = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            tokens.append(("const", float(value) if "." in value else int(value)))
+        elif kind == "string":
+            tokens.append(("const", value[1:-1]))
+        elif kind == "name" and value in ("and", "or", "not", "in"):
+            tokens.append(("op", value))
+        elif kind == "name" and value in ("true", "True", "false", "False"):
+            tokens.append(("const", value in ("true", "True")))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.comparisons: List[Comparison] = []
+
+    def peek(self, offset: int = 0) -> Optional[Tuple[str, Any]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def accept(self, *ops: str) -> Optional[str]:
+        token = self.peek()
+        if token is not None and token[0] == "op" and token[1] in ops:
+            self.position += 1
+            return token[1]
+        return None
+
+    def expect(self, op: str) -> None:
+        if self.accept(op) is None:
+            raise RuleSyntaxError(f"Expected {op!r} at token {self.position}")
+
+    def parse(self) -> Predicate:
+        predicate = self.expr()
+        if self.peek() is not None:
+            raise RuleSyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return predicate
+
+    def expr(self) -> Predicate:
+        terms = [self.and_expr()]
+        while self.accept("||", "or"):
+            terms.append(self.and_expr())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda context: any(term(context) for term in terms)
+
+    def and_expr(self) -> Predicate:
+        terms = [self.not_expr()]
+        while self.accept("&&", "and"):
+            terms.append(self.not_expr())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda context: all(term(context) for term in terms)
+
+    def not_expr(self) -> Predicate:
+        if self.accept("!", "not"):
+            inner = self.not_expr()
+            return lambda context: not inner(context)
+        if self.accept("("):
+            inner = self.expr()
+            self.expect(")")
+            return inner
+        return self.comparison()
+
+    def comparison(self) -> Predicate:
+        left, left_vars = self.operand()
+        op = self.accept("==", "!=", "<=", ">=", "<", ">", "in")
+        if op is None and self.peek() == ("op", "not") and self.peek(1) == ("op", "in"):
+            self.position += 2
+            op = "not in"
+        if op is None:
+            def predicate(context: dict) -> bool:
+                return bool(left(context))
+            variables = left_vars
+        else:
+            right, right_vars = self.operand()
+            compare = _COMPARISONS[op]
+            def predicate(context: dict) -> bool:
+                return compare(left(context), right(context))
+            variables = left_vars + tuple(v for v in right_vars if v not in left_vars)
+        self.comparisons.append(Comparison(variables, predicate))
+        return predicate
+
+    def operand(self) -> Tuple[Callable[[dict], Any], Tuple[str, ...]]:
+        token = self.peek()
+        if token is None:
+            raise RuleSyntaxError("Unexpected end of rule")
+        kind, value = token
+        self.position += 1
+        if kind == "const":
+            return (lambda context: value), ()
+        if kind == "name":
+            if value not in VARIABLE_DEFAULTS:
+                raise RuleSyntaxError(f"Unknown variable {value!r}")
+            return (lambda context: context[value]), (value,)
+        if kind == "op" and value == "[":
+            items = []
+            if not self.accept("]"):
+                while True:
+                    item = self.peek()
+                    if item is None or item[0] != "const":
+                        raise RuleSyntaxError("List items must be literals")
+                    items.append(item[1])
+                    self.position += 1
+                    if self.accept("]"):
+                        break
+                    self.expect(",")
+            values = frozenset(items)
+            return (lambda context: values), ()
+        raise RuleSyntaxError(f"Unexpected token {value!r}")
+
+
+def compile_expression(text: str) -> Tuple[Predicate, Tuple[Comparison, ...]]:
+    """Parse a rule expression into a predicate and its comparisons"""
+    parser = _Parser(text)
+    predicate = parser.parse()
+    return predicate, tuple(parser.comparisons)
+
+
+def compile_rule(rule: dict) -> CompiledRule:
+    predicate, comparisons = compile_expression(rule["rule"])
+    return CompiledRule(
+        name=rule["name"],
+        polarity=rule["polarity"],
+        rule=rule["rule"],
+        explain=rule.get("explain", ""),
+        predicate=predicate,
+        comparisons=comparisons,
+    )
+
+
+def with_defaults(context: dict) -> dict:
+    """Context with every rule variable present"""
+    return {name: context.get(name, default) for name, default in VARIABLE_DEFAULTS.items()}
+
+
+class CompiledRuleSet:
+    """All special-yoga rules, compiled and tabulated over the day contexts"""
+
+    def __init__(self, rules: Sequence[dict]):
+        self.rules: List[CompiledRule] = []
+        self.invalid: List[str] = []
+        for rule in rules:
+            try:
+                self.rules.append(compile_rule(rule))
+            except RuleSyntaxError:
+                # An invalid rule never matches (as with the old evaluator)
+                self.invalid.append(rule.get("name", rule.get("rule", "")))
+        self.table: Dict[Tuple[str, str, int], Tuple[dict, ...]] = {
+            key: self._evaluate({"vara": key[0], "tithiGroup": key[1], "nakshatraIndex": key[2]})
+            for key in product(VARA_DOMAIN, TITHI_GROUP_DOMAIN, NAKSHATRA_INDEX_DOMAIN)
+        }
+
+    def _evaluate(self, context: dict) -> Tuple[dict, ...]:
+        return tuple(
+            {
+                "name": rule.name,
+                "polarity": rule.polarity,
+                "rule": rule.rule,
+                "reason": rule.explain,
+                "fulfilled_variables": rule.fulfilled_variables(context)
+            }
+            for rule in self.rules
+            if holds(rule.predicate, context)
+        )
+
+    def detect(self, context: dict) -> List[dict]:
+        """Special yogas whose rule holds for a day context"""
+        key = (context.get("vara"), context.get("tithiGroup"), context.get("nakshatraIndex"))
+        matches = self.table.get(key)
+        if matches is None:
+            matches = self._evaluate(with_defaults(context))
+        return list(matches)